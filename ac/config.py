@@ -0,0 +1,88 @@
+import discord
+from discord import app_commands
+
+from guild_config import EMOJI_NAMES
+
+
+class ConfigGroup(app_commands.Group):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You need the Manage Server permission.", ephemeral=True)
+            return False
+        return True
+
+
+def settings_embed(config) -> discord.Embed:
+    embed = discord.Embed(title="⚙️ Server Settings", color=discord.Color.blurple())
+    embed.add_field(
+        name="Staff roles",
+        value=" ".join(f"<@&{role_id}>" for role_id in sorted(config.staff_role_ids)) or "None",
+        inline=False,
+    )
+    embed.add_field(
+        name="Staff log channel",
+        value=f"<#{config.staff_log_channel_id}>" if config.staff_log_channel_id else "None",
+        inline=True,
+    )
+    embed.add_field(
+        name="Events channel",
+        value=f"<#{config.events_channel_id}>" if config.events_channel_id else "None",
+        inline=True,
+    )
+    embed.add_field(
+        name="Emojis",
+        value="\n".join(f"`{name}` {value}" for name, value in config.emojis.items()),
+        inline=False,
+    )
+    return embed
+
+
+def setup_config_command(bot, guild_configs):
+    # ---------- /config ----------
+    config = ConfigGroup(
+        name="config",
+        description="Admins: Bot settings for this server.",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_guild=True),
+    )
+
+    async def saved(interaction: discord.Interaction, **changes):
+        updated = await guild_configs.update(interaction.guild_id, **changes)
+        await interaction.response.send_message("✅ Settings saved.", embed=settings_embed(updated), ephemeral=True)
+
+    @config.command(name="show", description="Show this server's bot settings.")
+    async def show(interaction: discord.Interaction):
+        await interaction.response.send_message(
+            embed=settings_embed(guild_configs.get(interaction.guild_id)), ephemeral=True
+        )
+
+    @config.command(name="staff_role", description="Add or remove a staff role.")
+    @app_commands.describe(role="Role whose members may use staff commands", action="Add or remove the role")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Add", value="add"),
+        app_commands.Choice(name="Remove", value="remove"),
+    ])
+    async def staff_role(interaction: discord.Interaction, role: discord.Role, action: app_commands.Choice[str]):
+        roles = guild_configs.get(interaction.guild_id).staff_role_ids
+        roles = roles | {role.id} if action.value == "add" else roles - {role.id}
+        await saved(interaction, staff_role_ids=sorted(roles))
+
+    @config.command(name="log_channel", description="Set the channel slot requests are posted to for staff.")
+    @app_commands.describe(channel="Staff log channel")
+    async def log_channel(interaction: discord.Interaction, channel: discord.TextChannel):
+        await saved(interaction, staff_log_channel_id=channel.id)
+
+    @config.command(name="events_channel", description="Set the channel /accepted points invited VTCs to.")
+    @app_commands.describe(channel="Channel where marked events are posted")
+    async def events_channel(interaction: discord.Interaction, channel: discord.TextChannel):
+        await saved(interaction, events_channel_id=channel.id)
+
+    @config.command(name="emoji", description="Set an emoji used in the bot's messages.")
+    @app_commands.describe(name="Which emoji", value="The emoji, e.g. <:truck:1234567890> or 🚚")
+    @app_commands.choices(name=[app_commands.Choice(name=n, value=n) for n in EMOJI_NAMES])
+    async def emoji(interaction: discord.Interaction, name: app_commands.Choice[str], value: str):
+        emojis = dict(guild_configs.get(interaction.guild_id).emojis)
+        emojis[name.value] = value.strip()
+        await saved(interaction, emojis=emojis)
+
+    bot.tree.add_command(config)
@@ -0,0 +1,53 @@
+import discord
+from discord import app_commands
+
+from embed_templates import TemplateError
+
+
+class Responder:
+    """Posts a template's embed in the command's channel and confirms to the staff member."""
+
+    def __init__(self, templates, guild_configs):
+        self.templates = templates
+        self.guild_configs = guild_configs
+
+    async def send(self, interaction: discord.Interaction, name: str, color: discord.Color = None, **values):
+        template = self.templates.get(name)
+        if template is None:
+            return await interaction.response.send_message(f"❌ No message template named `{name}`.", ephemeral=True)
+        try:
+            embed = template.render(self.guild_configs.get(interaction.guild_id), color=color, **values)
+        except TemplateError as e:
+            return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+
+        await interaction.channel.send(embed=embed)
+        await interaction.response.send_message(template.confirmation, ephemeral=True)
+
+
+def setup_respond_command(bot, staff_only, responder):
+    # ---------- /respond ----------
+    async def template_autocomplete(interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=f"{t.name} — {t.summary}"[:100], value=t.name)
+            for t in responder.templates.all()
+            if current in t.name.lower() or current in t.summary.lower()
+        ][:25]
+
+    @bot.tree.command(name="respond", description="Staff only: Send an invitation response from a message template.")
+    @app_commands.describe(
+        template="Message template",
+        vtc_name="VTC Name",
+        user="User to mention",
+        slot_number="Slot number (for templates that mention one)"
+    )
+    @app_commands.autocomplete(template=template_autocomplete)
+    @staff_only
+    async def respond(
+        interaction: discord.Interaction,
+        template: str,
+        vtc_name: str,
+        user: discord.Member,
+        slot_number: str = None
+    ):
+        await responder.send(interaction, template, vtc_name=vtc_name, user=user, slot_number=slot_number)
@@ -0,0 +1,80 @@
+# bench/bench_slot_board.py
+"""
+Per-interaction cost of the slot state on a large, mostly booked board.
+
+Compares the old {"Slot N": vtc_name} dict (scanned for the modal preview and
+the "any free?" check) with SlotBoard, for the operations every click does:
+any-free, first ten free slots, approving a slot and rendering one page.
+"picker page" is what the slot select menu asks for: 25 free slots (plus
+one to know whether there are more) from the middle of the board.
+Also reports the memory each representation holds.
+
+Usage: python -m bench.bench_slot_board [slots]
+"""
+import random
+import sys
+import timeit
+import tracemalloc
+
+from booking.board import SlotBoard
+from booking.pages import SLOTS_PER_PAGE, render_page
+
+VTC_COUNT = 200
+BOOKED_RATIO = 0.95
+
+
+def build(slots: int):
+    rng = random.Random(3)
+    assignments = {
+        n: "VTC " + str(rng.randrange(VTC_COUNT))  # fresh string per slot, like names read back from the DB
+        for n in range(1, slots + 1) if rng.random() < BOOKED_RATIO
+    }
+    legacy = {f"Slot {n}": assignments.get(n) for n in range(1, slots + 1)}
+    return legacy, assignments
+
+
+def legacy_render(slots: dict, page: int) -> str:
+    # What the page renderer had to do: walk the dict up to the page
+    names = list(slots)[page * SLOTS_PER_PAGE:(page + 1) * SLOTS_PER_PAGE]
+    return "\n".join(f"{n} - {slots[n]} ✅" if slots[n] else n for n in names)
+
+
+def measure(label: str, fn, number: int = 200):
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<16} {per_call * 1e6:>10.1f}µs")
+
+
+def main(slots: int):
+    legacy, assignments = build(slots)
+    board = SlotBoard.from_assignments(1, slots, assignments)
+    last_page = (slots - 1) // SLOTS_PER_PAGE
+    free_slot = board.first_free(1)[0]
+
+    print(f"{slots} slots, {board.free_count} free")
+    print("dict:")
+    measure("any free", lambda: any(v is None for v in legacy.values()))
+    measure("first 10 free", lambda: [s for s, v in legacy.items() if not v][:10])
+    measure("approve", lambda: legacy.__setitem__(f"Slot {free_slot}", "VTC 1"))
+    measure("render last page", lambda: legacy_render(legacy, last_page))
+    print("SlotBoard:")
+    measure("any free", board.any_free)
+    measure("first 10 free", lambda: board.first_free(10))
+    measure("picker page", lambda: board.first_free(26, slots // 2))
+    measure("approve", lambda: board.set_confirmed(free_slot, "VTC 1"))
+    measure("render last page", lambda: render_page(board, last_page))
+
+    del legacy, board
+    for label, make in (
+        ("dict", lambda: build(slots)[0]),
+        ("SlotBoard", lambda: SlotBoard.from_assignments(1, slots, build(slots)[1])),
+    ):
+        tracemalloc.start()
+        kept = make()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{label:<10} holds {size / 1024:>8.1f}KB")
+        del kept
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
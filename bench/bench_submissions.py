@@ -0,0 +1,79 @@
+# bench/bench_submissions.py
+"""
+Memory of pending-request tracking over simulated weeks of uptime.
+
+Each simulated day opens a few bookings, takes a burst of requests, has
+staff approve/deny most of them and closes bookings from two days earlier.
+The old dict-of-sets (user_submissions[guild][user] = {"Slot N"}) was only
+pruned on approve/deny, so leftovers pile up; SubmissionIndex drops them
+when their booking closes.
+
+Usage: python -m bench.bench_submissions [days]
+"""
+import random
+import sys
+import tracemalloc
+
+from booking.submissions import SubmissionIndex
+
+BOOKINGS_PER_DAY = 4
+SLOTS_PER_BOOKING = 50
+REQUESTS_PER_BOOKING = 120
+HANDLED_RATIO = 0.8  # share of requests staff approve/deny; the rest are abandoned
+GUILD_ID = 1
+
+
+def simulate(days: int, use_index: bool, report):
+    rng = random.Random(7)
+    index = SubmissionIndex()
+    legacy = {}
+    open_bookings = []
+    booking_id = 0
+
+    for day in range(1, days + 1):
+        for _ in range(BOOKINGS_PER_DAY):
+            booking_id += 1
+            open_bookings.append((day, booking_id))
+            for _ in range(REQUESTS_PER_BOOKING):
+                user_id = rng.randrange(10_000, 20_000)
+                slot_no = rng.randint(1, SLOTS_PER_BOOKING)
+                handled = rng.random() < HANDLED_RATIO
+                if use_index:
+                    index.add(GUILD_ID, booking_id, user_id, slot_no, "Some VTC")
+                    if handled:
+                        index.remove(GUILD_ID, booking_id, user_id, slot_no)
+                else:
+                    slots = legacy.setdefault(GUILD_ID, {}).setdefault(user_id, set())
+                    slots.add(f"Slot {slot_no}")
+                    if handled:
+                        slots.discard(f"Slot {slot_no}")
+
+        # Bookings older than two days get deleted
+        while open_bookings and open_bookings[0][0] <= day - 2:
+            _, closed = open_bookings.pop(0)
+            if use_index:
+                index.close_booking(closed)
+
+        if day % 7 == 0 or day == days:
+            report(day)
+
+
+def main(days: int):
+    rows = {}
+
+    for use_index in (False, True):
+        def report(day):
+            # Everything the simulation still holds on to at this point
+            rows.setdefault(day, {})[use_index] = tracemalloc.get_traced_memory()[0]
+
+        tracemalloc.start()
+        simulate(days, use_index, report)
+        tracemalloc.stop()
+
+    print(f"{'day':>5} {'dict-of-sets':>14} {'SubmissionIndex':>16}")
+    for day in sorted(rows):
+        print(f"{day:>5} {rows[day][False] / 1024:>12.1f}KB {rows[day][True] / 1024:>14.1f}KB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 56)
@@ -0,0 +1,65 @@
+# bench/bench_truckersmp.py
+"""
+Latency of a TruckersMP lookup: a new aiohttp.ClientSession per call (how the
+commands used to work) versus the shared TruckersMPClient.
+
+Runs against the local stub by default. Pass --url https://api.truckersmp.com/v2
+to include real DNS/TCP/TLS setup costs, which is where the pooled client wins most.
+
+Usage: python -m bench.bench_truckersmp [--requests 200] [--url URL]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+from bench.stub_truckersmp import start_stub
+from truckersmp.client import TruckersMPClient
+
+
+def summarize(name: str, samples: list):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"{name:<22} n={len(samples):<5} mean={statistics.mean(samples) * 1000:7.2f}ms "
+          f"p50={p50:7.2f}ms p99={p99:7.2f}ms")
+
+
+async def per_call_session(base_url: str, event_id: int) -> float:
+    started = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/events/{event_id}") as resp:
+            await resp.json()
+    return time.perf_counter() - started
+
+
+async def shared_client(client: TruckersMPClient, event_id: int) -> float:
+    started = time.perf_counter()
+    # The raw request, not get_event(): its cache would answer every call after the first
+    await client.get_json(f"/events/{event_id}")
+    return time.perf_counter() - started
+
+
+async def main(requests: int, url: str, event_id: int):
+    runner = None
+    if url is None:
+        runner, url = await start_stub()
+    client = TruckersMPClient(base_url=url)
+    try:
+        summarize("per-call session", [await per_call_session(url, event_id) for _ in range(requests)])
+        summarize("shared client", [await shared_client(client, event_id) for _ in range(requests)])
+    finally:
+        await client.close()
+        if runner:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--url", default=None, help="API base URL (default: local stub)")
+    parser.add_argument("--event-id", type=int, default=10001)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.url, args.event_id))
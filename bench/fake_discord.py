@@ -0,0 +1,354 @@
+# bench/fake_discord.py
+"""
+Local stand-in for the Discord REST API and gateway, for driving the bot offline.
+
+REST: an aiohttp server answering the routes the bot uses (login, messages,
+interaction callbacks, followups, DMs, users) with plausible payloads. Every
+message it creates is kept, so a driver can read back the components the bot
+sent (select options, modal inputs, request-card buttons) and click them the
+way a client would. Point discord.py at it with use(), which rewrites
+discord.http.Route.BASE for REST and webhook/interaction calls alike.
+
+Gateway: no websocket; guild_create() and interact() hand payloads straight
+to the client's ConnectionState parsers, which is where a real gateway
+dispatch ends up. interact() returns once the bot has answered the
+interaction (or sent the followup of a deferred one) and its handler is done.
+"""
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime, timezone
+
+import discord
+from aiohttp import web
+
+BOT_USER_ID = 900000000000000001
+APPLICATION_ID = BOT_USER_ID
+
+# Interaction callback types (Discord API)
+CHANNEL_MESSAGE = 4
+DEFERRED_CHANNEL_MESSAGE = 5
+DEFERRED_UPDATE_MESSAGE = 6
+UPDATE_MESSAGE = 7
+MODAL = 9
+
+TOKEN_PREFIX = "replay"
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id % 100000}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+        "public_flags": 0,
+    }
+
+
+def member_payload(user_id: int, roles=()) -> dict:
+    return {
+        "user": user_payload(user_id),
+        "roles": [str(r) for r in roles],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "permissions": str(discord.Permissions.general().value),
+    }
+
+
+def channel_payload(channel_id: int, guild_id: int, name: str) -> dict:
+    return {
+        "id": str(channel_id),
+        "guild_id": str(guild_id),
+        "type": 0,
+        "name": name,
+        "position": 0,
+        "permission_overwrites": [],
+        "nsfw": False,
+        "parent_id": None,
+        "permissions": str(discord.Permissions.all().value),
+    }
+
+
+def _json(payload) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly "application/json" (no charset)
+    return web.Response(body=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+
+
+class FakeDiscord:
+    """Fake REST server plus gateway feed for one bot; see the module docstring."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.messages = {}  # {message id: payload}, channel and interaction messages alike
+        self.channel_messages = {}  # {channel id: [message id, ...]} in send order
+        self.requests = {}  # {"METHOD route": count}
+        self._ids = itertools.count(int((time.time() * 1000 - 1420070400000)) << 22)
+        self._responses = {}  # {interaction id: Future of (callback type, message payload)}
+        self._followups = {}  # {interaction token: Future of message payload}
+        self._sources = {}  # {interaction id: id of the message the interaction came from}
+        self._message_waiters = []  # [(predicate, Future)]
+        self._runner = None
+        self.base_url = None
+        self.client = None
+
+    def snowflake(self) -> int:
+        return next(self._ids)
+
+    # ---------- Lifecycle ----------
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/api/v10/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/api/v10"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def use(self, client: discord.Client):
+        """Send this client's REST calls (including interaction responses) here."""
+        discord.http.Route.BASE = self.base_url
+        self.client = client
+
+    # ---------- REST ----------
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        parts = request.match_info["path"].split("/")
+        try:
+            body = await request.json() if request.content_type == "application/json" else {}
+        except ConnectionResetError:
+            # The bot closed its session mid-request while shutting down
+            return web.Response(status=499)
+        route = "/".join(":id" if p.isdigit() or p.startswith(TOKEN_PREFIX) else p for p in parts)
+        key = f"{request.method} {route}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        if key == "GET users/@me":
+            return _json(user_payload(BOT_USER_ID, bot=True))
+        if key == "GET oauth2/applications/@me":
+            return _json({
+                "id": str(APPLICATION_ID), "name": "Replay", "description": "", "icon": None,
+                "bot_public": True, "bot_require_code_grant": False, "verify_key": "0" * 64,
+                "owner": user_payload(1), "flags": 0,
+            })
+        if key == "GET users/:id":
+            return _json(user_payload(int(parts[1])))
+        if key == "POST users/@me/channels":
+            recipient = int(body["recipient_id"])
+            return _json({"id": str(recipient + 1), "type": 1, "recipients": [user_payload(recipient)]})
+        if key == "POST channels/:id/messages":
+            return _json(self._create_message(int(parts[1]), body))
+        if key == "PATCH channels/:id/messages/:id":
+            return _json(self._edit_message(int(parts[3]), body))
+        if key == "POST interactions/:id/:id/callback":
+            return _json(self._callback(int(parts[1]), parts[2], body))
+        if key == "POST webhooks/:id/:id":
+            message = self._create_message(None, body)
+            future = self._followups.get(parts[2])
+            if future is not None and not future.done():
+                future.set_result(message)
+            return _json(message)
+        if key == "PATCH webhooks/:id/:id/messages/@original":
+            return _json(self._create_message(None, body))
+        if request.method == "DELETE":
+            return web.Response(status=204)
+        return _json({})
+
+    def _create_message(self, channel_id: int, body: dict, message_id: int = None) -> dict:
+        message_id = message_id or self.snowflake()
+        message = {
+            "id": str(message_id),
+            "channel_id": str(channel_id or 0),
+            "type": 0,
+            "content": body.get("content") or "",
+            "author": user_payload(BOT_USER_ID, bot=True),
+            "attachments": [],
+            "embeds": body.get("embeds") or [],
+            "components": body.get("components") or [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "flags": body.get("flags") or 0,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None,
+        }
+        self.messages[message_id] = message
+        if channel_id is not None:
+            self.channel_messages.setdefault(channel_id, []).append(message_id)
+        for waiter in list(self._message_waiters):
+            predicate, future = waiter
+            if not future.done() and predicate(message):
+                future.set_result(message)
+                self._message_waiters.remove(waiter)
+        return message
+
+    def _edit_message(self, message_id: int, body: dict) -> dict:
+        message = self.messages.get(message_id)
+        if message is None:
+            message = self._create_message(0, body, message_id)
+        for field in ("content", "embeds", "components"):
+            if field in body:
+                message[field] = body[field]
+        message["edited_timestamp"] = datetime.now(timezone.utc).isoformat()
+        return message
+
+    def _callback(self, interaction_id: int, token: str, body: dict) -> dict:
+        kind = body["type"]
+        data = body.get("data") or {}
+        message = None
+        if kind == UPDATE_MESSAGE and interaction_id in self._sources:
+            message = self._edit_message(self._sources[interaction_id], data)
+        elif kind in (CHANNEL_MESSAGE, UPDATE_MESSAGE):
+            message = self._create_message(None, data)
+        elif kind == MODAL:
+            message = data  # custom_id, title and inputs of the modal
+        future = self._responses.get(interaction_id)
+        if future is not None and not future.done():
+            future.set_result((kind, message))
+        response = {"interaction": {
+            "id": str(interaction_id),
+            "type": 2,
+            "response_message_id": message["id"] if message and "id" in message else None,
+            "response_message_loading": kind == DEFERRED_CHANNEL_MESSAGE,
+            "response_message_ephemeral": bool((data.get("flags") or 0) & 64),
+        }}
+        if message is not None and kind != MODAL:
+            response["resource"] = {"type": kind, "message": message}
+        return response
+
+    def wait_for_message(self, predicate) -> asyncio.Future:
+        """Future resolved with the next message created that matches `predicate`."""
+        future = asyncio.get_running_loop().create_future()
+        self._message_waiters.append((predicate, future))
+        return future
+
+    # ---------- Gateway ----------
+
+    def guild_create(self, guild_id: int, channels: dict, roles=(), members=()):
+        """GUILD_CREATE for a guild with text `channels` ({id: name}), `roles` (ids) and `members` (ids)."""
+        state = self.client._connection
+        state._chunk_guilds = False
+        state.parse_guild_create({
+            "id": str(guild_id),
+            "name": "Replay Guild",
+            "owner_id": "1",
+            "unavailable": False,
+            "member_count": len(members) + 1,
+            "large": False,
+            "features": [],
+            "emojis": [],
+            "stickers": [],
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "mfa_level": 0,
+            "premium_tier": 0,
+            "nsfw_level": 0,
+            "preferred_locale": "en-US",
+            "system_channel_flags": 0,
+            "roles": [
+                {"id": str(r), "name": "@everyone" if r == guild_id else f"role{r}",
+                 "permissions": str(discord.Permissions.general().value), "position": 0, "color": 0,
+                 "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+                for r in (guild_id, *roles)
+            ],
+            "channels": [channel_payload(cid, guild_id, name) for cid, name in channels.items()],
+            "members": [member_payload(BOT_USER_ID)] + [member_payload(m) for m in members],
+            "threads": [],
+            "voice_states": [],
+            "presences": [],
+        })
+
+    def message_create(self, guild_id: int, channel_id: int, author_id: int, content: str = ""):
+        """MESSAGE_CREATE from a member in a guild text channel."""
+        self.client._connection.parse_message_create({
+            "id": str(self.snowflake()),
+            "channel_id": str(channel_id),
+            "guild_id": str(guild_id),
+            "type": 0,
+            "content": content,
+            "author": user_payload(author_id),
+            "member": {k: v for k, v in member_payload(author_id).items() if k != "user"},
+            "attachments": [],
+            "embeds": [],
+            "components": [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "flags": 0,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None,
+        })
+
+    async def interact(self, guild_id: int, channel_id: int, member: dict, kind: int, data: dict,
+                       message: dict = None, followup: bool = False, timeout: float = 30.0):
+        """
+        Dispatch one INTERACTION_CREATE and wait until the bot has handled it.
+
+        Returns (callback type, message payload, seconds until answered); the
+        message is the followup when `followup` is set and the bot deferred.
+        """
+        interaction_id = self.snowflake()
+        token = f"{TOKEN_PREFIX}{interaction_id}"
+        loop = asyncio.get_running_loop()
+        response = self._responses[interaction_id] = loop.create_future()
+        followup_future = None
+        if followup:
+            followup_future = self._followups[token] = loop.create_future()
+        payload = {
+            "id": str(interaction_id),
+            "application_id": str(APPLICATION_ID),
+            "type": kind,
+            "token": token,
+            "version": 1,
+            "guild_id": str(guild_id),
+            "channel_id": str(channel_id),
+            "channel": {"id": str(channel_id), "type": 0},
+            "member": member,
+            "app_permissions": str(discord.Permissions.all().value),
+            "locale": "en-US",
+            "guild_locale": "en-US",
+            "entitlements": [],
+            "authorizing_integration_owners": {"0": str(guild_id)},
+            "context": 0,
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "data": data,
+        }
+        if message is not None:
+            payload["message"] = message
+            self._sources[interaction_id] = int(message["id"])
+        try:
+            # The handlers run in tasks created by the dispatch; waiting for them (not
+            # just the answer) means views are registered before the next click
+            before = asyncio.all_tasks()
+            started = time.perf_counter()
+            self.client._connection.parse_interaction_create(payload)
+            handlers = asyncio.all_tasks() - before
+            kind, body = await asyncio.wait_for(response, timeout)
+            if followup_future is not None and kind == DEFERRED_CHANNEL_MESSAGE:
+                body = await asyncio.wait_for(followup_future, timeout)
+            latency = time.perf_counter() - started
+            if handlers:
+                await asyncio.wait(handlers, timeout=timeout)
+            return kind, body, latency
+        finally:
+            self._responses.pop(interaction_id, None)
+            self._sources.pop(interaction_id, None)
+            self._followups.pop(token, None)
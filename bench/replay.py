@@ -0,0 +1,373 @@
+# bench/replay.py
+"""
+Replays a convoy-day workload through the real bot, fully offline.
+
+bot.py is imported as is (its store, caches, render queue, outbox and the
+command modules in ac/, vtcs/ and neppath_events.py included), logged in
+against bench.fake_discord and pointed at bench.stub_truckersmp. Every step
+goes through discord.py's own dispatch: staff /create the booking posts,
+then users click "Book Slot", pick a slot from the select menu and submit
+the modal, staff approve or deny the request cards, and /mark and /events
+run alongside. Latency is measured from dispatching an interaction to the
+bot's answer reaching the fake API (the followup, for deferred commands).
+
+Reports throughput, p50/p99 per step, outcomes, API traffic, peak RSS and
+(with --tracemalloc) the Python heap peak.
+
+A workload is JSON lines of ops with a start time "t" in seconds:
+  {"t": 0, "op": "create", "booking": 0, "slots": 100}
+  {"t": 1.2, "op": "book", "id": 7, "user": 1007, "booking": 0, "page": 0, "choice": 2, "vtc": "VTC 7"}
+  {"t": 4.0, "op": "decide", "book": 7, "staff": 11, "approve": true}
+  {"t": 2.0, "op": "mark", "staff": 11, "event": 10003}
+  {"t": 2.5, "op": "events", "user": 1007, "day": 1, "vtcs": "NepPath"}
+"create" ops run first, in order; the rest start at t / --speed (all at once with --speed 0).
+--save writes the synthetic workload so a run can be repeated exactly with --workload.
+
+Usage: python -m bench.replay [--users 300] [--bookings 3] [--slots 100] [--marks 5] [--lookups 100]
+                              [--window 10] [--speed 1] [--discord-latency-ms 0] [--truckersmp-latency-ms 0]
+                              [--save PATH | --workload PATH] [--tracemalloc]
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from bench.fake_discord import MODAL, FakeDiscord, channel_payload, member_payload
+from bench.stub_truckersmp import VTC_NAMES, start_stub
+from booking.pages import SLOTS_PER_PAGE
+
+GUILD_ID = 800000000000000001
+BOOKINGS_CHANNEL_ID = 800000000000000010
+EVENTS_CHANNEL_ID = 800000000000000011
+STAFF_COUNT = 4
+USER_BASE = 700000000000000000
+EVENT_COUNT = 500
+
+
+def synthetic_workload(users: int, bookings: int, slots: int, marks: int, lookups: int,
+                       window: float, seed: int = 1) -> list:
+    """A convoy day squeezed into `window` seconds: a booking rush, staff decisions, /mark and /events."""
+    rng = random.Random(seed)
+    staff = [USER_BASE + i for i in range(STAFF_COUNT)]
+    ops = [{"t": 0, "op": "create", "booking": b, "slots": slots} for b in range(bookings)]
+    pages = -(-slots // SLOTS_PER_PAGE)
+    for i in range(users):
+        t = round(rng.uniform(0, window), 3)
+        ops.append({
+            "t": t, "op": "book", "id": i, "user": USER_BASE + 1000 + i, "booking": rng.randrange(bookings),
+            # Most people click the first page and take one of the first slots offered
+            "page": 0 if rng.random() < 0.7 else rng.randrange(pages),
+            "choice": min(int(rng.expovariate(0.4)), 24),
+            "vtc": rng.choice(VTC_NAMES) if rng.random() < 0.3 else f"VTC {i}",
+        })
+        ops.append({
+            "t": round(t + rng.uniform(1, 4), 3), "op": "decide", "book": i,
+            "staff": rng.choice(staff), "approve": rng.random() < 0.85,
+        })
+    for _ in range(marks):
+        ops.append({"t": round(rng.uniform(0, window), 3), "op": "mark", "staff": rng.choice(staff),
+                    "event": 10001 + rng.randrange(EVENT_COUNT)})
+    for _ in range(lookups):
+        ops.append({"t": round(rng.uniform(0, window), 3), "op": "events", "user": USER_BASE + 1000 + rng.randrange(users),
+                    "day": rng.randrange(7), "vtcs": rng.choice(VTC_NAMES)})
+    ops.sort(key=lambda op: op["t"])
+    return ops
+
+
+def percentile(samples: list, q: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def find_component(components: list, kind: int, prefix: str = ""):
+    """First component of `kind` (in action rows or labels) whose custom_id starts with `prefix`."""
+    for row in components:
+        for component in row.get("components") or [row.get("component") or row]:
+            if component.get("type") == kind and component.get("custom_id", "").startswith(prefix):
+                return component
+    return None
+
+
+def fill_modal(components: list, value: str) -> list:
+    """Modal submit components answering every text input of the modal with `value`."""
+    filled = []
+    for row in components:
+        if row.get("type") == 18:  # label wrapping one input
+            inner = row["component"]
+            filled.append({"type": 18, "component": {"type": 4, "custom_id": inner["custom_id"], "value": value}})
+        else:
+            filled.append({"type": 1, "components": [
+                {"type": 4, "custom_id": c["custom_id"], "value": value} for c in row["components"]
+            ]})
+    return filled
+
+
+class Replay:
+    """Runs workload ops against the bot through a FakeDiscord; collects latencies and outcomes."""
+
+    def __init__(self, app, fake: FakeDiscord):
+        self.app = app
+        self.fake = fake
+        self.config = app.guild_configs.get(GUILD_ID)
+        self.staff_roles = sorted(self.config.staff_role_ids)[:1]
+        self.latencies = {}  # {step: [seconds]}
+        self.outcomes = {}  # {outcome: count}
+        self.interactions = 0
+        self.booking_pages = {}  # {booking index: [page message id, ...]}
+        self.cards = {}  # {book op id: Future of the request card message, or None}
+
+    def member(self, user_id: int, staff: bool = False) -> dict:
+        return member_payload(user_id, self.staff_roles if staff else ())
+
+    def count(self, outcome: str):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    async def step(self, name: str, user: dict, kind: int, data: dict, message: dict = None,
+                   channel_id: int = BOOKINGS_CHANNEL_ID, followup: bool = False):
+        kind, body, latency = await self.fake.interact(GUILD_ID, channel_id, user, kind, data, message, followup)
+        self.latencies.setdefault(name, []).append(latency)
+        self.interactions += 1
+        return kind, body
+
+    def command(self, name: str, options: dict) -> dict:
+        data = {"id": str(self.fake.snowflake()), "name": name, "type": 1, "options": [], "resolved": {}}
+        for key, value in options.items():
+            if isinstance(value, tuple):  # (channel id, channel name)
+                data["options"].append({"name": key, "type": 7, "value": str(value[0])})
+                data["resolved"].setdefault("channels", {})[str(value[0])] = channel_payload(value[0], GUILD_ID, value[1])
+            else:
+                data["options"].append({"name": key, "type": 3, "value": value})
+        return data
+
+    def card(self, op_id: int):
+        if op_id not in self.cards:
+            self.cards[op_id] = asyncio.get_running_loop().create_future()
+        return self.cards[op_id]
+
+    # ---------- Ops ----------
+
+    async def create(self, op: dict):
+        before = len(self.fake.channel_messages.get(BOOKINGS_CHANNEL_ID, []))
+        _, message = await self.step("create", self.member(USER_BASE, staff=True), 2, self.command("create", {
+            "channel": (BOOKINGS_CHANNEL_ID, "bookings"),
+            "title": f"Convoy booking {op['booking']}",
+            "slot_range": f"1-{op['slots']}",
+            "color": "blue",
+        }), followup=True)
+        self.count("create: " + ("posted" if message["content"].startswith("✅") else "failed"))
+        self.booking_pages[op["booking"]] = self.fake.channel_messages.get(BOOKINGS_CHANNEL_ID, [])[before:]
+
+    async def book(self, op: dict):
+        user = self.member(op["user"])
+        card = self.card(op["id"])
+        try:
+            pages = self.booking_pages[op["booking"]]
+            page = self.fake.messages[pages[min(op["page"], len(pages) - 1)]]
+            _, picker = await self.step("book.click", user, 3, {"custom_id": "book_slot_button", "component_type": 2}, page)
+            select = find_component(picker["components"], 3)
+            if select is None or select.get("disabled"):
+                return self.count("book: no free slot")
+
+            options = select["options"]
+            slot = options[min(op["choice"], len(options) - 1)]["value"]
+            kind, modal = await self.step("book.pick", user, 3, {
+                "custom_id": select["custom_id"], "component_type": 3, "values": [slot],
+            }, picker)
+            if kind != MODAL:
+                return self.count("book: slot taken while picking")
+
+            # The card is posted to the staff log after the user has their answer
+            log_id = str(self.config.staff_log_channel_id)
+            posted = self.fake.wait_for_message(lambda m: m["channel_id"] == log_id and any(
+                f["value"] == f"<@{op['user']}>" for f in m["embeds"][0].get("fields", [])
+            ) and m["embeds"][0]["fields"][2]["value"] == slot)
+            _, answer = await self.step("book.submit", user, 5, {
+                "custom_id": modal["custom_id"], "components": fill_modal(modal["components"], op["vtc"]),
+            })
+            if not answer["content"].startswith("✅"):
+                posted.cancel()
+                return self.count("book: refused")
+            card.set_result(await asyncio.wait_for(posted, 30))
+            self.count("book: requested")
+        finally:
+            if not card.done():
+                card.set_result(None)
+
+    async def decide(self, op: dict):
+        card = await self.card(op["book"])
+        if card is None:
+            return
+        action = "approve" if op["approve"] else "deny"
+        # Clicked on the card as it is now (it may have been edited since it was posted)
+        message = self.fake.messages[int(card["id"])]
+        button = find_component(message["components"], 2, f"request:{action}:")
+        _, answer = await self.step(f"decide.{action}", self.member(op["staff"], staff=True), 3, {
+            "custom_id": button["custom_id"], "component_type": 2,
+        }, message, channel_id=self.config.staff_log_channel_id)
+        # Anything but the plain acknowledgement is a refusal (slot taken meanwhile, already handled, ...)
+        self.count(f"{action}: " + ("done" if answer["content"] in ("✅ Approved.", "❌ Denied.") else "refused"))
+
+    async def mark(self, op: dict):
+        _, message = await self.step("mark", self.member(op["staff"], staff=True), 2, self.command("mark", {
+            "event_link": f"https://truckersmp.com/events/{op['event']}",
+            "channel": (EVENTS_CHANNEL_ID, "events"),
+        }), channel_id=EVENTS_CHANNEL_ID, followup=True)
+        self.count("mark: " + ("posted" if message["content"].startswith("✅") else "failed"))
+
+    async def events(self, op: dict):
+        day = datetime.now(timezone.utc).date() + timedelta(days=op["day"])
+        _, message = await self.step("events", self.member(op["user"]), 2, self.command("events", {
+            "date": day.strftime("%d/%m/%y"), "vtcs": op["vtcs"],
+        }), channel_id=EVENTS_CHANNEL_ID, followup=True)
+        self.count("events: " + ("none found" if message["content"].startswith("❌") else "listed"))
+
+    async def run_op(self, op: dict):
+        try:
+            await getattr(self, op["op"])(op)
+        except Exception as e:
+            self.count(f"{op['op']}: error {type(e).__name__}")
+            if not isinstance(e, asyncio.TimeoutError):
+                traceback.print_exc()
+
+    async def run(self, workload: list, speed: float) -> float:
+        for op in workload:
+            if op["op"] == "create":
+                await self.run_op(op)
+        started = time.perf_counter()
+        tasks = []
+        for op in workload:
+            if op["op"] == "create":
+                continue
+            if speed:
+                delay = op["t"] / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.run_op(op)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+
+# ---------- Setup ----------
+
+def load_bot(workdir: str, truckersmp_url: str):
+    """Import bot.py configured for an offline run; returns the module."""
+    os.environ["BOT_TOKEN"] = ""  # import without connecting
+    os.environ["SLOT_STORE_PATH"] = os.path.join(workdir, "slots.db")
+    os.environ["EVENTS_SNAPSHOT_PATH"] = os.path.join(workdir, "events_snapshot.json")
+    os.environ["TRUCKERSMP_API_URL"] = truckersmp_url
+    os.environ["METRICS_PORT"] = "0"
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module("bot")
+
+
+async def stop_bot(app):
+    # Same order as bot.main()
+    await app.command_sync.stop()
+    await app.metrics.stop()
+    await app.render_queue.stop()
+    await app.outbox.stop()
+    await app.reminders.stop()
+    await app.event_catalogue.stop()
+    await app.templates.stop()
+    await app.truckersmp.close()
+    await app.store.close()
+    await app.bot.close()
+
+
+async def drain(app, timeout: float = 30.0) -> float:
+    """Wait for queued booking/card edits to go out; returns how long that took."""
+    started = time.perf_counter()
+    while app.render_queue.depth or app.render_queue.stats()["running"]:
+        if time.perf_counter() - started > timeout:
+            break
+        await asyncio.sleep(0.05)
+    return time.perf_counter() - started
+
+
+def report(replay: Replay, elapsed: float, drained: float, fake: FakeDiscord, stub_stats: dict, app):
+    print(f"\nReplayed {replay.interactions} interactions in {elapsed:.2f}s "
+          f"({replay.interactions / elapsed:.1f}/s); edits drained {drained:.2f}s later")
+    print(f"{'step':<16}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, samples in sorted(replay.latencies.items()):
+        samples.sort()
+        print(f"{name:<16}{len(samples):>6}{percentile(samples, 0.5) * 1000:>10.1f}"
+              f"{percentile(samples, 0.99) * 1000:>10.1f}{samples[-1] * 1000:>10.1f}")
+    print("Outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(replay.outcomes.items())))
+    print(f"Discord API: {sum(fake.requests.values())} requests")
+    for route, n in sorted(fake.requests.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {route:<44}{n:>6}")
+    print(f"TruckersMP stub: {stub_stats['requests']} requests")
+    queue = app.render_queue.stats()
+    print(f"Render queue: sent {queue['sent']} · merged {queue['merged']} · dropped {queue['dropped']} · failed {queue['failed']}")
+    print("DM outbox: waiting " + str(app.outbox.depth()) + " · "
+          + " · ".join(f"{k} {v}" for k, v in app.outbox.counters.items()))
+    print(f"Peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB", end="")
+    if tracemalloc.is_tracing():
+        print(f"; Python heap peak {tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f} MB", end="")
+    print()
+
+
+async def main(args):
+    if args.workload:
+        with open(args.workload, encoding="utf-8") as f:
+            workload = [json.loads(line) for line in f if line.strip()]
+    else:
+        workload = synthetic_workload(args.users, args.bookings, args.slots, args.marks, args.lookups, args.window)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(op) + "\n" for op in workload)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    stub, stub_url = await start_stub(latency_ms=args.truckersmp_latency_ms, event_count=EVENT_COUNT)
+    fake = FakeDiscord(latency_ms=args.discord_latency_ms)
+    await fake.start()
+    with tempfile.TemporaryDirectory() as workdir:
+        app = load_bot(workdir, stub_url)
+        fake.use(app.bot)
+        try:
+            await app.bot.login("replay")  # runs setup_hook: store, caches, queues, persistent views
+            staff = [USER_BASE + i for i in range(STAFF_COUNT)]
+            config = app.guild_configs.get(GUILD_ID)  # the defaults: no settings stored
+            fake.guild_create(
+                GUILD_ID,
+                {BOOKINGS_CHANNEL_ID: "bookings", EVENTS_CHANNEL_ID: "events", config.staff_log_channel_id: "staff-log"},
+                roles=sorted(config.staff_role_ids)[:1],
+                members=staff,
+            )
+            await app.event_catalogue.wait_ready(timeout=30)
+
+            replay = Replay(app, fake)
+            elapsed = await replay.run(workload, args.speed)
+            drained = await drain(app)
+            report(replay, elapsed, drained, fake, stub.app["stats"], app)
+        finally:
+            await stop_bot(app)
+            await fake.stop()
+            await stub.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--bookings", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--marks", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--window", type=float, default=10.0, help="seconds the synthetic rush is spread over")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor; 0 = no pauses")
+    parser.add_argument("--discord-latency-ms", type=float, default=0)
+    parser.add_argument("--truckersmp-latency-ms", type=float, default=0)
+    parser.add_argument("--save", help="write the synthetic workload to this file")
+    parser.add_argument("--workload", help="replay this workload file instead of a synthetic one")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slower)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+# bench/startup.py
+"""
+Startup time and memory of the bot under each gateway profile (GATEWAY_PROFILE).
+
+Every profile runs in its own interpreter so their memory does not mix. Each
+run imports bot.py, logs in against bench.fake_discord (setup_hook included),
+then receives the gateway traffic of --guilds guilds the way that profile
+would. With the members intent ("full"), GUILD_CREATE carries every member,
+standing in for the member chunks discord.py requests at startup. Without it
+("lean"), Discord only sends the bot's own member. Then each guild gets
+--messages MESSAGE_CREATE events. Message content is left empty when the
+message content intent is off.
+
+Reports per profile: import, login and guild ingest times, RSS after login
+and at the end, and what ended up cached (members, users, messages).
+
+Usage: python -m bench.startup [--guilds 20] [--members 2000] [--messages 500] [--profiles full,lean]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+GUILD_BASE = 810000000000000000
+MEMBER_BASE = 710000000000000000
+ROLES_PER_GUILD = 20
+
+
+def rss_mb() -> float:
+    """Current resident set size; the peak where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def measure(args) -> dict:
+    """One run in this interpreter; GATEWAY_PROFILE is already set."""
+    from bench.fake_discord import FakeDiscord
+    from bench.replay import load_bot, stop_bot
+    from bench.stub_truckersmp import start_stub
+
+    stub, stub_url = await start_stub(event_count=50)
+    fake = FakeDiscord()
+    await fake.start()
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        app = load_bot(workdir, stub_url)
+        imported = time.perf_counter()
+        fake.use(app.bot)
+        try:
+            await app.bot.login("replay")
+            logged_in = time.perf_counter()
+            rss_login = rss_mb()
+
+            intents = app.bot.intents
+            before = asyncio.all_tasks()
+            for g in range(args.guilds):
+                guild_id = GUILD_BASE + g * 1000
+                channel_id = guild_id + 1
+                roles = [guild_id + 100 + r for r in range(ROLES_PER_GUILD)]
+                members = [MEMBER_BASE + g * args.members + m for m in range(args.members)]
+                fake.guild_create(
+                    guild_id, {channel_id: "general"}, roles=roles,
+                    members=members if intents.members else (),
+                )
+                for m in range(args.messages):
+                    content = f"message {m} in guild {g}" if intents.message_content else ""
+                    fake.message_create(guild_id, channel_id, members[m % len(members)], content)
+            # Wait for the handlers dispatched meanwhile (on_message for every message)
+            handlers = asyncio.all_tasks() - before
+            if handlers:
+                await asyncio.wait(handlers)
+            ingested = time.perf_counter()
+            gc.collect()
+
+            return {
+                "profile": os.environ["GATEWAY_PROFILE"],
+                "import_s": imported - started,
+                "login_s": logged_in - imported,
+                "ingest_s": ingested - logged_in,
+                "rss_login_mb": rss_login,
+                "rss_mb": rss_mb(),
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "members": sum(len(guild.members) for guild in app.bot.guilds),
+                "users": len(app.bot.users),
+                "messages": len(app.bot.cached_messages),
+            }
+        finally:
+            await stop_bot(app)
+            await fake.stop()
+            await stub.cleanup()
+
+
+def run_profile(profile: str, args) -> dict:
+    env = {**os.environ, "GATEWAY_PROFILE": profile}
+    command = [
+        sys.executable, "-m", "bench.startup", "--child",
+        "--guilds", str(args.guilds), "--members", str(args.members), "--messages", str(args.messages),
+    ]
+    result = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    # The last line is the child's result; anything before it is the bot's own output
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(results: list, args):
+    print(f"{args.guilds} guilds × {args.members} members, {args.messages} messages per guild")
+    print(f"{'profile':<10}{'import s':>10}{'login s':>10}{'ingest s':>10}{'RSS login':>11}{'RSS end':>10}"
+          f"{'peak':>8}{'members':>10}{'users':>9}{'messages':>10}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['import_s']:>10.2f}{r['login_s']:>10.2f}{r['ingest_s']:>10.2f}"
+              f"{r['rss_login_mb']:>9.1f}MB{r['rss_mb']:>8.1f}MB{r['peak_rss_mb']:>6.0f}MB"
+              f"{r['members']:>10}{r['users']:>9}{r['messages']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=2000, help="members per guild")
+    parser.add_argument("--messages", type=int, default=500, help="messages per guild")
+    parser.add_argument("--profiles", default="full,lean")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args))))
+    else:
+        report([run_profile(p.strip(), args) for p in args.profiles.split(",") if p.strip()], args)
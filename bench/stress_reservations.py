@@ -0,0 +1,163 @@
+# bench/stress_reservations.py
+"""
+Stress check for slot approvals: thousands of concurrent Approve / Deny /
+Remove Approval clicks on real request cards, verifying no slot is ever
+double booked and no two edits of one message overlap.
+
+Runs the bot offline like bench.replay: staff /create --bookings posts, then
+--requests users book a slot through the picker and modal, mostly one of the
+first few slots so that many requests compete for each slot. Then --clicks
+staff clicks on random request cards arrive spread over --window seconds,
+many of them while others are still being handled. Every click
+goes through RequestButton, so approvals run bot.decide_requests (the
+reservation engine and store.apply_decisions) and booking page / card edits
+go out through the render queue. The fake API answers after
+--discord-latency-ms, so a message edited again before its previous edit was
+answered is seen, and counted as an overlapping edit.
+
+Afterwards the store's slots must match every booking's board, and each slot
+must have at most one approved request: the one whose VTC is on the board.
+
+Usage: python -m bench.stress_reservations [--bookings 5] [--slots 50] [--requests 300] [--clicks 3000]
+                                           [--window 20] [--discord-latency-ms 2]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from aiohttp import web
+
+from bench.fake_discord import FakeDiscord
+from bench.replay import (
+    BOOKINGS_CHANNEL_ID, GUILD_ID, STAFF_COUNT, USER_BASE, Replay, drain, find_component, load_bot, stop_bot,
+)
+from bench.stub_truckersmp import start_stub
+
+ACTIONS = (("approve", 0.6), ("deny", 0.15), ("unapprove", 0.25))
+DONE = ("✅ Approved.", "❌ Denied.", "♻ Removed approval")
+
+
+class EditTrackingDiscord(FakeDiscord):
+    """FakeDiscord that notices a channel message edited while an earlier edit of it is still in flight."""
+
+    def __init__(self, latency_ms: float = 0):
+        super().__init__(latency_ms)
+        self.editing = set()  # {message id} with an edit in flight
+        self.edits = 0
+        self.overlapping_edits = 0
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        parts = request.match_info["path"].split("/")
+        if request.method != "PATCH" or len(parts) != 4 or parts[0] != "channels" or parts[2] != "messages":
+            return await super()._handle(request)
+        message_id = parts[3]
+        self.edits += 1
+        if message_id in self.editing:
+            self.overlapping_edits += 1
+        self.editing.add(message_id)
+        try:
+            return await super()._handle(request)
+        finally:
+            self.editing.discard(message_id)
+
+
+async def click(replay: Replay, delay: float, card_id: int, action: str, staff: int):
+    """After `delay`, click `action` on the request card as it is then; counts whether the bot carried it out."""
+    await asyncio.sleep(delay)
+    message = replay.fake.messages[card_id]
+    button = find_component(message["components"], 2, f"request:{action}:")
+    _, answer = await replay.step(f"decide.{action}", replay.member(staff, staff=True), 3, {
+        "custom_id": button["custom_id"], "component_type": 2,
+    }, message, channel_id=replay.config.staff_log_channel_id)
+    replay.count(f"{action}: " + ("done" if answer["content"].startswith(DONE) else "refused"))
+
+
+async def verify(app, cards: list) -> dict:
+    """Check the boards against the store; returns {booking id: {slot: VTC}} of approved requests."""
+    stored = (await app.store.load())["bookings"]
+    for booking_id, data in app.booking_messages.items():
+        slots = {n: vtc for n, vtc in stored[booking_id]["slots"].items() if vtc is not None}
+        assert slots == data["board"].assignments(), f"Slots of booking {booking_id} out of sync with the store"
+
+    approved = {}
+    for card in cards:
+        request_id = int(find_component(card["components"], 2, "request:approve:")["custom_id"].rsplit(":", 1)[1])
+        request = await app.store.get_request(request_id)
+        if request["status"] != "approved":
+            continue
+        slots = approved.setdefault(request["message_id"], {})
+        assert request["slot_no"] not in slots, f"Slot {request['slot_no']} of {request['message_id']} approved twice"
+        slots[request["slot_no"]] = request["vtc_name"]
+    for booking_id, data in app.booking_messages.items():
+        assert approved.get(booking_id, {}) == data["board"].assignments(), \
+            f"Approved requests of booking {booking_id} do not match its board"
+    return approved
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    stub, stub_url = await start_stub(event_count=10)
+    fake = EditTrackingDiscord(latency_ms=args.discord_latency_ms)
+    await fake.start()
+    with tempfile.TemporaryDirectory() as workdir:
+        app = load_bot(workdir, stub_url)
+        fake.use(app.bot)
+        try:
+            await app.bot.login("replay")
+            staff = [USER_BASE + i for i in range(STAFF_COUNT)]
+            config = app.guild_configs.get(GUILD_ID)
+            fake.guild_create(
+                GUILD_ID, {BOOKINGS_CHANNEL_ID: "bookings", config.staff_log_channel_id: "staff-log"},
+                roles=sorted(config.staff_role_ids)[:1], members=staff,
+            )
+
+            replay = Replay(app, fake)
+            seed = [{"t": 0, "op": "create", "booking": b, "slots": args.slots} for b in range(args.bookings)]
+            seed += [{
+                "t": 0, "op": "book", "id": i, "user": USER_BASE + 1000 + i, "booking": rng.randrange(args.bookings),
+                # Skewed towards the first free slots so competing requests are common
+                "page": 0, "choice": min(int(rng.expovariate(0.7)), 24), "vtc": f"VTC {i}",
+            } for i in range(args.requests)]
+            await replay.run(seed, speed=0)
+            await drain(app)
+            cards = [card.result() for card in replay.cards.values() if card.result() is not None]
+            assert cards, "no request was booked"
+
+            actions, weights = zip(*ACTIONS)
+            clicks = [
+                click(replay, rng.uniform(0, args.window), int(rng.choice(cards)["id"]),
+                      rng.choices(actions, weights)[0], rng.choice(staff))
+                for _ in range(args.clicks)
+            ]
+            started = time.perf_counter()
+            await asyncio.gather(*clicks)
+            elapsed = time.perf_counter() - started
+            await drain(app)
+
+            # The cards as they are now, for their request ids
+            approved = await verify(app, [fake.messages[int(card["id"])] for card in cards])
+            assert fake.overlapping_edits == 0, f"{fake.overlapping_edits} edits of one message overlapped"
+
+            print(f"{args.clicks} clicks on {len(cards)} request cards in {elapsed:.2f}s "
+                  f"({args.clicks / elapsed:.0f}/s)")
+            print("Outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(replay.outcomes.items())))
+            print(f"Slots approved at the end: {sum(map(len, approved.values()))}; "
+                  f"message edits {fake.edits}, overlapping 0")
+        finally:
+            await stop_bot(app)
+            await fake.stop()
+            await stub.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=50, help="slots per booking")
+    parser.add_argument("--requests", type=int, default=300, help="slot requests booked before the clicks")
+    parser.add_argument("--clicks", type=int, default=3000)
+    parser.add_argument("--window", type=float, default=20.0, help="seconds the clicks are spread over")
+    parser.add_argument("--discord-latency-ms", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
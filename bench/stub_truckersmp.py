@@ -0,0 +1,103 @@
+# bench/stub_truckersmp.py
+"""
+Local stand-in for api.truckersmp.com/v2 with synthetic events and VTCs.
+
+Used by the benchmarks in bench/ (the repository has no test suite), or run
+by hand: point the bot at it with TRUCKERSMP_API_URL=http://127.0.0.1:8089/v2.
+Unknown event and VTC ids answer 404 the way the real API does, so the
+client's error path can be exercised too.
+
+Usage: python -m bench.stub_truckersmp [--port 8089] [--latency-ms 0] [--events 500]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+VTC_NAMES = ["NepPath", "Himalayan Haulers", "Kathmandu Express", "Everest Logistics", "Terai Transport"]
+
+
+def make_events(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    events = []
+    for i in range(1, count + 1):
+        vtc_id = rng.randrange(len(VTC_NAMES))
+        meetup = now + timedelta(hours=rng.randint(-24, 24 * 14))
+        events.append({
+            "id": 10000 + i,
+            "name": f"Convoy #{i}",
+            "game": rng.choice(["ETS2", "ATS"]),
+            "server": {"id": 1, "name": rng.choice(["Event Server", "Simulation 1", "Arcade"])},
+            "meetupDateTime": meetup.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "banner": f"https://example.invalid/banners/{i}.png",
+            "creator": {"id": vtc_id + 1, "name": VTC_NAMES[vtc_id], "avatar": f"https://example.invalid/vtc/{vtc_id + 1}.png"},
+            "attendances": {"confirmed": rng.randint(0, 300)},
+        })
+    return events
+
+
+def make_app(latency_ms: float = 0, event_count: int = 500) -> web.Application:
+    events = make_events(event_count)
+    by_id = {e["id"]: e for e in events}
+    stats = {"requests": 0}
+
+    async def delay():
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    async def list_events(request):
+        await delay()
+        return web.json_response({"error": False, "response": events})
+
+    async def get_event(request):
+        await delay()
+        event = by_id.get(int(request.match_info["event_id"]))
+        if not event:
+            return web.json_response({"error": True, "response": "Event not found"}, status=404)
+        return web.json_response({"error": False, "response": event})
+
+    async def get_vtc(request):
+        await delay()
+        vtc_id = int(request.match_info["vtc_id"])
+        if not 1 <= vtc_id <= len(VTC_NAMES):
+            return web.json_response({"error": True, "response": "VTC not found"}, status=404)
+        return web.json_response({"error": False, "response": {
+            "id": vtc_id,
+            "name": VTC_NAMES[vtc_id - 1],
+            "description": "Synthetic VTC",
+            "rules": "Be nice",
+            "recruitmentState": "Open",
+            "foundingDate": "2021-01-01",
+            "memberCount": 42 * vtc_id,
+            "logo": f"https://example.invalid/vtc/{vtc_id}.png",
+        }})
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_get("/v2/events", list_events)
+    app.router.add_get("/v2/events/{event_id}", get_event)
+    app.router.add_get("/v2/vtc/{vtc_id}", get_vtc)
+    return app
+
+
+async def start_stub(port: int = 0, latency_ms: float = 0, event_count: int = 500):
+    """Start the stub in the running loop; returns (runner, base_url)."""
+    runner = web.AppRunner(make_app(latency_ms, event_count))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v2"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency_ms, args.events), host="127.0.0.1", port=args.port)
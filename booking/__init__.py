@@ -0,0 +1,2 @@
+# booking/__init__.py
+# Slot booking state: reservations, rendering and indexes used by bot.py
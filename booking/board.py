@@ -0,0 +1,120 @@
+# booking/board.py
+import sys
+
+# Per-slot state codes stored in SlotBoard._state
+FREE = 0
+HELD = 1       # a staff action is writing a change for this slot
+CONFIRMED = 2
+
+
+class SlotBoard:
+    """
+    Slots `first`..`first + count - 1` of one booking.
+
+    State is one byte per slot in a bytearray and VTC names are interned
+    string references in a parallel list, so a 10k-slot board is a few tens
+    of KB instead of a dict of "Slot N" strings. `free_count` is maintained
+    on every change, which makes "any free?" O(1), and first_free() skips
+    taken slots with bytearray.find (a C-level memchr) instead of a Python loop.
+    """
+
+    __slots__ = ("first", "_state", "_vtc", "free_count")
+
+    def __init__(self, first: int, count: int):
+        self.first = first
+        self._state = bytearray(count)
+        self._vtc = [None] * count
+        self.free_count = count
+
+    @classmethod
+    def from_assignments(cls, first: int, count: int, assignments: dict):
+        """Build a board from {slot_no: vtc_name or None} (as loaded from the store)."""
+        board = cls(first, count)
+        for slot_no, vtc in assignments.items():
+            if vtc:
+                board.set_confirmed(slot_no, vtc)
+        return board
+
+    def __len__(self):
+        return len(self._state)
+
+    def __contains__(self, slot_no: int):
+        return self.first <= slot_no < self.first + len(self._state)
+
+    @property
+    def last(self) -> int:
+        return self.first + len(self._state) - 1
+
+    def _index(self, slot_no: int) -> int:
+        if slot_no not in self:
+            raise KeyError(slot_no)
+        return slot_no - self.first
+
+    # ---------- Reads ----------
+
+    def state(self, slot_no: int) -> int:
+        return self._state[self._index(slot_no)]
+
+    def vtc(self, slot_no: int):
+        """VTC name shown for the slot (kept while a confirmed slot is held for removal)."""
+        return self._vtc[self._index(slot_no)]
+
+    def any_free(self) -> bool:
+        return self.free_count > 0
+
+    def first_free(self, limit: int, start: int = None) -> list:
+        """Up to `limit` free slot numbers, in order, starting at slot `start` (default: the first slot)."""
+        state = self._state
+        pos = 0 if start is None else max(0, start - self.first)
+        result = []
+        while len(result) < limit:
+            pos = state.find(FREE, pos)
+            if pos < 0:
+                break
+            result.append(self.first + pos)
+            pos += 1
+        return result
+
+    def items(self, start: int = None, stop: int = None):
+        """Yield (slot_no, vtc_name or None) for slots start..stop-1, clamped to the board."""
+        lo = 0 if start is None else max(0, start - self.first)
+        hi = len(self._state) if stop is None else min(len(self._state), stop - self.first)
+        vtc = self._vtc
+        for i in range(lo, hi):
+            yield self.first + i, vtc[i]
+
+    def assignments(self) -> dict:
+        """{slot_no: vtc_name} of confirmed slots."""
+        return {self.first + i: self._vtc[i] for i, s in enumerate(self._state) if s == CONFIRMED}
+
+    # ---------- Transitions ----------
+
+    def _set(self, i: int, state: int):
+        old = self._state[i]
+        if old == state:
+            return
+        if old == FREE:
+            self.free_count -= 1
+        elif state == FREE:
+            self.free_count += 1
+        self._state[i] = state
+
+    def set_held(self, slot_no: int):
+        self._set(self._index(slot_no), HELD)
+
+    def set_confirmed(self, slot_no: int, vtc_name: str):
+        i = self._index(slot_no)
+        self._vtc[i] = sys.intern(vtc_name)
+        self._set(i, CONFIRMED)
+
+    def set_free(self, slot_no: int):
+        i = self._index(slot_no)
+        self._vtc[i] = None
+        self._set(i, FREE)
+
+    def restore(self, slot_no: int, vtc_name: str = None):
+        """Put a held slot back to what it was: confirmed to `vtc_name`, or free."""
+        if vtc_name:
+            self.set_confirmed(slot_no, vtc_name)
+        else:
+            self.set_free(slot_no)
@@ -0,0 +1,39 @@
+# booking/pages.py
+"""
+Split a booking's slot list across several embeds.
+
+Discord caps an embed description at 4096 characters and a whole message at
+6000, so one embed stops fitting somewhere past a hundred or so approved
+slots. Each page holds a fixed run of SLOTS_PER_PAGE slots, so a slot always
+belongs to the same page and changing it only means re-rendering that page.
+"""
+
+SLOTS_PER_PAGE = 50
+MAX_PAGES = 25
+MAX_VTC_CHARS = 60  # 50 lines of "Slot 1234 - <60 chars> ✅" stay under 4096
+
+
+def page_count(slot_count: int) -> int:
+    return max(1, -(-slot_count // SLOTS_PER_PAGE))
+
+
+def page_of(first_slot_no: int, slot_no: int) -> int:
+    return (slot_no - first_slot_no) // SLOTS_PER_PAGE
+
+
+def page_title(title: str, page: int, pages: int) -> str:
+    return title if pages == 1 else f"{title} ({page + 1}/{pages})"
+
+
+def render_page(board, page: int) -> str:
+    """Render only the lines of `page` of a SlotBoard."""
+    start = board.first + page * SLOTS_PER_PAGE
+    lines = []
+    for slot_no, vtc in board.items(start, start + SLOTS_PER_PAGE):
+        if vtc:
+            if len(vtc) > MAX_VTC_CHARS:
+                vtc = vtc[:MAX_VTC_CHARS - 1] + "…"
+            lines.append(f"Slot {slot_no} - {vtc} ✅")
+        else:
+            lines.append(f"Slot {slot_no}")
+    return "\n".join(lines)
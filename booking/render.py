@@ -0,0 +1,202 @@
+# booking/render.py
+import asyncio
+import contextvars
+import heapq
+import time
+import traceback
+
+# Priorities (lower runs first when several edits are due at once)
+USER_FACING = 0  # booking posts members are looking at
+STAFF_LOG = 1    # request cards in the staff log channel
+
+
+class _Job:
+    __slots__ = ("render", "priority", "seq", "due", "context")
+
+    def __init__(self, render, priority: int, seq: int, due: float, context):
+        self.render = render
+        self.priority = priority
+        self.seq = seq  # of the job's live heap entry; older entries are skipped
+        self.due = due
+        self.context = context  # contextvars of the latest scheduler (carries its trace)
+
+
+class RenderQueue:
+    """
+    Debounced, coalescing scheduler for message edits.
+
+    schedule(key, render) asks for `render()` (an async callable that edits one
+    message from current state) to run at most once per `window` seconds for
+    that key. Any further schedules for the same key before it runs replace the
+    pending render and count as merged, so 30 approvals in a burst turn into a
+    handful of edits. Edits run on a background worker with limited
+    concurrency; when several are due, user-facing ones go first. A 429 from
+    Discord only delays this queue, never the command that scheduled the edit.
+
+    Nothing is shed to bound the queue: renders read current state, so a
+    dropped one would leave its message stale until something scheduled it
+    again. Coalescing already keeps it to one job per message; only edits of
+    messages that are gone are discarded (discard()).
+    """
+
+    def __init__(self, window: float = 1.5, concurrency: int = 4, max_last_run: int = 2000):
+        self.window = window
+        self.max_last_run = max_last_run
+        self._jobs = {}      # {key: _Job}
+        self._heap = []      # [(due, priority, seq, key)]
+        self._last_run = {}  # {key: monotonic time the last edit started}
+        self._running = set()
+        self._tasks = set()
+        self._seq = 0
+        self._sem = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self.merged = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+    # ---------- Public API ----------
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop the worker, then send every edit still pending right away so no post is left stale."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        try:
+            await asyncio.wait_for(self._flush(), timeout)
+        except asyncio.TimeoutError:
+            print(f"❌ Render queue: {len(self._jobs) + len(self._running)} edit(s) not sent before shutdown.")
+
+    def schedule(self, key, render, priority: int = USER_FACING):
+        job = self._jobs.get(key)
+        if job is not None:
+            # Latest render wins; keep the better priority and the original due time
+            job.render = render
+            job.context = contextvars.copy_context()
+            if priority < job.priority:
+                # Re-pushed so the heap orders it by the new priority; the old entry goes stale
+                job.priority = priority
+                self._push(key, job)
+            self.merged += 1
+            return
+
+        now = time.monotonic()
+        due = max(now + self.window, self._last_run.get(key, 0) + self.window)
+        self._seq += 1
+        job = self._jobs[key] = _Job(render, priority, self._seq, due, contextvars.copy_context())
+        heapq.heappush(self._heap, (due, priority, job.seq, key))
+        self._wakeup.set()
+
+    def discard(self, key):
+        """Forget the pending edit for `key` (its message was deleted); counted as dropped."""
+        if self._jobs.pop(key, None) is not None:
+            self.dropped += 1
+
+    @property
+    def depth(self) -> int:
+        return len(self._jobs)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "running": len(self._running),
+            "sent": self.sent,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    # ---------- Internals ----------
+
+    def _push(self, key, job: _Job):
+        self._seq += 1
+        job.seq = self._seq
+        heapq.heappush(self._heap, (job.due, job.priority, job.seq, key))
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, seq, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is not None and job.seq == seq:
+                    due.append((key, job))
+
+            if not due:
+                delay = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due.sort(key=lambda kv: (kv[1].priority, kv[1].seq))
+            for key, job in due:
+                if key in self._running:
+                    # Previous edit for this key is still in flight (e.g. sleeping on a 429); try again later
+                    job.due = time.monotonic() + self.window
+                    self._push(key, job)
+                    continue
+                await self._sem.acquire()
+                # The job may have been discarded while waiting for a slot
+                job = self._jobs.pop(key, None)
+                if job is None:
+                    self._sem.release()
+                    continue
+                self._launch(key, job)
+
+            self._prune_last_run()
+
+    def _launch(self, key, job: _Job):
+        """Run `job` now; the caller holds a semaphore slot, released when it finishes."""
+        self._running.add(key)
+        self._last_run[key] = time.monotonic()
+        task = asyncio.create_task(self._execute(key, job), context=job.context)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self):
+        # Edits in flight first, so a pending one for the same message is not sent alongside
+        if self._tasks:
+            await asyncio.wait(set(self._tasks))
+        pending = sorted(self._jobs.items(), key=lambda kv: (kv[1].priority, kv[1].seq))
+        self._jobs.clear()
+        self._heap.clear()
+        for key, job in pending:
+            await self._sem.acquire()
+            self._launch(key, job)
+        if self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+    async def _execute(self, key, job: _Job):
+        try:
+            await job.render()
+            self.sent += 1
+        except Exception:
+            self.failed += 1
+            traceback.print_exc()
+        finally:
+            self._running.discard(key)
+            self._sem.release()
+
+    def _prune_last_run(self):
+        if len(self._last_run) > self.max_last_run:
+            cutoff = time.monotonic() - self.window
+            self._last_run = {k: t for k, t in self._last_run.items() if t > cutoff}
@@ -0,0 +1,115 @@
+# booking/reservation.py
+import asyncio
+import weakref
+
+from booking import board as board_state
+
+# Slot states
+FREE = "free"            # nobody has asked for it
+PENDING = "pending"      # one or more requests are waiting for staff
+HELD = "held"            # a staff action is writing a change for it
+CONFIRMED = "confirmed"  # approved and assigned to a VTC
+
+
+class ReservationError(Exception):
+    """Raised when a slot transition is not allowed from its current state."""
+
+
+class Hold:
+    """Token returned by ReservationEngine.hold*; required to finish the transition."""
+
+    __slots__ = ("message_id", "slot_no", "previous")
+
+    def __init__(self, message_id: int, slot_no: int, previous: str):
+        self.message_id = message_id
+        self.slot_no = slot_no
+        self.previous = previous  # VTC name the slot had before the hold (None if free)
+
+
+class ReservationEngine:
+    """
+    Compare-and-set slot transitions plus one asyncio.Lock per booking message.
+
+    Transitions are synchronous, so they are atomic on the event loop. A slot
+    is HELD while its change is being persisted, which makes a second approval
+    for the same slot fail fast instead of overwriting the first one. The
+    per-booking lock only serializes work that must not interleave for one
+    booking (embed edits); different bookings never wait on each other.
+    Slot state itself lives in each booking's SlotBoard.
+    """
+
+    def __init__(self, bookings: dict, is_pending=None):
+        self._bookings = bookings  # same dict as bot.booking_messages
+        self._is_pending = is_pending  # is_pending(message_id, slot_no) -> bool, from the submission index
+        self._held = {}  # {(message_id, slot_no): Hold}
+        self._locks = weakref.WeakValueDictionary()  # {message_id: asyncio.Lock}
+
+    def lock(self, message_id: int) -> asyncio.Lock:
+        lock = self._locks.get(message_id)
+        if lock is None:
+            lock = self._locks[message_id] = asyncio.Lock()
+        return lock
+
+    def _board(self, message_id: int):
+        data = self._bookings.get(message_id)
+        if not data:
+            raise ReservationError("Booking data not found.")
+        return data["board"]
+
+    def state(self, message_id: int, slot_no: int) -> str:
+        code = self._board(message_id).state(slot_no)
+        if code == board_state.HELD:
+            return HELD
+        if code == board_state.CONFIRMED:
+            return CONFIRMED
+        if self._is_pending and self._is_pending(message_id, slot_no):
+            return PENDING
+        return FREE
+
+    # ---------- Holds ----------
+
+    def hold(self, message_id: int, slot_no: int) -> Hold:
+        """FREE/PENDING -> HELD, before approving."""
+        board = self._board(message_id)
+        if slot_no not in board:
+            raise ReservationError(f"Slot {slot_no} does not exist.")
+        code = board.state(slot_no)
+        if code == board_state.HELD:
+            raise ReservationError(f"Slot {slot_no} is being updated by another staff member.")
+        if code == board_state.CONFIRMED:
+            raise ReservationError("Slot already approved.")
+        board.set_held(slot_no)
+        hold = self._held[(message_id, slot_no)] = Hold(message_id, slot_no, None)
+        return hold
+
+    def hold_confirmed(self, message_id: int, slot_no: int) -> Hold:
+        """CONFIRMED -> HELD, before removing an approval."""
+        board = self._board(message_id)
+        code = board.state(slot_no) if slot_no in board else None
+        if code == board_state.HELD:
+            raise ReservationError(f"Slot {slot_no} is being updated by another staff member.")
+        if code != board_state.CONFIRMED:
+            raise ReservationError("Slot is not approved.")
+        previous = board.vtc(slot_no)
+        board.set_held(slot_no)
+        hold = self._held[(message_id, slot_no)] = Hold(message_id, slot_no, previous)
+        return hold
+
+    def _finish(self, hold: Hold):
+        key = (hold.message_id, hold.slot_no)
+        if self._held.get(key) is not hold:
+            raise ReservationError(f"Slot {hold.slot_no} is not held by this action.")
+        del self._held[key]
+        return self._board(hold.message_id)
+
+    def confirm(self, hold: Hold, vtc_name: str):
+        """HELD -> CONFIRMED."""
+        self._finish(hold).set_confirmed(hold.slot_no, vtc_name)
+
+    def release(self, hold: Hold):
+        """HELD -> FREE (or PENDING if requests are still waiting)."""
+        self._finish(hold).set_free(hold.slot_no)
+
+    def rollback(self, hold: Hold):
+        """HELD -> whatever the slot was before the hold, e.g. when persisting failed."""
+        self._finish(hold).restore(hold.slot_no, hold.previous)
@@ -0,0 +1,98 @@
+# booking/submissions.py
+
+
+class SubmissionIndex:
+    """
+    Pending slot requests, indexed both ways.
+
+    Forward:  (guild_id, booking_id, user_id) -> {slot_no}
+    Reverse:  (booking_id, slot_no)           -> {user_id: vtc_name}
+
+    Slots are plain ints. Every entry is also listed under its booking, so
+    close_booking() drops all of a booking's requests in one call and the
+    index only ever holds requests for bookings that are still open. Entries
+    may carry the id of their durable request record (see request_id()).
+    """
+
+    def __init__(self):
+        self._by_user = {}  # {(guild_id, booking_id, user_id): set(slot_no)}
+        self._by_slot = {}  # {(booking_id, slot_no): {user_id: vtc_name}}
+        self._by_booking = {}  # {booking_id: set((guild_id, user_id))}
+        self._ids = {}  # {(booking_id, user_id, slot_no): request_id}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, guild_id: int, booking_id: int, user_id: int, slot_no: int, vtc_name: str,
+            request_id: int = None) -> bool:
+        """Record a request; returns False if this user already asked for this slot."""
+        slots = self._by_user.setdefault((guild_id, booking_id, user_id), set())
+        if slot_no in slots:
+            return False
+        slots.add(slot_no)
+        if request_id is not None:
+            self._ids[(booking_id, user_id, slot_no)] = request_id
+        self._by_slot.setdefault((booking_id, slot_no), {})[user_id] = vtc_name
+        self._by_booking.setdefault(booking_id, set()).add((guild_id, user_id))
+        self._count += 1
+        return True
+
+    def remove(self, guild_id: int, booking_id: int, user_id: int, slot_no: int) -> bool:
+        """Forget a request; returns False if it was already gone."""
+        key = (guild_id, booking_id, user_id)
+        slots = self._by_user.get(key)
+        if not slots or slot_no not in slots:
+            return False
+        slots.discard(slot_no)
+        self._ids.pop((booking_id, user_id, slot_no), None)
+        if not slots:
+            del self._by_user[key]
+            users = self._by_booking.get(booking_id)
+            if users is not None:
+                users.discard((guild_id, user_id))
+                if not users:
+                    del self._by_booking[booking_id]
+        requests = self._by_slot.get((booking_id, slot_no))
+        if requests is not None:
+            requests.pop(user_id, None)
+            if not requests:
+                del self._by_slot[(booking_id, slot_no)]
+        self._count -= 1
+        return True
+
+    def has(self, guild_id: int, booking_id: int, user_id: int, slot_no: int) -> bool:
+        return slot_no in self._by_user.get((guild_id, booking_id, user_id), ())
+
+    def request_id(self, booking_id: int, user_id: int, slot_no: int):
+        return self._ids.get((booking_id, user_id, slot_no))
+
+    def user_slots(self, guild_id: int, booking_id: int, user_id: int) -> frozenset:
+        return frozenset(self._by_user.get((guild_id, booking_id, user_id), ()))
+
+    def requests_for_slot(self, booking_id: int, slot_no: int) -> dict:
+        """{user_id: vtc_name} of everyone waiting on this slot."""
+        return dict(self._by_slot.get((booking_id, slot_no), {}))
+
+    def has_pending(self, booking_id: int, slot_no: int) -> bool:
+        return (booking_id, slot_no) in self._by_slot
+
+    def pending_for_booking(self, booking_id: int) -> list:
+        """[(guild_id, user_id, slot_no, vtc_name)] for every open request on the booking, by slot."""
+        result = []
+        for guild_id, user_id in self._by_booking.get(booking_id, ()):
+            for slot_no in self._by_user.get((guild_id, booking_id, user_id), ()):
+                result.append((guild_id, user_id, slot_no, self._by_slot[(booking_id, slot_no)][user_id]))
+        result.sort(key=lambda r: (r[2], r[1]))
+        return result
+
+    def close_booking(self, booking_id: int) -> int:
+        """Drop every request for a booking that was closed or deleted; returns how many went."""
+        removed = 0
+        for guild_id, user_id in self._by_booking.pop(booking_id, ()):
+            for slot_no in self._by_user.pop((guild_id, booking_id, user_id), ()):
+                self._by_slot.pop((booking_id, slot_no), None)
+                self._ids.pop((booking_id, user_id, slot_no), None)
+                removed += 1
+        self._count -= removed
+        return removed
@@ -1,31 +1,72 @@
 # ---------------- bot.py — Part 1 ----------------
 
-import aiohttp
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
 import re
 import traceback
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 import os
+import time
 from dotenv import load_dotenv
 from ac.decline import setup_decline_command
 from ac.review import setup_review_command
+from ac.config import setup_config_command
+from ac.respond import Responder, setup_respond_command
 from vtcs.vtc import setup_vtc_command
 from neppath_events import setup_neppath_events
+from storage.sqlite import SQLiteStore
+from truckersmp.client import TruckersMPClient, TruckersMPError
+from truckersmp.catalogue import EventCatalogue
+from reminders import ReminderService
+from outbox import Outbox
+from guild_config import GuildConfigs
+from embed_templates import TemplateLibrary
+from command_sync import CommandSync
+from permissions import NotStaff, StaffPermissions
+from sharding import IdSequence, ShardPlan
+from metrics import REGISTRY as metrics, InstrumentedTree, timed
+from tracing import TRACER as tracer, JsonlExporter
+from booking.reservation import ReservationEngine, ReservationError
+from booking.submissions import SubmissionIndex
+from booking.board import SlotBoard, FREE
+from booking.render import RenderQueue, USER_FACING, STAFF_LOG
+from booking.pages import MAX_PAGES, SLOTS_PER_PAGE, page_count, page_of, page_title, render_page
 # ---------------- CONFIG ----------------
 
 load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
-
-STAFF_ROLE_IDS = [
-    1395579577555878012,
-    1395579347804487769,
-    1395580379565527110,
-    1395699038715642031,
-    1395578532406624266,
-]
-STAFF_LOG_CHANNEL_ID = 1446383730242355200
+SLOT_STORE_PATH = os.getenv("SLOT_STORE_PATH", "slots.db")
+EVENTS_SNAPSHOT_PATH = os.getenv("EVENTS_SNAPSHOT_PATH", "events_snapshot.json")
+EVENTS_REFRESH_SECONDS = int(os.getenv("EVENTS_REFRESH_SECONDS", "300"))
+# Minutes before meetup at which /mark'ed events get a reminder ping
+REMINDER_OFFSETS = [int(m) for m in os.getenv("REMINDER_OFFSETS", "60,15").split(",") if m.strip()]
+# Minimum spacing between two approval/denial DMs
+DM_INTERVAL_SECONDS = float(os.getenv("DM_INTERVAL_SECONDS", "0.5"))
+# Prometheus text endpoint (GET /metrics); off unless METRICS_PORT is set
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Share of interactions traced into TRACE_PATH (JSON lines); 0 turns tracing off
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_PATH = os.getenv("TRACE_PATH", "traces.jsonl")
+# Sharding: SHARD_COUNT runs an AutoShardedBot; SHARD_IDS (e.g. "0,1") picks this process's shards
+# when several processes split the bot and share SLOT_STORE_PATH
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i.strip()]
+# "lean" (default) subscribes only to the events the handlers use and caches no members or messages;
+# "full" is the old setup: members and message content intents, member cache and chunking
+GATEWAY_PROFILE = os.getenv("GATEWAY_PROFILE", "lean")
+# Invitation response embeds (/respond, /review, /decline, /accepted, ...), one TOML file each,
+# reloaded when they change
+TEMPLATES_DIR = os.getenv("TEMPLATES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+TEMPLATES_RELOAD_SECONDS = float(os.getenv("TEMPLATES_RELOAD_SECONDS", "5"))
+# Slash commands are synced at startup when they changed; COMMAND_SYNC_GUILD_IDS (e.g. a test server)
+# syncs them to those guilds, where changes show up at once, instead of globally
+COMMAND_SYNC_GUILD_IDS = [int(i) for i in os.getenv("COMMAND_SYNC_GUILD_IDS", "").split(",") if i.strip()]
+COMMAND_SYNC_FORCE = os.getenv("COMMAND_SYNC_FORCE", "0") == "1"
+
+# Staff roles, the staff log channel and emojis are per guild: see guild_config.py and /config
 
 COLOR_OPTIONS = {
     "blue": discord.Color.blue(),
@@ -39,24 +80,61 @@ COLOR_OPTIONS = {
 }
 
 # ---------------- INTENTS ----------------
-    
-def is_staff_member(member: discord.Member) -> bool:
-    try:
-        return any(role.id in STAFF_ROLE_IDS for role in member.roles)
-    except:
-        return False
-
-intents = discord.Intents.default()
-intents.guilds = True
-intents.members = True
-intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+def gateway_options(profile: str) -> dict:
+    """Intents and cache settings for the bot constructor."""
+    if profile == "full":
+        intents = discord.Intents.default()
+        intents.members = True
+        intents.message_content = True
+        return {"intents": intents}
+    # Interactions carry their member (roles included) and channel, so all the bot needs from the
+    # gateway is guilds (channels and roles for the cache) and guild messages (deleted bookings)
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+    }
+
+if TRACE_SAMPLE_RATE > 0:
+    tracer.configure(JsonlExporter(TRACE_PATH), TRACE_SAMPLE_RATE)
+
+shards = ShardPlan(SHARD_COUNT, SHARD_IDS)
+bot_class = commands.AutoShardedBot if shards.sharded else commands.Bot
+
+# One TraceConfig per HTTP client feeds both metrics and tracing
+# The bot has slash commands only; a mention prefix keeps discord.py from asking for message content
+bot = bot_class(
+    command_prefix=commands.when_mentioned, tree_cls=InstrumentedTree,
+    http_trace=tracer.attach(metrics.trace_config("discord"), "discord"),
+    **gateway_options(GATEWAY_PROFILE),
+    **shards.bot_options(),
+)
+# Shared TruckersMP API client (one pooled session for the bot's lifetime)
+truckersmp = TruckersMPClient(trace_configs=[tracer.attach(metrics.trace_config("truckersmp"), "truckersmp")])
+event_catalogue = EventCatalogue(truckersmp, EVENTS_SNAPSHOT_PATH, EVENTS_REFRESH_SECONDS)
+store = SQLiteStore(SLOT_STORE_PATH)
+# Per-guild staff roles, log channel and emojis, cached in memory
+guild_configs = GuildConfigs(store)
+# Staff checks, cached only when member events arrive to keep the cache current (the "full" profile);
+# `staff_only` is the app command check shared with ac/
+permissions = StaffPermissions(guild_configs, cache=bot.intents.members)
+permissions.listen(bot)
+staff_only = permissions.staff_only
+templates = TemplateLibrary(TEMPLATES_DIR, TEMPLATES_RELOAD_SECONDS)
+responder = Responder(templates, guild_configs)
+command_sync = CommandSync(bot, store, COMMAND_SYNC_GUILD_IDS, force=COMMAND_SYNC_FORCE)
 # ---------- Setup modular commands ----------
-setup_review_command(bot, is_staff_member)
-setup_decline_command(bot, is_staff_member)
-setup_vtc_command(bot)
-setup_neppath_events(bot)
+setup_review_command(bot, staff_only, responder)
+setup_decline_command(bot, staff_only, responder)
+setup_respond_command(bot, staff_only, responder)
+setup_config_command(bot, guild_configs)
+setup_vtc_command(bot, truckersmp)
+setup_neppath_events(bot, event_catalogue)
 # ---------- Global error handlers ----------
 
 @bot.event
@@ -66,7 +144,18 @@ async def on_error(event_method, *args, **kwargs):
 
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    name = interaction.command.qualified_name if interaction.command else "unknown"
+    if isinstance(error, NotStaff):
+        # A refused check, not a failure of the command
+        metrics.command_finished(interaction, name)
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.send_message(str(error), ephemeral=True)
+        except Exception:
+            pass
+        return
     print("App command error:", repr(error))
+    metrics.command_finished(interaction, name, error=True)
     try:
         if not interaction.response.is_done():
             await interaction.response.send_message(
@@ -75,33 +164,173 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
     except Exception:
         pass
 
-# ---------- In-memory storage ----------
-
-# Note: in-memory only — consider persisting for production
-booking_messages = {}  # {message_id: {"message": Message, "slots": {slot: vtc_name}}}
-user_submissions = {}  # {guild_id: {user_id: set(slots)}}
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    metrics.command_finished(interaction, command.qualified_name)
+
+# ---------- Storage ----------
+
+# In-memory index, written through to `store` and rebuilt from it on startup
+booking_messages = {}  # {message_id: {"messages": {page: PartialMessage}, "channel_id", "guild_id", "title", "color", "image", "pages": [message_id, ...], "board": SlotBoard}}
+booking_pages = {}  # {continuation page message_id: booking message_id}
+submissions = SubmissionIndex()  # pending requests by (guild, booking, user) and by (booking, slot)
+request_cards = {}  # {request_id: (channel id, message id) of its staff-log card} of pending requests
+# Unique across shard processes sharing the store, and higher than any id from before a restart
+request_ids = IdSequence(shards.worker_id)
+
+reservations = ReservationEngine(booking_messages, is_pending=submissions.has_pending)
+render_queue = RenderQueue()
+reminders = ReminderService(bot, store, truckersmp, event_catalogue, REMINDER_OFFSETS, owns=shards.owns)
+outbox = Outbox(bot, store, min_interval=DM_INTERVAL_SECONDS, ids=IdSequence(shards.worker_id), owns=shards.owns)
+
+metrics.gauge("render_queue_depth", lambda: render_queue.depth)
+metrics.gauge("outbox_depth", outbox.depth)
+metrics.gauge("open_bookings", lambda: len(booking_messages))
+metrics.gauge("pending_requests", lambda: len(submissions))
+
+async def load_bookings():
+    """Rebuild booking_messages and submissions from the store (bookings of this process's guilds only)."""
+    started = time.perf_counter()
+    snapshot = await store.load()
+
+    slot_count = 0
+    for message_id, booking in snapshot["bookings"].items():
+        slots = booking.pop("slots")
+        if not slots or not shards.owns(booking["guild_id"]):
+            continue
+        board = SlotBoard.from_assignments(next(iter(slots)), len(slots), slots)
+        slot_count += len(board)
+        # Only ids are persisted; message handles are created on first edit
+        booking_messages[message_id] = {"messages": {}, **booking, "board": board}
+        for page_id in booking["pages"][1:]:
+            booking_pages[page_id] = message_id
+
+    for request_id, guild_id, user_id, message_id, slot_no, vtc_name, log_channel_id, log_message_id in snapshot["requests"]:
+        if message_id not in booking_messages:
+            continue
+        submissions.add(guild_id, message_id, user_id, slot_no, vtc_name, request_id)
+        if log_message_id:
+            # Cards from before their channel was stored: assume the log channel has not changed since
+            request_cards[request_id] = (log_channel_id or guild_configs.get(guild_id).staff_log_channel_id, log_message_id)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"✅ Loaded {len(booking_messages)} bookings ({slot_count} slots) in {elapsed:.0f} ms.")
 
 # ---------- Helpers ----------
 
-def is_staff_member(member: discord.Member) -> bool:
-    """Return True if the member has any of the STAFF_ROLE_IDS."""
-    try:
-        return any(role.id in STAFF_ROLE_IDS for role in member.roles)
-    except Exception:
-        return False
-
 async def parse_slot_range(slot_range: str):
-    """Parse a simple range like "1-10" into ["Slot 1", ..., "Slot 10"]."""
+    """Parse a simple range like "1-10" into range(1, 11)."""
     try:
         start_str, end_str = slot_range.split("-")
         start = int(start_str)
         end = int(end_str)
         if start < 1 or end < start:
             raise ValueError
-        return [f"Slot {i}" for i in range(start, end + 1)]
+        return range(start, end + 1)
     except Exception:
         return None
 
+def get_page_message(data: dict, page: int) -> discord.PartialMessage:
+    """Return a page's message handle, creating (and caching) a PartialMessage without any API call."""
+    message = data["messages"].get(page)
+    if message is None:
+        channel = bot.get_partial_messageable(data["channel_id"], guild_id=data.get("guild_id"))
+        message = data["messages"][page] = channel.get_partial_message(data["pages"][page])
+    return message
+
+def build_booking_embed(data: dict, page: int = 0) -> discord.Embed:
+    """Render one page of the booking embed from stored state (PartialMessage has no embeds to copy)."""
+    pages = page_count(len(data["board"]))
+    embed = discord.Embed(
+        title=page_title(data["title"], page, pages),
+        description=render_page(data["board"], page),
+        color=data["color"],
+    )
+    if data.get("image") and page == 0:
+        embed.set_image(url=data["image"])
+    return embed
+
+async def refresh_booking_page(message_id: int, page: int):
+    """Edit one page of the booking from current state; edits for the same booking never interleave."""
+    async with reservations.lock(message_id):
+        data = booking_messages.get(message_id)
+        if not data:
+            return
+        try:
+            with tracer.span("booking.refresh_page", booking_id=message_id, page=page):
+                await get_page_message(data, page).edit(embed=build_booking_embed(data, page))
+        except discord.NotFound:
+            pass
+
+def schedule_booking_refresh(message_id: int, slot_no: int):
+    """Queue a re-render of the page holding `slot_no`; bursts of changes to it collapse into one edit.
+
+    A pending queue entry per (booking, page) is that page's dirty bit: other pages are never re-sent.
+    """
+    data = booking_messages.get(message_id)
+    if not data:
+        return
+    page = page_of(data["board"].first, slot_no)
+    render_queue.schedule(("booking", message_id, page), lambda: refresh_booking_page(message_id, page), USER_FACING)
+
+def schedule_log_edit(message: discord.Message, **fields):
+    """Queue an edit of a staff-log request card behind any pending booking edits."""
+    render_queue.schedule(("log", message.id), lambda: message.edit(**fields), STAFF_LOG)
+
+def build_request_embed(user_id: int, vtc_name: str, slot_no: int) -> discord.Embed:
+    embed = discord.Embed(title="📥 Slot Booking Request", color=discord.Color.orange())
+    embed.add_field(name="User", value=f"<@{user_id}>", inline=False)
+    embed.add_field(name="VTC Name", value=vtc_name, inline=False)
+    embed.add_field(name="Slot Number", value=str(slot_no), inline=False)
+    embed.set_footer(text="Waiting for staff action")
+    return embed
+
+def close_request_card(request_id: int, guild_id: int, user_id: int, vtc_name: str, slot_no: int, approved: bool,
+                       staff, card: discord.Message = None):
+    """
+    Show a request's staff-log card as decided: colored, signed, and only "Remove Approval" left active.
+
+    The card is edited in the channel it was posted in, which need not be the
+    guild's staff log channel any more.
+    """
+    known = request_cards.pop(request_id, None)
+    if card is not None:
+        channel_id, log_message_id = card.channel.id, card.id
+    elif known is not None:
+        channel_id, log_message_id = known
+    else:
+        return
+    embed = build_request_embed(user_id, vtc_name, slot_no)
+    if approved:
+        embed.color = discord.Color.green()
+        embed.set_footer(text=f"✅ Approved by {staff}")
+    else:
+        embed.color = discord.Color.red()
+        embed.set_footer(text=f"❌ Denied by {staff}")
+    message = bot.get_partial_messageable(channel_id, guild_id=guild_id).get_partial_message(log_message_id)
+    schedule_log_edit(message, embed=embed, view=ApproveDenyView(request_id, "approved" if approved else "denied"))
+
+def decision_message(slot_no: int, vtc_name: str, approved: bool) -> str:
+    if approved:
+        return f"✅ Your slot **Slot {slot_no}** has been approved! VTC: **{vtc_name}**"
+    return f"❌ Your slot **Slot {slot_no}** has been denied or removed."
+
+async def close_booking(message_id: int):
+    """Forget a booking whose post is gone, together with all of its pending requests."""
+    data = booking_messages.pop(message_id, None)
+    if not data:
+        return
+    for page_id in data["pages"][1:]:
+        booking_pages.pop(page_id, None)
+    # Its posts are gone, so pending re-renders of them have nothing left to edit
+    for page in range(len(data["pages"])):
+        render_queue.discard(("booking", message_id, page))
+    for _, user_id, slot_no, _ in submissions.pending_for_booking(message_id):
+        request_cards.pop(submissions.request_id(message_id, user_id, slot_no), None)
+    expired = submissions.close_booking(message_id)
+    await store.delete_booking(message_id)
+    print(f"ℹ️ Booking {message_id} closed ({expired} pending request(s) expired).")
+
 def parse_color(color_str: str):
     """Accept named colors (from COLOR_OPTIONS) or hex like "#ff0000" or "ff0000"."""
     if not color_str:
@@ -119,27 +348,13 @@ def parse_color(color_str: str):
 
 class SlotBookingModal(discord.ui.Modal, title="Book Slot"):
     vtc_name = discord.ui.TextInput(label="VTC Name", placeholder="Enter your VTC name", max_length=100)
-    slot_number = discord.ui.TextInput(label="Slot Number", placeholder="Enter slot number like: 1", max_length=3)
 
-    def __init__(self, message_id: int):
-        super().__init__()
+    def __init__(self, message_id: int, slot_no: int):
+        super().__init__(title=f"Book Slot {slot_no}")
         self.message_id = message_id
+        self.slot_no = slot_no
 
-        data = booking_messages.get(message_id)
-        slots_dict = (data or {}).get("slots", {})
-        available = [s.replace("Slot ", "") for s, v in slots_dict.items() if not v]
-
-        if available:
-            preview = ", ".join(available[:10])
-            if len(available) > 10:
-                preview += ", ..."
-            placeholder = f"Available: {preview}"
-            if len(placeholder) > 100:
-                placeholder = placeholder[:97] + "..."
-            self.slot_number.placeholder = placeholder
-        else:
-            self.slot_number.placeholder = "No slots available."
-
+    @timed("modal.book_slot")
     async def on_submit(self, interaction: discord.Interaction):
         try:
             msg_id = self.message_id
@@ -148,55 +363,40 @@ class SlotBookingModal(discord.ui.Modal, title="Book Slot"):
             if not data:
                 return await interaction.response.send_message("❌ Booking data not found.", ephemeral=True)
 
-            slots_dict = data["slots"]
-            raw = self.slot_number.value.strip()
-
-            if not raw.isdigit():
-                return await interaction.response.send_message(
-                    "❌ Slot number must be a **number only**, like `1`.", ephemeral=True
-                )
-
-            slot_id = int(raw)
-            slot_name = f"Slot {slot_id}"
+            board = data["board"]
+            slot_id = self.slot_no
 
-            if slot_name not in slots_dict:
-                return await interaction.response.send_message(f"❌ Slot `{raw}` does not exist.", ephemeral=True)
+            # The slot was free when picked, but may have been approved for someone else since
+            if slot_id not in board:
+                return await interaction.response.send_message(f"❌ Slot `{slot_id}` does not exist.", ephemeral=True)
 
-            if slots_dict[slot_name]:
-                return await interaction.response.send_message(f"❌ Slot `{raw}` is already booked.", ephemeral=True)
+            if board.state(slot_id) != FREE:
+                return await interaction.response.send_message(f"❌ Slot `{slot_id}` is already booked.", ephemeral=True)
 
             guild_id = interaction.guild_id
             user_id = interaction.user.id
 
-            if guild_id not in user_submissions:
-                user_submissions[guild_id] = {}
-
-            # Prevent duplicate request by same user for same slot
-            if user_id in user_submissions[guild_id] and slot_name in user_submissions[guild_id][user_id]:
-                return await interaction.response.send_message(f"❌ You already submitted slot `{raw}`.", ephemeral=True)
-
-            # Save user request
-            user_submissions[guild_id].setdefault(user_id, set()).add(slot_name)
+            # Save user request (refused if the same user already asked for this slot). Claimed in the
+            # index before the write so a double submit is refused, and taken back if the write fails
+            request_id = next(request_ids)
+            if not submissions.add(guild_id, msg_id, user_id, slot_id, self.vtc_name.value, request_id):
+                return await interaction.response.send_message(f"❌ You already submitted slot `{slot_id}`.", ephemeral=True)
+            try:
+                await store.add_request(request_id, guild_id, user_id, msg_id, slot_id, self.vtc_name.value)
+            except Exception:
+                submissions.remove(guild_id, msg_id, user_id, slot_id)
+                raise
 
             await interaction.response.send_message(f"✅ Request submitted for slot **{slot_id}**", ephemeral=True)
 
-            # Log to staff channel (if available)
-            log_channel = bot.get_channel(STAFF_LOG_CHANNEL_ID)
+            # Log to this guild's staff channel (if it has one)
+            log_channel = interaction.guild.get_channel(guild_configs.get(guild_id).staff_log_channel_id)
             if log_channel:
-                embed = discord.Embed(title="📥 Slot Booking Request", color=discord.Color.orange())
-                embed.add_field(name="User", value=interaction.user.mention, inline=False)
-                embed.add_field(name="VTC Name", value=self.vtc_name.value, inline=False)
-                embed.add_field(name="Slot Number", value=str(slot_id), inline=False)
-                embed.set_footer(text="Waiting for staff action")
-
-                view = ApproveDenyView(
-                    user_id=user_id,
-                    vtc_name=self.vtc_name.value,
-                    slot_number=slot_name,
-                    message_id=msg_id,
-                    guild_id=guild_id,
-                )
-                await log_channel.send(embed=embed, view=view)
+                embed = build_request_embed(user_id, self.vtc_name.value, slot_id)
+                log_message = await log_channel.send(embed=embed, view=ApproveDenyView(request_id))
+                # Remembered so /pending can close this card when it decides the request
+                request_cards[request_id] = (log_channel.id, log_message.id)
+                await store.set_request_log(request_id, log_channel.id, log_message.id)
 
         except Exception:
             traceback.print_exc()
@@ -210,6 +410,82 @@ class SlotBookingModal(discord.ui.Modal, title="Book Slot"):
                 "❌ An internal error occurred while processing your booking.", ephemeral=True
             )
 
+# ---------- Slot Picker ----------
+
+PICKER_OPTIONS = 25  # Discord's limit on options in one select menu
+
+class SlotPickerView(discord.ui.View):
+    """Ephemeral select listing only free slots, a page of PICKER_OPTIONS at a time."""
+
+    def __init__(self, message_id: int, start: int = None):
+        super().__init__(timeout=180)
+        self.message_id = message_id
+        self.start = start
+        # Starts of earlier pages, for "Earlier"; opening mid-board can still go back to the top
+        self.history = [] if start is None else [None]
+        self.free = []
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the free slots from the board and rebuild the select."""
+        data = booking_messages.get(self.message_id)
+        board = data["board"] if data else None
+        # One extra slot tells whether there is a next page, without counting the rest
+        self.free = board.first_free(PICKER_OPTIONS + 1, self.start) if board else []
+        if not self.free and self.start is not None and board:
+            # Everything from here on got booked; wrap around to the first free slot
+            self.start, self.history = None, []
+            self.free = board.first_free(PICKER_OPTIONS + 1)
+
+        shown = self.free[:PICKER_OPTIONS]
+        self.select_slot.options = [discord.SelectOption(label=f"Slot {n}", value=str(n)) for n in shown] or [
+            discord.SelectOption(label="No slots available", value="0")
+        ]
+        self.select_slot.disabled = not shown
+        self.select_slot.placeholder = (
+            f"Free slots {shown[0]}–{shown[-1]}" if shown else "No slots available."
+        )
+        self.earlier.disabled = not self.history
+        self.more.disabled = len(self.free) <= PICKER_OPTIONS
+
+    @discord.ui.select(placeholder="Pick a free slot", min_values=1, max_values=1)
+    @timed("picker.select")
+    async def select_slot(self, interaction: discord.Interaction, select: discord.ui.Select):
+        try:
+            data = booking_messages.get(self.message_id)
+            if not data:
+                return await interaction.response.edit_message(content="❌ Booking data not found.", view=None)
+
+            slot_no = int(select.values[0])
+            if data["board"].state(slot_no) != FREE:
+                # Taken while the menu was open; show the fresh list instead of a doomed modal
+                self.refresh()
+                return await interaction.response.edit_message(
+                    content=f"❌ Slot `{slot_no}` was just booked. Pick another one:", view=self
+                )
+
+            await interaction.response.send_modal(SlotBookingModal(self.message_id, slot_no))
+
+        except Exception:
+            traceback.print_exc()
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ An internal error occurred when opening the booking modal.", ephemeral=True)
+
+    @discord.ui.button(label="◀ Earlier", style=discord.ButtonStyle.secondary)
+    @timed("picker.earlier")
+    async def earlier(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.start = self.history.pop() if self.history else None
+        self.refresh()
+        await interaction.response.edit_message(content="Pick a slot to book:", view=self)
+
+    @discord.ui.button(label="More ▶", style=discord.ButtonStyle.secondary)
+    @timed("picker.more")
+    async def more(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.history.append(self.start)
+        self.start = self.free[PICKER_OPTIONS]
+        self.refresh()
+        await interaction.response.edit_message(content="Pick a slot to book:", view=self)
+
 # ---------------- End of Part 1 ----------------
 # ---------------- bot.py — Part 2 ----------------
 
@@ -220,9 +496,11 @@ class BookSlotView(discord.ui.View):
         super().__init__(timeout=None)
 
     @discord.ui.button(label="📌 Book Slot", style=discord.ButtonStyle.green, custom_id="book_slot_button")
+    @timed("booking.book_slot")
     async def book_slot_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            msg_id = interaction.message.id
+            # Continuation pages of a large booking point back at its first message
+            msg_id = booking_pages.get(interaction.message.id, interaction.message.id)
             data = booking_messages.get(msg_id)
 
             if not data:
@@ -231,150 +509,194 @@ class BookSlotView(discord.ui.View):
                     ephemeral=True,
                 )
 
-            slots_dict = data.get("slots", {})
-            if not any(v is None for v in slots_dict.values()):
+            if not data["board"].any_free():
                 return await interaction.response.send_message("❌ No available slots in this booking message.", ephemeral=True)
 
-            modal = SlotBookingModal(message_id=msg_id)
-            await interaction.response.send_modal(modal)
+            # Start the list at the page that was clicked, so its free slots come first
+            page = data["pages"].index(interaction.message.id) if interaction.message.id in data["pages"] else 0
+            start = data["board"].first + page * SLOTS_PER_PAGE
+            view = SlotPickerView(msg_id, start if page else None)
+            await interaction.response.send_message("Pick a slot to book:", view=view, ephemeral=True)
 
         except Exception:
             traceback.print_exc()
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ An internal error occurred when opening the booking modal.", ephemeral=True)
 
-# ---------- Approve/Deny/Remove Approval ----------
-
-class ApproveDenyView(discord.ui.View):
-    def __init__(self, user_id: int, vtc_name: str, slot_number: str, message_id: int, guild_id: int):
-        super().__init__()
-        self.user_id = user_id
-        self.vtc_name = vtc_name
-        self.slot_number = slot_number
-        self.message_id = message_id
-        self.guild_id = guild_id
-
-    async def _notify_user(self, approved: bool):
+# ---------- Request decisions ----------
+
+async def decide_requests(booking_id: int, picked: list, approve: bool) -> str:
+    """
+    Approve or deny [(guild_id, user_id, slot_no, vtc_name)] of one booking as a unit.
+
+    The requests are taken out of the index first, so a second staff member
+    deciding the same request at the same moment is told it was handled.
+    Approvals then hold every slot, so one taken or contested slot refuses the
+    whole batch; the store commits all slot assignments and request statuses
+    in one transaction, and the holds are confirmed or rolled back together.
+    Returns an error message, or None on success.
+    """
+    if approve:
+        slot_counts = {}
+        for _, _, slot_no, _ in picked:
+            slot_counts[slot_no] = slot_counts.get(slot_no, 0) + 1
+        contested = sorted(n for n, c in slot_counts.items() if c > 1)
+        if contested:
+            return f"More than one request selected for slot(s) {', '.join(map(str, contested))}."
+
+    claimed = []
+    def unclaim():
+        for guild_id, user_id, slot_no, vtc_name, request_id in claimed:
+            submissions.add(guild_id, booking_id, user_id, slot_no, vtc_name, request_id)
+
+    for guild_id, user_id, slot_no, vtc_name in picked:
+        request_id = submissions.request_id(booking_id, user_id, slot_no)
+        if not submissions.remove(guild_id, booking_id, user_id, slot_no):
+            unclaim()
+            return "This request was already handled." if len(picked) == 1 else "Some requests were already handled."
+        claimed.append((guild_id, user_id, slot_no, vtc_name, request_id))
+
+    holds = []
+    if approve:
         try:
-            user = await bot.fetch_user(self.user_id)
-            if approved:
-                await user.send(f"✅ Your slot **{self.slot_number}** has been approved! VTC: **{self.vtc_name}**")
-            else:
-                await user.send(f"❌ Your slot **{self.slot_number}** has been denied or removed.")
-        except Exception:
-            pass
-
-    @discord.ui.button(label="✅ Approve", style=discord.ButtonStyle.green)
-    async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
-        try:
-            if not is_staff_member(interaction.user):
-                return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
-
-            data = booking_messages.get(self.message_id)
-            if not data:
-                return await interaction.response.send_message("❌ Booking data not found.", ephemeral=True)
+            for _, _, slot_no, _ in picked:
+                holds.append(reservations.hold(booking_id, slot_no))
+        except ReservationError as e:
+            for hold in holds:
+                reservations.rollback(hold)
+            unclaim()
+            return str(e)
+
+    approved = {slot_no: vtc_name for _, _, slot_no, vtc_name in picked} if approve else {}
+    status = "approved" if approve else "denied"
+    try:
+        await store.apply_decisions(
+            booking_id, approved, [(request_id, status) for *_, request_id in claimed if request_id is not None]
+        )
+    except Exception:
+        for hold in holds:
+            reservations.rollback(hold)
+        unclaim()
+        raise
 
-            slots_dict = data["slots"]
-            if slots_dict.get(self.slot_number):
-                return await interaction.response.send_message("❌ Slot already approved.", ephemeral=True)
-
-            # Approve
-            slots_dict[self.slot_number] = self.vtc_name
-            if self.user_id in user_submissions.get(self.guild_id, {}):
-                user_submissions[self.guild_id][self.user_id].discard(self.slot_number)
-
-            # Update main embed if exists
-            original_msg = data["message"]
-            if original_msg and original_msg.embeds:
-                new_embed = original_msg.embeds[0]
-                updated_lines = [f"{s} - {v} ✅" if v else s for s, v in slots_dict.items()]
-                new_embed.description = "\n".join(updated_lines)
-                try:
-                    await original_msg.edit(embed=new_embed)
-                except Exception:
-                    pass
-
-            # Update staff log message embed
-            try:
-                embed = interaction.message.embeds[0]
-                embed.color = discord.Color.green()
-                embed.set_footer(text=f"✅ Approved by {interaction.user}")
-                button.disabled = True
-                self.deny.disabled = True
-                await interaction.message.edit(embed=embed, view=self)
-            except Exception:
-                pass
+    for hold in holds:
+        reservations.confirm(hold, approved[hold.slot_no])
+    return None
 
-            await self._notify_user(True)
-            await interaction.response.send_message("✅ Approved.", ephemeral=True)
+# ---------- Approve/Deny/Remove Approval ----------
 
-        except Exception:
-            traceback.print_exc()
-            if not interaction.response.is_done():
-                await interaction.response.send_message("❌ An internal error occurred while approving.", ephemeral=True)
+REQUEST_ACTIONS = {
+    "approve": ("✅ Approve", discord.ButtonStyle.green),
+    "deny": ("❌ Deny", discord.ButtonStyle.red),
+    "unapprove": ("♻ Remove Approval", discord.ButtonStyle.gray),
+}
 
-    @discord.ui.button(label="❌ Deny", style=discord.ButtonStyle.red)
-    async def deny(self, interaction: discord.Interaction, button: discord.ui.Button):
+class RequestButton(discord.ui.DynamicItem[discord.ui.Button], template=r"request:(?P<action>approve|deny|unapprove):(?P<id>[0-9]+)"):
+    """
+    Approve / Deny / Remove Approval on a staff-log request card.
+
+    The custom_id carries the action and the request id, and the request is
+    looked up in the store when clicked, so buttons keep working after
+    timeouts and restarts without a View object per card in memory.
+    """
+
+    def __init__(self, action: str, request_id: int, disabled: bool = False):
+        label, style = REQUEST_ACTIONS[action]
+        super().__init__(discord.ui.Button(
+            label=label, style=style, custom_id=f"request:{action}:{request_id}", disabled=disabled
+        ))
+        self.action = action
+        self.request_id = request_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not permissions.is_staff(interaction.user):
+            await interaction.response.send_message(str(NotStaff()), ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        # Timed per action so approve / deny / remove latencies stay apart
+        started = time.perf_counter()
         try:
-            if not is_staff_member(interaction.user):
-                return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
-
-            if self.user_id in user_submissions.get(self.guild_id, {}):
-                user_submissions[self.guild_id][self.user_id].discard(self.slot_number)
-
-            try:
-                embed = interaction.message.embeds[0]
-                embed.color = discord.Color.red()
-                embed.set_footer(text=f"❌ Denied by {interaction.user}")
-                button.disabled = True
-                self.approve.disabled = True
-                await interaction.message.edit(embed=embed, view=self)
-            except Exception:
-                pass
+            await self._handle(interaction)
+        finally:
+            metrics.observe("callback_seconds", time.perf_counter() - started, callback=f"request.{self.action}")
+            metrics.inc("callbacks_total", callback=f"request.{self.action}")
 
-            await self._notify_user(False)
-            await interaction.response.send_message("❌ Denied.", ephemeral=True)
+    async def _handle(self, interaction: discord.Interaction):
+        try:
+            request = await store.get_request(self.request_id)
+            if not request:
+                return await interaction.response.send_message(
+                    "❌ Request not found (its booking may have been deleted).", ephemeral=True
+                )
+            if self.action == "unapprove":
+                await self.remove_approval(interaction, request)
+            else:
+                await self.decide(interaction, request, self.action == "approve")
 
         except Exception:
             traceback.print_exc()
             if not interaction.response.is_done():
-                await interaction.response.send_message("❌ An internal error occurred while denying.", ephemeral=True)
+                await interaction.response.send_message("❌ An internal error occurred while handling this request.", ephemeral=True)
+
+    async def decide(self, interaction: discord.Interaction, request: dict, approve: bool):
+        booking_id, user_id, slot_no, vtc_name = request["message_id"], request["user_id"], request["slot_no"], request["vtc_name"]
+        error = await decide_requests(booking_id, [(request["guild_id"], user_id, slot_no, vtc_name)], approve)
+        if error:
+            return await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+
+        if approve:
+            # Update the page of the main embed holding this slot
+            schedule_booking_refresh(booking_id, slot_no)
+        close_request_card(
+            self.request_id, request["guild_id"], user_id, vtc_name, slot_no, approve, interaction.user, interaction.message
+        )
+
+        await interaction.response.send_message("✅ Approved." if approve else "❌ Denied.", ephemeral=True)
+        # Queued for the outbox worker, after staff have their answer
+        await outbox.send(user_id, decision_message(slot_no, vtc_name, approve), request["guild_id"])
+
+    async def remove_approval(self, interaction: discord.Interaction, request: dict):
+        booking_id, slot_no = request["message_id"], request["slot_no"]
+        if request["status"] != "approved":
+            return await interaction.response.send_message("❌ Slot is not approved.", ephemeral=True)
 
-    @discord.ui.button(label="♻ Remove Approval", style=discord.ButtonStyle.gray)
-    async def remove_approval(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            if not is_staff_member(interaction.user):
-                return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
+            hold = reservations.hold_confirmed(booking_id, slot_no)
+        except ReservationError as e:
+            return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
 
-            data = booking_messages.get(self.message_id)
-            if not data:
-                return await interaction.response.send_message("❌ Booking data not found.", ephemeral=True)
-
-            slots_dict = data["slots"]
-            if not slots_dict.get(self.slot_number):
-                return await interaction.response.send_message("❌ Slot is not approved.", ephemeral=True)
+        # Remove approval
+        try:
+            await asyncio.gather(
+                store.set_slot(booking_id, slot_no, None),
+                store.set_request_status(self.request_id, "removed"),
+            )
+        except Exception:
+            reservations.rollback(hold)
+            raise
+        reservations.release(hold)
 
-            # Remove approval
-            slots_dict[self.slot_number] = None
+        # Update the page of the main embed holding this slot
+        schedule_booking_refresh(booking_id, slot_no)
 
-            # Update main embed if exists
-            original_msg = data["message"]
-            if original_msg and original_msg.embeds:
-                new_embed = original_msg.embeds[0]
-                updated_lines = [f"{s} - {v} ✅" if v else s for s, v in slots_dict.items()]
-                new_embed.description = "\n".join(updated_lines)
-                try:
-                    await original_msg.edit(embed=new_embed)
-                except Exception:
-                    pass
+        await interaction.response.send_message(f"♻ Removed approval for Slot {slot_no}.", ephemeral=True)
+        await outbox.send(request["user_id"], decision_message(slot_no, request["vtc_name"], False), request["guild_id"])
 
-            await self._notify_user(False)
-            await interaction.response.send_message(f"♻ Removed approval for {self.slot_number}.", ephemeral=True)
+class ApproveDenyView(discord.ui.View):
+    """The buttons of one request card; built to send or edit a card, never kept around."""
 
-        except Exception:
-            traceback.print_exc()
-            if not interaction.response.is_done():
-                await interaction.response.send_message("❌ An internal error occurred while removing approval.", ephemeral=True)
+    def __init__(self, request_id: int, status: str = "pending"):
+        super().__init__(timeout=None)
+        decided = status != "pending"
+        self.add_item(RequestButton("approve", request_id, disabled=decided))
+        self.add_item(RequestButton("deny", request_id, disabled=decided))
+        self.add_item(RequestButton("unapprove", request_id, disabled=status == "denied"))
 
 # ---------------- End of Part 2 ----------------
 # ---------------- bot.py — Part 3 ----------------
@@ -389,29 +711,206 @@ class ApproveDenyView(discord.ui.View):
     color="Color name or hex",
     image="Optional image URL",
 )
+@staff_only
 async def create(interaction: discord.Interaction, channel: discord.TextChannel, title: str, slot_range: str, color: str, image: str = None):
-    if not is_staff_member(interaction.user):
-        return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
-
-    slots_list = await parse_slot_range(slot_range)
-    if not slots_list:
+    slot_numbers = await parse_slot_range(slot_range)
+    if not slot_numbers:
         return await interaction.response.send_message("❌ Invalid slot range.", ephemeral=True)
+    if len(slot_numbers) > MAX_PAGES * SLOTS_PER_PAGE:
+        return await interaction.response.send_message(
+            f"❌ Slot range too large (max {MAX_PAGES * SLOTS_PER_PAGE} slots per booking).", ephemeral=True
+        )
 
     hex_color = parse_color(color)
     if not hex_color:
         return await interaction.response.send_message("❌ Invalid color.", ephemeral=True)
 
-    desc = "\n".join(slots_list)
-    embed = discord.Embed(title=title, description=desc, color=hex_color)
-    if image:
-        embed.set_image(url=image)
+    # Posting several pages can take longer than the interaction deadline
+    await interaction.response.defer(thinking=True, ephemeral=True)
 
-    sent_msg = await channel.send(embed=embed, view=BookSlotView())
-    booking_messages[sent_msg.id] = {"message": sent_msg, "slots": {slot: None for slot in slots_list}}
+    data = {
+        "messages": {},
+        "channel_id": channel.id,
+        "guild_id": interaction.guild_id,
+        "title": title,
+        "color": hex_color.value,
+        "image": image,
+        "pages": [],
+        "board": SlotBoard(slot_numbers.start, len(slot_numbers)),
+    }
+    for page in range(page_count(len(slot_numbers))):
+        sent_msg = await channel.send(embed=build_booking_embed(data, page), view=BookSlotView())
+        data["pages"].append(sent_msg.id)
+        data["messages"][page] = channel.get_partial_message(sent_msg.id)
+
+    booking_id = data["pages"][0]
+    booking_messages[booking_id] = data
+    for page_id in data["pages"][1:]:
+        booking_pages[page_id] = booking_id
+    await store.save_booking(
+        booking_id, channel.id, interaction.guild_id, title, hex_color.value, image,
+        slot_numbers, data["pages"][1:],
+    )
 
-    await interaction.response.send_message(f"✅ Booking embed created with {len(slots_list)} slots.", ephemeral=True)
+    await interaction.followup.send(
+        f"✅ Booking embed created with {len(slot_numbers)} slots across {len(data['pages'])} message(s).",
+        ephemeral=True,
+    )
 
 
+# ---------- /pending ----------
+
+class PendingDashboardView(discord.ui.View):
+    """Ephemeral list of a booking's open requests; staff tick several and decide them at once."""
+
+    def __init__(self, booking_id: int, page: int = 0):
+        super().__init__(timeout=600)
+        self.booking_id = booking_id
+        self.page = page
+        self.pending = []
+        self.selected = []
+        self.refresh()
+
+    def refresh(self):
+        """Re-read open requests from the index and rebuild the select for the current page."""
+        self.pending = submissions.pending_for_booking(self.booking_id)
+        pages = max(1, -(-len(self.pending) // PICKER_OPTIONS))
+        self.page = min(self.page, pages - 1)
+        shown = self.pending[self.page * PICKER_OPTIONS:(self.page + 1) * PICKER_OPTIONS]
+        self.selected = []
+
+        options = []
+        for guild_id, user_id, slot_no, vtc_name in shown:
+            user = bot.get_user(user_id)
+            options.append(discord.SelectOption(
+                label=f"Slot {slot_no} — {vtc_name}"[:100],
+                value=f"{user_id}:{slot_no}",
+                description=f"Requested by {user or user_id}"[:100],
+            ))
+        self.pick.options = options or [discord.SelectOption(label="No pending requests", value="0")]
+        self.pick.max_values = max(1, len(options))
+        self.pick.disabled = not options
+        self.approve_selected.disabled = True
+        self.deny_selected.disabled = True
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+
+    def content(self, note: str = None) -> str:
+        data = booking_messages.get(self.booking_id)
+        title = data["title"] if data else self.booking_id
+        pages = max(1, -(-len(self.pending) // PICKER_OPTIONS))
+        lines = [f"📋 **{title}**: {len(self.pending)} pending request(s) (page {self.page + 1}/{pages})"]
+        if note:
+            lines.append(note)
+        return "\n".join(lines)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not permissions.is_staff(interaction.user):
+            await interaction.response.send_message(str(NotStaff()), ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.select(placeholder="Select requests", min_values=1)
+    @timed("pending.select")
+    async def pick(self, interaction: discord.Interaction, select: discord.ui.Select):
+        self.selected = list(select.values)
+        self.approve_selected.disabled = False
+        self.deny_selected.disabled = False
+        await interaction.response.edit_message(
+            content=self.content(f"{len(self.selected)} selected."), view=self
+        )
+
+    async def _decide(self, interaction: discord.Interaction, approve: bool):
+        try:
+            by_key = {f"{user_id}:{slot_no}": (guild_id, user_id, slot_no, vtc_name)
+                      for guild_id, user_id, slot_no, vtc_name in self.pending}
+            # Requests decided elsewhere since the list was drawn are skipped
+            picked = [by_key[v] for v in self.selected if v in by_key
+                      and submissions.has(by_key[v][0], self.booking_id, by_key[v][1], by_key[v][2])]
+            if not picked:
+                self.refresh()
+                return await interaction.response.edit_message(
+                    content=self.content("❌ Those requests were already handled."), view=self
+                )
+
+            # Read before deciding: decided requests leave the index
+            ids = {(user_id, slot_no): submissions.request_id(self.booking_id, user_id, slot_no)
+                   for _, user_id, slot_no, _ in picked}
+            error = await decide_requests(self.booking_id, picked, approve)
+            if error:
+                self.refresh()
+                return await interaction.response.edit_message(
+                    content=self.content(f"❌ Nothing changed: {error}"), view=self
+                )
+
+            # Staff get their answer first; cards, booking pages and DMs follow in the background
+            self.refresh()
+            verb = "Approved" if approve else "Denied"
+            await interaction.response.edit_message(content=self.content(f"✅ {verb} {len(picked)} request(s)."), view=self)
+
+            for guild_id, user_id, slot_no, vtc_name in picked:
+                close_request_card(ids[(user_id, slot_no)], guild_id, user_id, vtc_name, slot_no, approve, interaction.user)
+                if approve:
+                    schedule_booking_refresh(self.booking_id, slot_no)
+            await outbox.send_many([
+                (user_id, decision_message(slot_no, vtc_name, approve), guild_id)
+                for guild_id, user_id, slot_no, vtc_name in picked
+            ])
+
+        except Exception:
+            traceback.print_exc()
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ An internal error occurred while applying decisions.", ephemeral=True)
+
+    @discord.ui.button(label="✅ Approve selected", style=discord.ButtonStyle.green)
+    @timed("pending.approve")
+    async def approve_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._decide(interaction, True)
+
+    @discord.ui.button(label="❌ Deny selected", style=discord.ButtonStyle.red)
+    @timed("pending.deny")
+    async def deny_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._decide(interaction, False)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    @timed("pending.previous")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.refresh()
+        await interaction.response.edit_message(content=self.content(), view=self)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    @timed("pending.next")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.refresh()
+        await interaction.response.edit_message(content=self.content(), view=self)
+
+async def booking_autocomplete(interaction: discord.Interaction, current: str):
+    """Open bookings of this guild whose title matches what was typed so far."""
+    current = current.casefold()
+    choices = []
+    for message_id, data in booking_messages.items():
+        if data.get("guild_id") != interaction.guild_id or current not in data["title"].casefold():
+            continue
+        choices.append(app_commands.Choice(name=f"{data['title']} ({message_id})"[:100], value=str(message_id)))
+        if len(choices) == 25:
+            break
+    return choices
+
+@bot.tree.command(name="pending", description="Staff only: Review and decide pending slot requests of a booking.")
+@app_commands.describe(booking="Booking to review")
+@app_commands.autocomplete(booking=booking_autocomplete)
+@staff_only
+async def pending(interaction: discord.Interaction, booking: str):
+    booking_id = int(booking) if booking.isdigit() else None
+    booking_id = booking_pages.get(booking_id, booking_id)
+    if booking_id not in booking_messages:
+        return await interaction.response.send_message("❌ Booking data not found.", ephemeral=True)
+
+    view = PendingDashboardView(booking_id)
+    await interaction.response.send_message(view.content(), view=view, ephemeral=True)
+
 # ---------- /mark with optional role mention ----------
 
 class MarkAttendanceView(discord.ui.View):
@@ -426,10 +925,8 @@ class MarkAttendanceView(discord.ui.View):
     color="Embed color name or hex (optional)",
     mention_role="Optional role to mention"
 )
+@staff_only
 async def mark(interaction: discord.Interaction, event_link: str, channel: discord.TextChannel, color: str = "blue", mention_role: discord.Role = None):
-    if not is_staff_member(interaction.user):
-        return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
-
     await interaction.response.defer(thinking=True, ephemeral=True)
 
     # Extract numeric event id
@@ -438,68 +935,63 @@ async def mark(interaction: discord.Interaction, event_link: str, channel: disco
         return await interaction.followup.send("❌ Could not find an event ID in that link.", ephemeral=True)
 
     event_id = match.group(1)
-    api_url = f"https://api.truckersmp.com/v2/events/{event_id}"
 
     # Fetch from TruckersMP API
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url) as resp:
-                if resp.status != 200:
-                    return await interaction.followup.send(f"❌ TruckersMP API returned HTTP {resp.status}.", ephemeral=True)
-                data = await resp.json()
+        with tracer.span("truckersmp.get_event", event_id=event_id):
+            event = await truckersmp.get_event(event_id)
+    except TruckersMPError as e:
+        return await interaction.followup.send(f"❌ TruckersMP API returned HTTP {e.status}.", ephemeral=True)
     except Exception as e:
         traceback.print_exc()
         return await interaction.followup.send(f"❌ Failed to contact TruckersMP API: `{e}`", ephemeral=True)
 
-    if not data.get("response"):
+    if not event:
         return await interaction.followup.send("❌ Could not fetch event data.", ephemeral=True)
 
-    event_info = data["response"]
-    event_name = event_info.get("name", "TruckersMP Event")
-
-    # Fetch meetupDateTime
-    event_start = event_info.get("meetupDateTime")
-    event_banner = event_info.get("banner")
-    event_vtc = event_info.get("creator")
-    vtc_avatar = None
-    if isinstance(event_vtc, dict):
-        vtc_avatar = event_vtc.get("avatar") or event_vtc.get("logo")
+    with tracer.span("mark.build_embed"):
+        event_name = event.name or "TruckersMP Event"
+        event_banner = event.banner
+        vtc_avatar = event.creator.avatar if event.creator else None
 
-    embed_color = parse_color(color) or discord.Color.blue()
+        embed_color = parse_color(color) or discord.Color.blue()
 
-    # Format footer timestamp
-    footer_text = "Powered by NepPath"
-    if event_start:
-        evt = event_start.rstrip("Z")
-        try:
-            dt = datetime.fromisoformat(evt).replace(tzinfo=timezone.utc)
-            utc_str = dt.strftime("%H:%M UTC")
-            npt_dt = dt + timedelta(hours=5, minutes=45)
+        # Format footer timestamp
+        footer_text = "Powered by NepPath"
+        if event.meetup_at:
+            utc_str = event.meetup_at.strftime("%H:%M UTC")
+            npt_dt = event.meetup_at + timedelta(hours=5, minutes=45)
             npt_str = npt_dt.strftime("%H:%M NPT")
             footer_text = f"Powered by NepPath | {utc_str} | {npt_str}"
-        except Exception:
-            pass
 
-    embed = discord.Embed(
-        title=event_name,
-        description="**🙏 𝐏𝐥𝐳 𝐊𝐢𝐧𝐝𝐥𝐲 𝐌𝐚𝐫𝐤 𝐘𝐨𝐔𝐑 𝐀𝐭𝐭𝐞𝐧𝐝𝐚𝐧𝐜𝐞 𝐎𝐧 𝐓𝐡𝐢𝐬 𝐄𝐯𝐞𝐧𝐭 : ❤️**",
-        color=embed_color
-    )
+        embed = discord.Embed(
+            title=event_name,
+            description="**🙏 𝐏𝐥𝐳 𝐊𝐢𝐧𝐝𝐥𝐲 𝐌𝐚𝐫𝐤 𝐘𝐨𝐔𝐑 𝐀𝐭𝐭𝐞𝐧𝐝𝐚𝐧𝐜𝐞 𝐎𝐧 𝐓𝐡𝐢𝐬 𝐄𝐯𝐞𝐧𝐭 : ❤️**",
+            color=embed_color
+        )
+
+        if event_banner:
+            embed.set_image(url=event_banner)
+        if vtc_avatar:
+            embed.set_thumbnail(url=vtc_avatar)
 
-    if event_banner:
-        embed.set_image(url=event_banner)
-    if vtc_avatar:
-        embed.set_thumbnail(url=vtc_avatar)
+        embed.set_footer(text=footer_text)
 
-    embed.set_footer(text=footer_text)
+        view = MarkAttendanceView(event_link=event_link)
 
-    view = MarkAttendanceView(event_link=event_link)
+        # Mention role if selected
+        content = mention_role.mention if mention_role else None
 
-    # Mention role if selected
-    content = mention_role.mention if mention_role else None
+    with tracer.span("mark.send", channel_id=channel.id):
+        await channel.send(content=content, embed=embed, view=view)
 
-    await channel.send(content=content, embed=embed, view=view)
-    await interaction.followup.send(f"✅ Attendance embed sent to {channel.mention}", ephemeral=True)
+    # Ping the role again before the event starts
+    with tracer.span("reminders.track"):
+        scheduled = await reminders.track(
+            event, interaction.guild_id, channel.id, mention_role.id if mention_role else None, event_link
+        )
+    note = f" ⏰ {scheduled} reminder(s) scheduled." if scheduled else ""
+    await interaction.followup.send(f"✅ Attendance embed sent to {channel.mention}{note}", ephemeral=True)
 
 # ---------- /accepted ----------
 
@@ -510,62 +1002,156 @@ async def mark(interaction: discord.Interaction, event_link: str, channel: disco
     slot_number="Approved slot number",
     color="Embed color name or hex (optional)"
 )
+@staff_only
 async def accepted(
     interaction: discord.Interaction,
     vtc_name: str,
     user: discord.Member,
     slot_number: str,
-    color: str = "green"
+    color: str = None
 ):
-    if not is_staff_member(interaction.user):
-        return await interaction.response.send_message("❌ You are not staff.", ephemeral=True)
-
-    embed_color = parse_color(color) or discord.Color.green()
+    # Wording lives in templates/accepted.toml; the template's color applies unless one is given
+    await responder.send(
+        interaction, "accepted", color=parse_color(color) if color else None,
+        vtc_name=vtc_name, user=user, slot_number=slot_number,
+    )
 
-    embed = discord.Embed(
-        title="🟢 Invitation Accepted",
-        description=(
-            f"Dear **{vtc_name}**, {user.mention} 🙏\n\n"
-            f"🟢 𝙄𝙣𝙫𝙞𝙩𝙖𝙩𝙞𝙤𝙣 𝙝𝙖𝙨 𝙗𝙚𝙚𝙣 𝘼𝙘𝙘𝙚𝙥𝙩𝙚𝙙. ♥️\n\n"
-            f"We sincerely thank you for inviting **NepPath** to participate in your event. "
-            f"We are pleased to confirm our attendance and look forward to being part of this valuable opportunity.\n\n"
-            f"**🛷 Slot Requested: {slot_number} Kindly confirm our slot.**\n\n"
-            f"<:calendar1:1398462389623586847>  **Your Event Marked Down Here: ⤵️ **\n"
-            f"https://discord.com/channels/1395555672946643005/1396109795370471424\n\n"
-            f"Should you require any further information or assistance, please feel free to contact us.\n\n"
-            f"**<a:red_arrow:1396694832121905295> "
-            f"If done: Plz Kindly send a ticket close confirmation. 🔒**\n\n"
-            f"---\n\n"
-            f"Best regards,\n"
-            f"**NepPath**"
+# ---------- /stats ----------
+
+def format_latency_rows(rows: list) -> str:
+    return "\n".join(
+        f"`{name}` ×{count} · p50 {p50 * 1000:.0f} ms · p99 {p99 * 1000:.0f} ms" for name, count, p50, p99 in rows
+    ) or "No data yet."
+
+@bot.tree.command(name="stats", description="Staff only: Show bot latency and health statistics.")
+@staff_only
+async def stats(interaction: discord.Interaction):
+    uptime = int(time.time() - metrics.started_at)
+    embed = discord.Embed(title="📊 Bot Statistics", color=discord.Color.blurple())
+    embed.description = (
+        f"Uptime {uptime // 3600}h {uptime % 3600 // 60}m · gateway latency {bot.latency * 1000:.0f} ms · "
+        f"{shards.describe()}"
+    )
+    embed.add_field(name="Commands", value=format_latency_rows(metrics.summary("command_seconds", "command")), inline=False)
+    embed.add_field(name="Buttons & modals", value=format_latency_rows(metrics.summary("callback_seconds", "callback")), inline=False)
+
+    errors = metrics.total("command_errors_total") + metrics.total("callback_errors_total")
+    embed.add_field(
+        name="HTTP",
+        value=(
+            f"Discord: {metrics.total('http_requests_total', client='discord')} requests, "
+            f"{metrics.total('http_429_total', client='discord')} × 429\n"
+            f"TruckersMP: {metrics.total('http_requests_total', client='truckersmp')} requests, "
+            f"{metrics.total('http_429_total', client='truckersmp')} × 429\n"
+            f"Handler errors: {errors}"
         ),
-        color=embed_color,
-        timestamp=datetime.utcnow()
+        inline=False,
     )
 
-    embed.set_footer(text="NepPath")
-
-    await interaction.channel.send(embed=embed)
-    await interaction.response.send_message("✅ Acceptance embed sent.", ephemeral=True)
+    queue = render_queue.stats()
+    embed.add_field(
+        name="Render queue",
+        value=f"depth {queue['depth']} · sent {queue['sent']} · merged {queue['merged']} · failed {queue['failed']}",
+        inline=False,
+    )
+    caches = truckersmp.cache_stats()
+    embed.add_field(
+        name="TruckersMP cache",
+        value="\n".join(
+            f"`{name}` hits {c['hits']} · stale {c['stale_hits']} · misses {c['misses']} · "
+            f"errors {c['errors']} · hit ratio {c['hit_ratio']:.0%}"
+            for name, c in caches.items()
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="DM outbox",
+        value=f"waiting {outbox.depth()} · " + " · ".join(f"{k} {v}" for k, v in outbox.counters.items()),
+        inline=False,
+    )
+    embed.add_field(
+        name="Bookings",
+        value=f"{len(booking_messages)} open · {len(submissions)} pending request(s)",
+        inline=False,
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 # ---------------- End of Part 3 ----------------
 # ---------------- bot.py — Part 4 ----------------
 
+# ---------- Booking cleanup ----------
+
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    if payload.message_id in booking_messages:
+        await close_booking(payload.message_id)
+
+@bot.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+    for message_id in payload.message_ids & booking_messages.keys():
+        await close_booking(message_id)
+
+# ---------- Startup ----------
+
+@bot.event
+async def setup_hook():
+    await store.open()
+    await guild_configs.load()
+    await templates.start()
+    await load_bookings()
+    render_queue.start()
+    await truckersmp.start()
+    await event_catalogue.start()
+    await reminders.start()
+    await outbox.start()
+    # One persistent instance answers "book_slot_button" on every booking message, old or new
+    bot.add_view(BookSlotView())
+    # Request card buttons are resolved from their custom_id ("request:<action>:<id>")
+    bot.add_dynamic_items(RequestButton)
+    if METRICS_PORT:
+        await metrics.serve(METRICS_HOST, METRICS_PORT)
+    # Commands belong to the application, not a shard: one process syncs them, once per start
+    if shards.owns(None):
+        command_sync.start()
+
 # ---------- Bot Ready ----------
 
+ready_once = False
+
 @bot.event
 async def on_ready():
-    print(f"✅ Logged in as {bot.user} ({bot.user.id})")
-    try:
-        synced = await bot.tree.sync()
-        print(f"✅ Synced {len(synced)} commands globally.")
-    except Exception as e:
-        print("❌ Failed to sync commands:", e)
+    # READY comes again whenever the gateway has to start a new session; only the first one is news
+    global ready_once
+    if ready_once:
+        print(f"🔁 New gateway session, {shards.describe()}")
+        return
+    ready_once = True
+    print(f"✅ Logged in as {bot.user} ({bot.user.id}), {shards.describe()}")
 # ---------- Run Bot ----------
 
+async def main():
+    async with bot:
+        try:
+            await bot.start(BOT_TOKEN)
+        finally:
+            await command_sync.stop()
+            await metrics.stop()
+            await render_queue.stop()
+            await outbox.stop()
+            await reminders.stop()
+            await event_catalogue.stop()
+            await templates.stop()
+            await truckersmp.close()
+            await store.close()
+            tracer.close()
+
 if not BOT_TOKEN:
     print("❌ BOT_TOKEN not set in environment. Please set BOT_TOKEN in your .env file.")
 else:
-    bot.run(BOT_TOKEN)
+    discord.utils.setup_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
 
 # ---------------- End of Part 4 ----------------
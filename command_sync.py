@@ -0,0 +1,119 @@
+# command_sync.py
+import asyncio
+import hashlib
+import json
+import traceback
+
+import discord
+
+# Stored for a scope once its commands were removed, so it is not emptied again on every start
+EMPTY = "empty"
+
+
+class CommandSync:
+    """
+    Pushes the app command tree to Discord only when it changed.
+
+    The payload tree.sync() would send is hashed per scope (global, or each
+    guild in `guild_ids`) and compared with the hash stored in the store's
+    meta table after the last successful sync of that scope, so restarts and
+    reconnects with an unchanged tree make no API call at all. With
+    `guild_ids`, global commands are copied to those guilds and synced there
+    instead of globally: guild commands update at once, global ones can take
+    a while to reach every client. Scopes synced earlier but no longer used
+    (global after switching to guilds, a guild dropped from the list, or the
+    guilds after switching back) are emptied, so no command shows up twice.
+    Runs in the background from start(), so a rate-limited sync never holds
+    up startup.
+    """
+
+    def __init__(self, bot, store, guild_ids: list = None, force: bool = False):
+        self.bot = bot
+        self.store = store
+        self.guild_ids = list(guild_ids or [])
+        self.force = force
+        self._task = None
+
+    # ---------- Lifecycle ----------
+
+    def start(self):
+        if self.guild_ids:
+            for guild_id in self.guild_ids:
+                self.bot.tree.copy_global_to(guild=discord.Object(guild_id))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        try:
+            await self.clear_unused()
+        except Exception:
+            print("❌ Failed to remove commands of unused sync scopes:")
+            traceback.print_exc()
+        for guild in self.scopes():
+            where = f"to guild {guild.id}" if guild else "globally"
+            try:
+                synced = await self.sync(guild)
+                if synced is None:
+                    print(f"✅ Commands {where} unchanged, sync skipped.")
+                else:
+                    print(f"✅ Synced {synced} commands {where}.")
+            except Exception:
+                print(f"❌ Failed to sync commands {where}:")
+                traceback.print_exc()
+
+    # ---------- Sync ----------
+
+    def scopes(self) -> list:
+        """None for global commands, or the guilds commands are synced to."""
+        return [discord.Object(guild_id) for guild_id in self.guild_ids] or [None]
+
+    def _key(self, scope) -> str:
+        # Keyed by application too, so pointing the store at another bot's token still syncs
+        return f"command_tree:{self.bot.application_id}:{scope}"
+
+    async def clear_unused(self):
+        """Upload an empty command list to every scope synced before that is not one of scopes() now."""
+        used = {self._key(guild.id if guild else "global") for guild in self.scopes()}
+        stored = await self.store.list_meta(self._key(""))
+        # Before hashes were stored, commands were always synced globally without recording it
+        stored.setdefault(self._key("global"), None)
+        for key, digest in stored.items():
+            if key in used or digest == EMPTY:
+                continue
+            scope = key.rsplit(":", 1)[1]
+            if scope == "global":
+                await self.bot.http.bulk_upsert_global_commands(self.bot.application_id, payload=[])
+                where = "globally"
+            else:
+                await self.bot.http.bulk_upsert_guild_commands(self.bot.application_id, int(scope), payload=[])
+                where = f"from guild {scope}"
+            await self.store.set_meta(key, EMPTY)
+            print(f"✅ Removed commands {where}, no longer a sync scope.")
+
+    def tree_hash(self, guild: discord.abc.Snowflake = None) -> str:
+        """Hash of what tree.sync(guild=guild) would upload."""
+        tree = self.bot.tree
+        payload = sorted(
+            (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+            key=lambda c: (c.get("type", 1), c["name"]),
+        )
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+    async def sync(self, guild: discord.abc.Snowflake = None):
+        """Sync one scope if its tree changed; returns the number of commands synced, or None if skipped."""
+        key = self._key(guild.id if guild else "global")
+        digest = self.tree_hash(guild)
+        if not self.force and await self.store.get_meta(key) == digest:
+            return None
+        synced = await self.bot.tree.sync(guild=guild)
+        await self.store.set_meta(key, digest)
+        return len(synced)
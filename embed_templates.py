@@ -0,0 +1,197 @@
+# embed_templates.py
+import asyncio
+import os
+import string
+import tomllib
+import traceback
+
+import discord
+
+from guild_config import EMOJI_NAMES
+
+# What a template may ask for, and how each value is turned into text
+VARIABLES = {
+    "vtc_name": "text",
+    "user": "user",  # a member or user, rendered as its mention
+    "slot_number": "text",
+}
+# Filled in from the guild's settings for every template
+CONTEXT_VARIABLES = frozenset({"events_channel_link", *(f"emoji_{name}" for name in EMOJI_NAMES)})
+
+_formatter = string.Formatter()
+
+
+class TemplateError(Exception):
+    """A template file that does not parse or validate, or a render missing a variable."""
+
+
+def _compile(text: str, allowed: frozenset, where: str) -> tuple:
+    """Split `text` into literal strings and placeholder names, checking every placeholder once."""
+    parts = []
+    try:
+        parsed = list(_formatter.parse(text))
+    except ValueError as e:
+        raise TemplateError(f"{where}: {e}") from None
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if spec or conversion:
+            raise TemplateError(f"{where}: {{{field}}} cannot have a format spec or conversion")
+        if field not in allowed:
+            raise TemplateError(f"{where}: unknown placeholder {{{field}}}")
+        parts.append(_Field(field))
+    return tuple(parts)
+
+
+class _Field(str):
+    """A placeholder name inside a compiled text (a str subclass, so literals stay plain str)."""
+
+    __slots__ = ()
+
+
+def _render(parts: tuple, values: dict) -> str:
+    return "".join(values[part] if type(part) is _Field else part for part in parts)
+
+
+class EmbedTemplate:
+    """
+    One response message, parsed and validated from its TOML file.
+
+    Texts are compiled once into literals and placeholders, so rendering is a
+    join over precomputed pieces with no parsing.
+    """
+
+    __slots__ = ("name", "summary", "confirmation", "variables", "color", "timestamp",
+                 "_title", "_description", "_footer")
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        embed = data.get("embed")
+        if not isinstance(embed, dict):
+            raise TemplateError(f"{name}: missing [embed] table")
+        variables = data.get("variables", [])
+        unknown = [v for v in variables if v not in VARIABLES]
+        if unknown:
+            raise TemplateError(f"{name}: unknown variables {', '.join(unknown)} (known: {', '.join(VARIABLES)})")
+        self.variables = tuple(variables)
+        self.summary = str(data.get("summary", name))[:80]
+        self.confirmation = str(data.get("confirmation", "✅ Message sent."))
+
+        allowed = frozenset(self.variables) | CONTEXT_VARIABLES
+        self._title = _compile(str(embed.get("title", "")), allowed, f"{name}: title")
+        self._description = _compile(str(embed.get("description", "")).strip("\n"), allowed, f"{name}: description")
+        self._footer = _compile(str(embed.get("footer", "")), allowed, f"{name}: footer")
+        try:
+            self.color = discord.Color.from_str(embed["color"]) if "color" in embed else None
+        except ValueError:
+            raise TemplateError(f"{name}: color must look like #RRGGBB, got {embed['color']!r}") from None
+        self.timestamp = bool(embed.get("timestamp", False))
+
+    def render(self, config, color: discord.Color = None, **values) -> discord.Embed:
+        """The embed for one guild (`config`), with `values` for the template's variables."""
+        context = {f"emoji_{name}": config.emoji(name) for name in EMOJI_NAMES}
+        context["events_channel_link"] = config.events_channel_link()
+        for variable in self.variables:
+            value = values.get(variable)
+            if value is None:
+                raise TemplateError(f"The {self.name} message needs {variable}.")
+            context[variable] = value.mention if VARIABLES[variable] == "user" else str(value)
+
+        embed = discord.Embed(
+            title=_render(self._title, context) or None,
+            description=_render(self._description, context) or None,
+            color=color or self.color,
+            timestamp=discord.utils.utcnow() if self.timestamp else None,
+        )
+        footer = _render(self._footer, context)
+        if footer:
+            embed.set_footer(text=footer)
+        return embed
+
+
+class TemplateLibrary:
+    """
+    The response templates in `directory`, one `<name>.toml` per template.
+
+    Files are parsed and validated when loaded, and the directory is polled
+    every `reload_interval` seconds; a changed file is reloaded, and one that
+    no longer validates keeps its previous version (the error is printed), so
+    a typo never takes a command down.
+    """
+
+    def __init__(self, directory: str, reload_interval: float = 5.0):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._templates = {}  # {name: EmbedTemplate}
+        self._mtimes = {}  # {path: mtime_ns} of the files last read
+        self._task = None
+
+    # ---------- Lifecycle ----------
+
+    async def start(self):
+        await self.reload()
+        print(f"✅ Loaded {len(self._templates)} message template(s).")
+        if self._task is None and self.reload_interval > 0:
+            self._task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch_loop(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                changed = await self.reload()
+                if changed:
+                    print(f"🔄 Reloaded message templates: {', '.join(changed)}")
+            except Exception:
+                traceback.print_exc()
+
+    # ---------- Loading ----------
+
+    async def reload(self) -> list:
+        """Re-read new or changed files and drop deleted ones; returns the names that changed."""
+        return await asyncio.to_thread(self._reload)
+
+    def _reload(self) -> list:
+        try:
+            paths = {
+                entry.path: entry.stat().st_mtime_ns
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(".toml")
+            }
+        except FileNotFoundError:
+            paths = {}
+        changed = []
+        for path in self._mtimes.keys() - paths.keys():
+            name = os.path.splitext(os.path.basename(path))[0]
+            self._templates.pop(name, None)
+            changed.append(name)
+        for path, mtime in paths.items():
+            if self._mtimes.get(path) == mtime:
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                with open(path, "rb") as f:
+                    self._templates[name] = EmbedTemplate(name, tomllib.load(f))
+                changed.append(name)
+            except (OSError, tomllib.TOMLDecodeError, TemplateError) as e:
+                print(f"❌ Template {path} not loaded: {e}")
+        self._mtimes = paths
+        return sorted(changed)
+
+    # ---------- Lookups ----------
+
+    def get(self, name: str) -> EmbedTemplate:
+        return self._templates.get(name)
+
+    def all(self) -> list:
+        return sorted(self._templates.values(), key=lambda t: t.name)
@@ -0,0 +1,100 @@
+# guild_config.py
+import traceback
+
+# What every guild starts with (NepPath's setup, which used to be hard-coded).
+# Role and channel ids are global snowflakes, so in other guilds they simply match nothing.
+DEFAULT_SETTINGS = {
+    "staff_role_ids": [
+        1395579577555878012,
+        1395579347804487769,
+        1395580379565527110,
+        1395699038715642031,
+        1395578532406624266,
+    ],
+    "staff_log_channel_id": 1446383730242355200,
+    # Linked from /accepted as "Your Event Marked Down Here"
+    "events_channel_id": 1396109795370471424,
+    "emojis": {
+        "truck": "<:truck:1397230402527297577>",
+        "calendar": "<:calendar1:1398462389623586847>",
+        "red_arrow": "<a:red_arrow:1396694832121905295>",
+    },
+}
+
+EMOJI_NAMES = tuple(DEFAULT_SETTINGS["emojis"])
+
+
+class GuildConfig:
+    """One guild's settings; immutable, replaced as a whole on every change."""
+
+    __slots__ = ("guild_id", "staff_role_ids", "staff_log_channel_id", "events_channel_id", "emojis")
+
+    def __init__(self, guild_id: int, settings: dict = None):
+        settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.guild_id = guild_id
+        self.staff_role_ids = frozenset(settings["staff_role_ids"])
+        self.staff_log_channel_id = settings["staff_log_channel_id"]
+        self.events_channel_id = settings["events_channel_id"]
+        self.emojis = {**DEFAULT_SETTINGS["emojis"], **settings["emojis"]}
+
+    def to_settings(self) -> dict:
+        return {
+            "staff_role_ids": sorted(self.staff_role_ids),
+            "staff_log_channel_id": self.staff_log_channel_id,
+            "events_channel_id": self.events_channel_id,
+            "emojis": dict(self.emojis),
+        }
+
+    def replace(self, **changes) -> "GuildConfig":
+        return GuildConfig(self.guild_id, {**self.to_settings(), **changes})
+
+    def emoji(self, name: str) -> str:
+        return self.emojis.get(name, "")
+
+    def events_channel_link(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.events_channel_id}"
+
+
+class GuildConfigs:
+    """
+    Per-guild settings, loaded from the store once and read from memory.
+
+    Guilds without stored settings get DEFAULT_SETTINGS. Changes are written
+    through to the store before the cached entry is swapped, so a failed write
+    leaves the old settings in place.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._configs = {}  # {guild_id: GuildConfig}
+        self._listeners = []
+
+    async def load(self):
+        try:
+            rows = await self.store.load_guild_configs()
+        except Exception:
+            traceback.print_exc()
+            rows = {}
+        self._configs = {guild_id: GuildConfig(guild_id, settings) for guild_id, settings in rows.items()}
+        print(f"✅ Loaded settings of {len(self._configs)} guild(s).")
+
+    def add_listener(self, listener):
+        """Call `listener(guild_id)` after a guild's settings changed."""
+        self._listeners.append(listener)
+
+    def get(self, guild_id: int) -> GuildConfig:
+        config = self._configs.get(guild_id)
+        if config is None:
+            config = self._configs[guild_id] = GuildConfig(guild_id)
+        return config
+
+    async def update(self, guild_id: int, **changes) -> GuildConfig:
+        config = self.get(guild_id).replace(**changes)
+        await self.store.save_guild_config(guild_id, config.to_settings())
+        self._configs[guild_id] = config
+        for listener in self._listeners:
+            try:
+                listener(guild_id)
+            except Exception:
+                traceback.print_exc()
+        return config
@@ -0,0 +1,227 @@
+# metrics.py
+import bisect
+import functools
+import time
+
+import aiohttp
+import discord
+from aiohttp import web
+from discord import app_commands
+
+from tracing import TRACER, route_of
+
+# Latency buckets in seconds (Prometheus "le" bounds; +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within a bucket."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower  # above the last bound: report the bound
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: tuple, extra: str = None) -> str:
+    parts = [f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """
+    In-process counters and latency histograms.
+
+    Slash commands are timed from the command tree's interaction_check to
+    on_app_command_completion / the tree error handler (see InstrumentedTree);
+    view and modal callbacks are wrapped with @timed; outgoing HTTP (Discord
+    REST and TruckersMP) is timed through an aiohttp TraceConfig. Exposed as
+    Prometheus text on an optional local endpoint and summarised by /stats.
+    """
+
+    def __init__(self):
+        self.counters = {}  # {(name, labels): value}
+        self.histograms = {}  # {(name, labels): Histogram}
+        self.gauges = {}  # {name: fn() -> number}, read at scrape time
+        self.started_at = time.time()
+        self._runner = None
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        key = (name, _labels(labels))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _labels(labels))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def gauge(self, name: str, fn):
+        self.gauges[name] = fn
+
+    # ---------- Instrumentation ----------
+
+    def command_started(self, interaction):
+        interaction.extras["metrics_started"] = time.perf_counter()
+        # The command runs in this task, so everything it awaits joins this trace
+        span = interaction.extras["trace_span"] = TRACER.start(
+            f"/{(interaction.data or {}).get('name', '?')}", guild_id=interaction.guild_id
+        )
+        TRACER.activate(span)
+
+    def command_finished(self, interaction, command: str, error: bool = False):
+        TRACER.finish(interaction.extras.get("trace_span"), RuntimeError("command failed") if error else None)
+        started = interaction.extras.get("metrics_started")
+        if started is not None:
+            self.observe("command_seconds", time.perf_counter() - started, command=command)
+        self.inc("commands_total", command=command)
+        if error:
+            self.inc("command_errors_total", command=command)
+
+    def timed(self, name: str):
+        """Decorator for view/modal callbacks: latency histogram plus call and error counters."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with TRACER.trace(name):
+                        return await func(*args, **kwargs)
+                except Exception:
+                    self.inc("callback_errors_total", callback=name)
+                    raise
+                finally:
+                    self.observe("callback_seconds", time.perf_counter() - started, callback=name)
+                    self.inc("callbacks_total", callback=name)
+            return wrapper
+        return decorator
+
+    def trace_config(self, client: str) -> aiohttp.TraceConfig:
+        """aiohttp TraceConfig timing every request of one HTTP client and counting 429s."""
+        config = aiohttp.TraceConfig()
+
+        async def on_start(session, context, params):
+            context.metrics_started = time.perf_counter()
+
+        async def on_end(session, context, params):
+            route = route_of(params.url)
+            status = params.response.status
+            self.observe("http_request_seconds", time.perf_counter() - context.metrics_started,
+                         client=client, method=params.method, route=route)
+            self.inc("http_requests_total", client=client, status=status)
+            if status == 429:
+                self.inc("http_429_total", client=client, route=route)
+
+        async def on_exception(session, context, params):
+            self.inc("http_exceptions_total", client=client, error=type(params.exception).__name__)
+
+        config.on_request_start.append(on_start)
+        config.on_request_end.append(on_end)
+        config.on_request_exception.append(on_exception)
+        return config
+
+    # ---------- Export ----------
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for name in sorted({n for n, _ in self.counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (n, labels), value in sorted(self.counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        for name, fn in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {fn()}")
+        for name in sorted({n for n, _ in self.histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (n, labels), h in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    le = 'le="%s"' % bound
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{name}_bucket{_format_labels(labels, le)} {h.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, name: str, label: str, limit: int = 10) -> list:
+        """[(label value, count, p50 s, p99 s)] of one histogram family, busiest first."""
+        rows = []
+        for (n, labels), h in self.histograms.items():
+            if n == name:
+                value = dict(labels).get(label, "?")
+                rows.append((value, h.count, h.quantile(0.5), h.quantile(0.99)))
+        rows.sort(key=lambda r: -r[1])
+        return rows[:limit]
+
+    def total(self, name: str, **match) -> int:
+        """Sum of a counter family over every label set containing `match`."""
+        return sum(
+            value for (n, labels), value in self.counters.items()
+            if n == name and all(dict(labels).get(k) == v for k, v in match.items())
+        )
+
+    async def serve(self, host: str, port: int):
+        """Serve GET /metrics on host:port until stop()."""
+        async def handle(request):
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        print(f"✅ Metrics on http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Command tree that stamps each interaction so its command can be timed (pass as tree_cls)."""
+
+    async def interaction_check(self, interaction) -> bool:
+        if interaction.type == discord.InteractionType.application_command:
+            REGISTRY.command_started(interaction)
+        return True
+
+
+# Process-wide registry; decorators need it at class-definition time
+REGISTRY = Metrics()
+timed = REGISTRY.timed
@@ -1,101 +1,123 @@
 # neppath_events.py
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
+from truckersmp.catalogue import EventCatalogue
+from truckersmp.query import EventQuery, MAX_RANGE_DAYS
+from pagination import send_embed_pages
 
-def setup_neppath_events(bot: commands.Bot):
+def build_event_embed(evt) -> discord.Embed:
+    name = evt.name or "Unnamed Event"
+    vtc_name = evt.creator.name if evt.creator and evt.creator.name else "Unknown VTC"
+    creator_avatar = evt.creator.avatar if evt.creator else None
+
+    # Format time
+    time_text = "Unknown time"
+    if evt.meetup_at:
+        utc_str = evt.meetup_at.strftime("%Y-%m-%d %H:%M UTC")
+        npt_str = (evt.meetup_at + timedelta(hours=5, minutes=45)).strftime("%Y-%m-%d %H:%M NPT")
+        time_text = f"{utc_str} | {npt_str}"
+
+    embed = discord.Embed(
+        title=f"{name} | {vtc_name}",
+        description=f"**Start:** {time_text}\n[Event Link]({evt.link})",
+        color=discord.Color.blue()
+    )
+
+    if evt.banner:
+        embed.set_image(url=evt.banner)
+    if creator_avatar:
+        embed.set_thumbnail(url=creator_avatar)
+
+    embed.set_footer(text=f"VTC: {vtc_name}")
+    return embed
+
+def setup_neppath_events(bot: commands.Bot, catalogue: EventCatalogue):
     """
-    Setup /events command for NepPath VTC.
+    Setup /events command (NepPath by default, or any set of VTCs over a date range).
+    Answers from the background-refreshed EventCatalogue instead of downloading the feed per call.
     """
 
     @bot.tree.command(
         name="events",
-        description="Show NepPath VTC events on a specific date"
+        description="Show VTC events (NepPath by default) on a date or date range"
     )
     @app_commands.describe(
-        date="Date in dd/mm/yy format, e.g. 25/12/25"
+        date="Date in dd/mm/yy format, e.g. 25/12/25",
+        end_date=f"Optional last date of a range (dd/mm/yy), up to {MAX_RANGE_DAYS} days",
+        vtcs="Comma-separated VTC names or IDs (default: NepPath)",
+        game="Only events for this game",
+        server="Only events on servers whose name contains this text",
+        min_attending="Only events with at least this many confirmed attendees",
+        timezone="Timezone the dates refer to (default: UTC)"
+    )
+    @app_commands.choices(
+        game=[
+            app_commands.Choice(name="Euro Truck Simulator 2", value="ETS2"),
+            app_commands.Choice(name="American Truck Simulator", value="ATS"),
+        ],
+        timezone=[
+            app_commands.Choice(name="UTC", value="utc"),
+            app_commands.Choice(name="NPT", value="npt"),
+        ]
     )
-    async def events(interaction: discord.Interaction, date: str):
+    async def events(
+        interaction: discord.Interaction,
+        date: str,
+        end_date: str = None,
+        vtcs: str = "NepPath",
+        game: app_commands.Choice[str] = None,
+        server: str = None,
+        min_attending: app_commands.Range[int, 0] = 0,
+        timezone: app_commands.Choice[str] = None
+    ):
         try:
-            vtc_name = "NepPath"
-
-            # Parse date dd/mm/yy
+            # Parse dates dd/mm/yy
             try:
-                query_date = datetime.strptime(date, "%d/%m/%y").date()
+                start = datetime.strptime(date, "%d/%m/%y").date()
+                end = datetime.strptime(end_date, "%d/%m/%y").date() if end_date else start
             except Exception:
                 await interaction.response.send_message("❌ Invalid date format. Use dd/mm/yy.", ephemeral=True)
                 return
+            if end < start or (end - start).days >= MAX_RANGE_DAYS:
+                await interaction.response.send_message(
+                    f"❌ The end date must be on or after the start date and at most {MAX_RANGE_DAYS} days later.",
+                    ephemeral=True,
+                )
+                return
 
-            await interaction.response.defer(thinking=True)
+            names, ids = EventQuery.parse_vtcs(vtcs)
+            query = EventQuery(
+                start=start,
+                end=end,
+                vtcs=names,
+                vtc_ids=ids,
+                zone=timezone.value if timezone else "utc",
+                game=game.value if game else None,
+                server=server,
+                min_attending=min_attending,
+            )
 
-            # Fetch all events
-            api_url = "https://api.truckersmp.com/v2/events"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send(f"❌ TruckersMP API returned HTTP {resp.status}.")
-                        return
-                    data = await resp.json()
+            await interaction.response.defer(thinking=True)
 
-            events = data.get("response", [])
+            # Only waits on a cold start with no snapshot on disk
+            try:
+                await catalogue.wait_ready(timeout=15)
+            except asyncio.TimeoutError:
+                await interaction.followup.send("❌ The TruckersMP event list is still loading, please try again shortly.")
+                return
 
-            # Filter by NepPath and date
-            matched_events = []
-            for evt in events:
-                creator = evt.get("creator") or {}
-                creator_name = creator.get("name") if isinstance(creator, dict) else None
-                if creator_name and creator_name.lower() == vtc_name.lower():
-                    start_str = evt.get("meetupDateTime")
-                    if start_str:
-                        try:
-                            dt = datetime.fromisoformat(start_str.rstrip("Z")).replace(tzinfo=timezone.utc)
-                            if dt.date() == query_date:
-                                matched_events.append(evt)
-                        except:
-                            continue
+            matched_events = catalogue.query(query)
+            when = date if end == start else f"{date} - {end_date}"
 
             if not matched_events:
-                await interaction.followup.send(f"❌ No events found for {vtc_name} on {date}.")
+                await interaction.followup.send(f"❌ No events found for {vtcs} on {when}.")
                 return
 
-            # Send embed for each event
-            for evt in matched_events:
-                name = evt.get("name") or "Unnamed Event"
-                event_link = f"https://truckersmp.com/events/{evt.get('id')}"
-                start_str = evt.get("meetupDateTime")
-                event_banner = evt.get("banner")
-                creator_avatar = None
-                creator = evt.get("creator") or {}
-                if isinstance(creator, dict):
-                    creator_avatar = creator.get("avatar") or creator.get("logo")
-
-                # Format time
-                time_text = "Unknown time"
-                if start_str:
-                    try:
-                        dt = datetime.fromisoformat(start_str.rstrip("Z")).replace(tzinfo=timezone.utc)
-                        utc_str = dt.strftime("%Y-%m-%d %H:%M UTC")
-                        npt_str = (dt + timedelta(hours=5, minutes=45)).strftime("%Y-%m-%d %H:%M NPT")
-                        time_text = f"{utc_str} | {npt_str}"
-                    except:
-                        pass
-
-                embed = discord.Embed(
-                    title=f"{name} | {vtc_name}",
-                    description=f"**Start:** {time_text}\n[Event Link]({event_link})",
-                    color=discord.Color.blue()
-                )
-
-                if event_banner:
-                    embed.set_image(url=event_banner)
-                if creator_avatar:
-                    embed.set_thumbnail(url=creator_avatar)
-
-                embed.set_footer(text=f"VTC: {vtc_name}")
-
-                await interaction.followup.send(embed=embed)
+            # One followup with up to 10 embeds, or a paged view that renders pages on demand
+            await send_embed_pages(interaction, matched_events, build_event_embed)
 
         except Exception as e:
             print(f"[ERROR] /events: {e}")
@@ -0,0 +1,186 @@
+# outbox.py
+import asyncio
+import random
+import time
+import traceback
+from collections import OrderedDict
+
+import discord
+
+from scheduler import TimerHeap
+from sharding import IdSequence
+
+# Delivery states, as stored
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class Outbox:
+    """
+    Background, retrying delivery of DMs to users (approval / denial notices).
+
+    send() only records the message in the store and queues it, so callers
+    answer their interaction first and never wait on Discord. One worker sends
+    queued DMs one at a time, at most one per `min_interval` seconds. DM
+    channels come from the member/user cache when the user is in it and are
+    otherwise opened by user id (the bot does not cache members by default),
+    and the channel id is remembered so repeat notices skip both. Failures that
+    may pass (5xx, timeouts, rate limits) are retried with exponential backoff
+    on a TimerHeap; closed DMs and unknown users are final. Every message keeps
+    its status, attempt count and last error in the store. When shard processes
+    share the store, each delivers only the messages of guilds it `owns`.
+    """
+
+    def __init__(self, bot, store, min_interval: float = 0.5, max_attempts: int = 6,
+                 base_delay: float = 5.0, max_delay: float = 900.0, keep_days: int = 7,
+                 ids: IdSequence = None, owns=None):
+        self.bot = bot
+        self.store = store
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.keep_days = keep_days
+        self.timers = TimerHeap(self._due)
+        self._messages = {}  # {notification id: row} for undelivered messages
+        self._ready = asyncio.Queue()
+        self._worker = None
+        self._ids = ids or IdSequence()
+        self._owns = owns or (lambda guild_id: True)
+        self._dm_channels = OrderedDict()  # {user_id: DM channel id}, most recent last
+        self._max_dm_channels = 10_000
+        self.counters = {"queued": 0, "sent": 0, "retried": 0, "failed": 0}
+
+    async def start(self):
+        await self.store.prune_notifications(time.time() - self.keep_days * 86400)
+        pending = [row for row in await self.store.load_notifications() if self._owns(row["guild_id"])]
+        for row in pending:
+            self._messages[row["id"]] = row
+        self.timers.load((row["id"], row["next_attempt_at"]) for row in pending)
+        self.timers.start()
+        self._worker = asyncio.create_task(self._run())
+        print(f"✅ Loaded {len(pending)} undelivered DM(s).")
+
+    async def stop(self):
+        await self.timers.stop()
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def depth(self) -> int:
+        return len(self._messages)
+
+    # ---------- Queueing ----------
+
+    async def send(self, user_id: int, content: str, guild_id: int = None):
+        await self.send_many([(user_id, content, guild_id)])
+
+    async def send_many(self, messages: list):
+        """Queue [(user_id, content, guild_id)]; resolves once they are stored, not delivered."""
+        if not messages:
+            return
+        now = time.time()
+        rows = []
+        for user_id, content, guild_id in messages:
+            rows.append({
+                "id": next(self._ids),
+                "user_id": user_id,
+                "guild_id": guild_id,
+                "content": content,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            })
+        await self.store.save_notifications(rows)
+        for row in rows:
+            self._messages[row["id"]] = row
+            self.timers.schedule(row["id"], now)
+        self.counters["queued"] += len(rows)
+
+    async def _due(self, notification_id: int):
+        # TimerHeap fires concurrently; the worker below keeps sends serial and paced
+        await self._ready.put(notification_id)
+
+    # ---------- Delivery ----------
+
+    async def _run(self):
+        while True:
+            notification_id = await self._ready.get()
+            row = self._messages.get(notification_id)
+            if row is None:
+                continue
+            started = time.monotonic()
+            try:
+                await self._deliver(row)
+            except Exception:
+                # Recording the outcome failed (e.g. the store): keep the message and try again later
+                traceback.print_exc()
+                if notification_id in self._messages:
+                    self.timers.schedule(notification_id, time.time() + self._backoff(row["attempts"]))
+            await asyncio.sleep(max(0.0, self.min_interval - (time.monotonic() - started)))
+
+    async def _channel(self, user_id: int, guild_id: int = None):
+        """DM channel for a user, from cache when possible; otherwise opened by id over REST."""
+        channel_id = self._dm_channels.get(user_id)
+        if channel_id:
+            self._dm_channels.move_to_end(user_id)
+            return self.bot.get_partial_messageable(channel_id, type=discord.ChannelType.private)
+
+        guild = self.bot.get_guild(guild_id) if guild_id else None
+        user = (guild.get_member(user_id) if guild else None) or self.bot.get_user(user_id)
+        # Opening a DM only needs the id, so an uncached user costs one REST call, not two
+        channel = (user.dm_channel if user else None) or await self.bot.create_dm(user or discord.Object(user_id))
+        self._dm_channels[user_id] = channel.id
+        if len(self._dm_channels) > self._max_dm_channels:
+            self._dm_channels.popitem(last=False)
+        return channel
+
+    async def _deliver(self, row: dict):
+        row["attempts"] += 1
+        try:
+            channel = await self._channel(row["user_id"], row["guild_id"])
+            await channel.send(row["content"])
+        except (discord.Forbidden, discord.NotFound) as e:
+            # DMs closed or the user is gone: retrying will not help
+            return await self._finish(row, FAILED, e)
+        except discord.HTTPException as e:
+            if e.status < 500 and e.status != 429:
+                return await self._finish(row, FAILED, e)
+            return await self._retry(row, e)
+        except Exception as e:
+            # Timeouts, connection errors and anything unexpected: treated as passing failures
+            if not isinstance(e, (asyncio.TimeoutError, OSError)):
+                traceback.print_exc()
+            return await self._retry(row, e)
+        await self._finish(row, SENT)
+
+    def _backoff(self, attempts: int) -> float:
+        # Exponential with jitter so a Discord outage doesn't end in a retry stampede
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _retry(self, row: dict, error: Exception):
+        if row["attempts"] >= self.max_attempts:
+            return await self._finish(row, FAILED, error)
+        row["next_attempt_at"] = time.time() + self._backoff(row["attempts"])
+        await self.store.update_notification(
+            row["id"], PENDING, row["attempts"], row["next_attempt_at"], repr(error)
+        )
+        self.timers.schedule(row["id"], row["next_attempt_at"])
+        self.counters["retried"] += 1
+
+    async def _finish(self, row: dict, status: str, error: Exception = None):
+        self._messages.pop(row["id"], None)
+        self.counters[status] += 1
+        if error is not None:
+            # A cached DM channel that stopped working is looked up afresh next time
+            self._dm_channels.pop(row["user_id"], None)
+            print(f"⚠️ DM to {row['user_id']} failed after {row['attempts']} attempt(s): {error}")
+        await self.store.update_notification(
+            row["id"], status, row["attempts"], None, repr(error) if error is not None else None
+        )
@@ -0,0 +1,91 @@
+# pagination.py
+import discord
+
+from metrics import timed
+
+EMBEDS_PER_MESSAGE = 10  # Discord's limit per message
+
+
+class EmbedPager(discord.ui.View):
+    """
+    Previous/next buttons over a list of items shown as embeds, page_size per page.
+    A page's embeds are rendered the first time it is shown, not up front.
+    """
+
+    def __init__(self, items: list, render, page_size: int = EMBEDS_PER_MESSAGE, owner_id: int = None, timeout: float = 600):
+        super().__init__(timeout=timeout)
+        self.items = items
+        self.render = render
+        self.page_size = page_size
+        self.owner_id = owner_id
+        self.page = 0
+        self.pages = max(1, -(-len(items) // page_size))
+        self.message = None
+        self._rendered = {}  # {page: [Embed]}
+        self._sync_buttons()
+
+    def page_embeds(self, page: int) -> list:
+        embeds = self._rendered.get(page)
+        if embeds is None:
+            start = page * self.page_size
+            embeds = self._rendered[page] = [self.render(item) for item in self.items[start:start + self.page_size]]
+        return embeds
+
+    def _sync_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= self.pages - 1
+        self.counter.label = f"{self.page + 1}/{self.pages}"
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ Only the person who ran the command can change pages.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(page, self.pages - 1))
+        self._sync_buttons()
+        await interaction.response.edit_message(embeds=self.page_embeds(self.page), view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.gray)
+    @timed("pager.previous")
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.gray, disabled=True)
+    async def counter(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.gray)
+    @timed("pager.next")
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
+
+
+async def send_embed_pages(interaction: discord.Interaction, items: list, render, ephemeral: bool = False):
+    """
+    Send `items` as followup embeds with as few webhook calls as possible:
+    one message with up to 10 embeds, or a paged view when there are more.
+    """
+    if len(items) <= EMBEDS_PER_MESSAGE:
+        return await interaction.followup.send(embeds=[render(item) for item in items], ephemeral=ephemeral)
+
+    view = EmbedPager(items, render, owner_id=interaction.user.id)
+    view.message = await interaction.followup.send(
+        content=f"Found {len(items)} results.",
+        embeds=view.page_embeds(0),
+        view=view,
+        ephemeral=ephemeral,
+        wait=True,
+    )
+    return view.message
@@ -0,0 +1,95 @@
+# permissions.py
+import discord
+from discord import app_commands
+
+
+class NotStaff(app_commands.CheckFailure):
+    """Raised by StaffPermissions.staff_only when a non-staff member runs a staff command."""
+
+    def __init__(self):
+        super().__init__("❌ You are not staff.")
+
+
+class StaffPermissions:
+    """
+    Who counts as staff, answered from memory.
+
+    A member is staff when they hold any of their guild's staff roles
+    (GuildConfig.staff_role_ids, a frozenset). With `cache`, the answer is
+    cached per (guild, member) and dropped when the member's roles change,
+    when they leave, when a role is deleted or when the guild's settings
+    change, so a repeat check is a single dict lookup. Only turn it on when
+    the members intent is enabled: without it no member events arrive, so a
+    cached answer would outlive a role change. Uncached, the roles of the
+    member sent with the interaction are checked, a bisect per staff role.
+
+    Commands use the `staff_only` check; views and buttons call is_staff()
+    from their interaction_check.
+    """
+
+    def __init__(self, guild_configs, cache: bool = True, max_members_per_guild: int = 50000):
+        self.guild_configs = guild_configs
+        self.cache = cache
+        self.max_members_per_guild = max_members_per_guild
+        self._staff = {}  # {guild_id: {user_id: bool}}
+        # Decorator for app commands: @permissions.staff_only
+        self.staff_only = app_commands.check(self._check)
+        guild_configs.add_listener(self.invalidate)
+
+    def is_staff(self, member) -> bool:
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return False  # DMs and users that are not guild members
+        if not self.cache:
+            return self._has_staff_role(member, guild.id)
+        cached = self._staff.get(guild.id)
+        if cached is None:
+            cached = self._staff[guild.id] = {}
+        staff = cached.get(member.id)
+        if staff is None:
+            staff = self._has_staff_role(member, guild.id)
+            if len(cached) >= self.max_members_per_guild:
+                cached.clear()
+            cached[member.id] = staff
+        return staff
+
+    def _has_staff_role(self, member, guild_id: int) -> bool:
+        staff_roles = self.guild_configs.get(guild_id).staff_role_ids
+        # Member.get_role is a bisect over the member's sorted role ids; no Role objects are built
+        return any(member.get_role(role_id) is not None for role_id in staff_roles)
+
+    def invalidate(self, guild_id: int, user_id: int = None):
+        """Forget cached answers for one member, or for a whole guild when `user_id` is None."""
+        if user_id is None:
+            self._staff.pop(guild_id, None)
+        else:
+            self._staff.get(guild_id, {}).pop(user_id, None)
+
+    async def _check(self, interaction: discord.Interaction) -> bool:
+        if not self.is_staff(interaction.user):
+            raise NotStaff()
+        return True
+
+    # ---------- Gateway events ----------
+
+    def listen(self, bot):
+        """Keep the cache in step with role and membership changes seen on the gateway."""
+        if not self.cache:
+            return
+        bot.add_listener(self._on_member_update, "on_member_update")
+        bot.add_listener(self._on_raw_member_remove, "on_raw_member_remove")
+        bot.add_listener(self._on_guild_role_delete, "on_guild_role_delete")
+        bot.add_listener(self._on_guild_remove, "on_guild_remove")
+
+    async def _on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            self.invalidate(after.guild.id, after.id)
+
+    async def _on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        self.invalidate(payload.guild_id, payload.user.id)
+
+    async def _on_guild_role_delete(self, role: discord.Role):
+        self.invalidate(role.guild.id)
+
+    async def _on_guild_remove(self, guild: discord.Guild):
+        self.invalidate(guild.id)
@@ -0,0 +1,152 @@
+# reminders.py
+import time
+import traceback
+
+import discord
+
+from scheduler import TimerHeap
+
+
+class ReminderService:
+    """
+    Role pings / attendance reminders for events posted with /mark.
+
+    Each marked event gets one reminder per offset (minutes before meetup) in
+    each channel it was marked in. Reminders are stored in the slot store so
+    they survive restarts, and all of them share a single TimerHeap. When the
+    event catalogue sees a new meetup time, or the pre-send check against the
+    API does, the event's reminders are moved instead of firing at the old time.
+    Only reminders of guilds this process `owns` are loaded (see ShardPlan).
+    """
+
+    def __init__(self, bot, store, truckersmp, catalogue, offsets: list, owns=None):
+        self.bot = bot
+        self.store = store
+        self.truckersmp = truckersmp
+        self.catalogue = catalogue
+        self.offsets = sorted(set(offsets), reverse=True)
+        self.owns = owns or (lambda guild_id: True)
+        self.timers = TimerHeap(self._fire)
+        self._reminders = {}  # {(event_id, channel_id, offset_minutes): row}
+        self._by_event = {}  # {event_id: set(keys)}
+
+    async def start(self):
+        rows = [row for row in await self.store.load_reminders() if self.owns(row["guild_id"])]
+        for row in rows:
+            self._remember(row)
+        self.timers.load((key, self._due(row)) for key, row in self._reminders.items())
+        self.timers.start()
+        self.catalogue.add_listener(self._on_catalogue_refresh)
+        print(f"✅ Loaded {len(rows)} pending event reminders.")
+
+    async def stop(self):
+        await self.timers.stop()
+
+    @staticmethod
+    def _due(row: dict) -> float:
+        return row["meetup_at"] - row["offset_minutes"] * 60
+
+    def _remember(self, row: dict):
+        key = (row["event_id"], row["channel_id"], row["offset_minutes"])
+        row.setdefault("sent", False)
+        self._reminders[key] = row
+        self._by_event.setdefault(row["event_id"], set()).add(key)
+        return key
+
+    def _prune(self, event_id: int):
+        """Drop an event from memory once none of its reminders can fire any more."""
+        keys = self._by_event.get(event_id, set())
+        if all(self._reminders[key]["sent"] for key in keys):
+            for key in keys:
+                del self._reminders[key]
+            self._by_event.pop(event_id, None)
+
+    # ---------- Scheduling ----------
+
+    async def track(self, event, guild_id: int, channel_id: int, role_id: int = None, link: str = None):
+        """Schedule reminders for a freshly marked event; returns how many are still ahead."""
+        if not event.meetup_at:
+            return 0
+        meetup_at = event.meetup_at.timestamp()
+        now = time.time()
+        scheduled = 0
+        for offset in self.offsets:
+            row = {
+                "event_id": int(event.id),
+                "channel_id": channel_id,
+                "offset_minutes": offset,
+                "guild_id": guild_id,
+                "role_id": role_id,
+                "event_name": event.name,
+                "event_link": link or event.link,
+                "meetup_at": meetup_at,
+            }
+            if self._due(row) <= now:
+                continue
+            await self.store.save_reminder(**row)
+            self.timers.schedule(self._remember(row), self._due(row))
+            scheduled += 1
+        return scheduled
+
+    async def update_event_time(self, event_id: int, meetup_at: float):
+        """Move every reminder of `event_id` to a new meetup time."""
+        keys = self._by_event.get(event_id)
+        if not keys:
+            return
+        now = time.time()
+        await self.store.reschedule_reminders(event_id, meetup_at, now)
+        for key in keys:
+            row = self._reminders[key]
+            row["meetup_at"] = meetup_at
+            if self._due(row) > now:
+                row["sent"] = False
+                self.timers.schedule(key, self._due(row))
+            else:
+                # Too late for this offset at the new time
+                row["sent"] = True
+                self.timers.cancel(key)
+        self._prune(event_id)
+        print(f"ℹ️ Event {event_id} moved; reminders rescheduled.")
+
+    async def _on_catalogue_refresh(self, catalogue):
+        for event_id in list(self._by_event):
+            evt = catalogue.get(event_id)
+            if not evt or not evt.meetup_at:
+                continue
+            meetup_at = evt.meetup_at.timestamp()
+            key = next(iter(self._by_event[event_id]))
+            if meetup_at != self._reminders[key]["meetup_at"]:
+                await self.update_event_time(event_id, meetup_at)
+
+    # ---------- Delivery ----------
+
+    async def _fire(self, key):
+        row = self._reminders.get(key)
+        if row is None or row["sent"]:
+            return
+
+        # Last-moment check in case the event moved since the catalogue last refreshed (bypassing the cache,
+        # which may be minutes old)
+        try:
+            event = await self.truckersmp.get_event(row["event_id"], fresh=True)
+            if event and event.meetup_at and event.meetup_at.timestamp() != row["meetup_at"]:
+                await self.update_event_time(row["event_id"], event.meetup_at.timestamp())
+                return
+        except Exception:
+            traceback.print_exc()
+
+        row["sent"] = True
+        meetup_at = int(row["meetup_at"])
+        try:
+            # Skip reminders for events that already started while the bot was down
+            if meetup_at > time.time():
+                role = f"<@&{row['role_id']}> " if row["role_id"] else ""
+                channel = self.bot.get_partial_messageable(row["channel_id"], guild_id=row["guild_id"])
+                await channel.send(
+                    f"{role}⏰ **{row['event_name'] or 'Event'}** starts <t:{meetup_at}:R> (<t:{meetup_at}:t>).\n"
+                    f"🙏 Please mark your attendance: {row['event_link']}",
+                    allowed_mentions=discord.AllowedMentions(roles=True),
+                )
+        finally:
+            await self.store.mark_reminder_sent(*key)
+            self._prune(row["event_id"])
@@ -0,0 +1,102 @@
+# scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+import traceback
+
+
+class TimerHeap:
+    """
+    Run `callback(key)` when each key's due time (unix seconds) arrives.
+
+    All timers share one heap and one background task that sleeps until the
+    earliest due time, so thousands of timers cost O(log n) per insert and one
+    wakeup per due item instead of one sleeping task each. Rescheduling or
+    cancelling a key leaves its old heap entry behind; stale entries are
+    skipped when they surface.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback  # async def callback(key)
+        self._heap = []  # [(due, seq, key)]
+        self._entries = {}  # {key: (due, seq)} for the live entry of each key
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, key, due: float):
+        seq = next(self._seq)
+        self._entries[key] = (due, seq)
+        heapq.heappush(self._heap, (due, seq, key))
+        # Only wake the sleeper if this timer is now the earliest
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def load(self, items):
+        """Bulk-add (key, due) pairs in O(n) (used on startup)."""
+        for key, due in items:
+            seq = next(self._seq)
+            self._entries[key] = (due, seq)
+            self._heap.append((due, seq, key))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def cancel(self, key):
+        self._entries.pop(key, None)
+
+    def due_at(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def _pop_stale(self):
+        while self._heap:
+            due, seq, key = self._heap[0]
+            if self._entries.get(key, (None, None))[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._pop_stale()
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            task = asyncio.create_task(self._fire(key))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key):
+        try:
+            await self.callback(key)
+        except Exception:
+            traceback.print_exc()
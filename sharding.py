@@ -0,0 +1,87 @@
+# sharding.py
+import threading
+import time
+
+# Discord's own epoch-relative layout: 41 bits of milliseconds, 10 of worker, 12 of sequence
+_EPOCH_MS = 1704067200000  # 2024-01-01
+_WORKER_BITS = 10
+_SEQUENCE_BITS = 12
+
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    """The shard Discord routes a guild's events to."""
+    return (guild_id >> 22) % shard_count
+
+
+class ShardPlan:
+    """
+    Which shards (and so which guilds) this process serves.
+
+    With no shard count the bot runs unsharded and owns every guild. With a
+    count it runs as an AutoShardedBot; `shard_ids` limits it to some of the
+    shards so several processes can split one bot and share the slot store,
+    each only loading and acting on bookings, reminders and DMs of its guilds.
+    """
+
+    def __init__(self, shard_count: int = 0, shard_ids: list = None):
+        self.shard_count = shard_count
+        self.shard_ids = sorted(shard_ids) if shard_ids else None
+        self._owned = frozenset(self.shard_ids) if self.shard_ids else None
+
+    @property
+    def sharded(self) -> bool:
+        return self.shard_count > 0
+
+    @property
+    def worker_id(self) -> int:
+        # Processes are given disjoint shard ids, so the lowest one names the process
+        return self.shard_ids[0] % (1 << _WORKER_BITS) if self.shard_ids else 0
+
+    def owns(self, guild_id: int) -> bool:
+        """Whether this process handles `guild_id`; DMs and guild-less rows go to the process with shard 0."""
+        if self._owned is None:
+            return True
+        return shard_of(guild_id or 0, self.shard_count) in self._owned
+
+    def bot_options(self) -> dict:
+        """Keyword arguments for commands.AutoShardedBot (none when unsharded)."""
+        if not self.sharded:
+            return {}
+        return {"shard_count": self.shard_count, "shard_ids": self.shard_ids}
+
+    def describe(self) -> str:
+        if not self.sharded:
+            return "unsharded"
+        ids = ", ".join(map(str, self.shard_ids)) if self.shard_ids else "all"
+        return f"shards {ids} of {self.shard_count}"
+
+
+class IdSequence:
+    """
+    Increasing integer ids that stay unique across processes sharing a store.
+
+    Laid out like a Discord snowflake (time, worker, sequence), so two
+    processes with different worker ids never hand out the same id and ids
+    from before a restart are always lower. Use with next().
+    """
+
+    def __init__(self, worker_id: int = 0):
+        self.worker_id = worker_id % (1 << _WORKER_BITS)
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        with self._lock:
+            now = int(time.time() * 1000) - _EPOCH_MS
+            if now > self._last_ms:
+                self._last_ms, self._sequence = now, 0
+            else:
+                # Same millisecond (or the clock stepped back): keep counting, borrowing from the next ms if full
+                self._sequence += 1
+                if self._sequence >> _SEQUENCE_BITS:
+                    self._last_ms, self._sequence = self._last_ms + 1, 0
+            return (self._last_ms << (_WORKER_BITS + _SEQUENCE_BITS)) | (self.worker_id << _SEQUENCE_BITS) | self._sequence
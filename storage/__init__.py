@@ -0,0 +1,2 @@
+# storage/__init__.py
+# Persistence backends for booking state (see storage/base.py)
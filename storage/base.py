@@ -0,0 +1,108 @@
+# storage/base.py
+
+
+class BaseStore:
+    """
+    Interface every booking persistence backend implements.
+
+    Writes are awaited by the caller and resolve once the change is durable.
+    load() returns a snapshot used to rebuild the in-memory index on startup:
+
+        {
+            "bookings": {message_id: {"channel_id", "guild_id", "title", "color", "image",
+                                      "pages": [message_id, page 1 id, ...],
+                                      "slots": {slot_no: vtc_name or None}}},
+            "requests": [(request_id, guild_id, user_id, message_id, slot_no, vtc_name,
+                          log_channel_id, log_message_id), ...],
+        }
+
+    Only pending requests are loaded; decided ones stay readable through get_request().
+    """
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def load(self) -> dict:
+        raise NotImplementedError
+
+    async def save_booking(self, message_id: int, channel_id: int, guild_id: int, title: str,
+                           color: int, image: str, slot_numbers: list, page_ids: list = None):
+        raise NotImplementedError
+
+    async def delete_booking(self, message_id: int):
+        raise NotImplementedError
+
+    async def set_slot(self, message_id: int, slot_no: int, vtc_name: str = None):
+        raise NotImplementedError
+
+    async def get_request(self, request_id: int):
+        """
+        A request as a dict (id, guild_id, user_id, message_id, slot_no, vtc_name,
+        log_channel_id, log_message_id, status), or None.
+        """
+        raise NotImplementedError
+
+    async def add_request(self, request_id: int, guild_id: int, user_id: int, message_id: int,
+                          slot_no: int, vtc_name: str):
+        raise NotImplementedError
+
+    async def set_request_log(self, request_id: int, log_channel_id: int, log_message_id: int):
+        """Remember the staff-log card posted for a request, and the channel it was posted in."""
+        raise NotImplementedError
+
+    async def set_request_status(self, request_id: int, status: str):
+        raise NotImplementedError
+
+    async def apply_decisions(self, message_id: int, approved: dict, decided: list):
+        """Atomically assign {slot_no: vtc_name} and set [(request_id, status)] of one booking's requests."""
+        raise NotImplementedError
+
+    async def load_notifications(self) -> list:
+        """Undelivered DMs as dicts (id, user_id, guild_id, content, attempts, next_attempt_at, created_at)."""
+        raise NotImplementedError
+
+    async def save_notifications(self, rows: list):
+        raise NotImplementedError
+
+    async def update_notification(self, notification_id: int, status: str, attempts: int,
+                                  next_attempt_at: float = None, last_error: str = None):
+        raise NotImplementedError
+
+    async def prune_notifications(self, before: float):
+        """Forget delivered or failed notifications created before `before` (unix seconds)."""
+        raise NotImplementedError
+
+    async def load_guild_configs(self) -> dict:
+        """{guild_id: settings dict} of every guild whose settings were changed from the defaults."""
+        raise NotImplementedError
+
+    async def save_guild_config(self, guild_id: int, settings: dict):
+        raise NotImplementedError
+
+    async def get_meta(self, key: str):
+        """Value stored under `key` by set_meta, or None."""
+        raise NotImplementedError
+
+    async def list_meta(self, prefix: str) -> dict:
+        """{key: value} of every meta key starting with `prefix`."""
+        raise NotImplementedError
+
+    async def set_meta(self, key: str, value: str):
+        raise NotImplementedError
+
+    async def load_reminders(self) -> list:
+        """Unsent reminders as dicts (event_id, channel_id, offset_minutes, guild_id, role_id, event_name, event_link, meetup_at)."""
+        raise NotImplementedError
+
+    async def save_reminder(self, event_id: int, channel_id: int, offset_minutes: int, guild_id: int,
+                            role_id: int, event_name: str, event_link: str, meetup_at: float):
+        raise NotImplementedError
+
+    async def mark_reminder_sent(self, event_id: int, channel_id: int, offset_minutes: int):
+        raise NotImplementedError
+
+    async def reschedule_reminders(self, event_id: int, meetup_at: float, now: float):
+        raise NotImplementedError
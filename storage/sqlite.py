@@ -0,0 +1,506 @@
+# storage/sqlite.py
+import asyncio
+import json
+import sqlite3
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.base import BaseStore
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version).
+MIGRATIONS = [
+    """
+    CREATE TABLE bookings (
+        message_id INTEGER PRIMARY KEY,
+        channel_id INTEGER NOT NULL,
+        guild_id   INTEGER,
+        title      TEXT NOT NULL,
+        color      INTEGER,
+        image      TEXT
+    );
+    CREATE TABLE slots (
+        message_id INTEGER NOT NULL,
+        slot_no    INTEGER NOT NULL,
+        vtc_name   TEXT,
+        PRIMARY KEY (message_id, slot_no)
+    ) WITHOUT ROWID;
+    CREATE TABLE submissions (
+        guild_id   INTEGER,
+        user_id    INTEGER NOT NULL,
+        message_id INTEGER NOT NULL,
+        slot_no    INTEGER NOT NULL,
+        vtc_name   TEXT,
+        PRIMARY KEY (guild_id, user_id, message_id, slot_no)
+    );
+    """,
+    """
+    CREATE TABLE booking_pages (
+        message_id INTEGER PRIMARY KEY,
+        booking_id INTEGER NOT NULL,
+        page_no    INTEGER NOT NULL
+    );
+    CREATE INDEX booking_pages_booking ON booking_pages (booking_id);
+    """,
+    """
+    CREATE TABLE reminders (
+        event_id       INTEGER NOT NULL,
+        channel_id     INTEGER NOT NULL,
+        offset_minutes INTEGER NOT NULL,
+        guild_id       INTEGER,
+        role_id        INTEGER,
+        event_name     TEXT,
+        event_link     TEXT,
+        meetup_at      REAL NOT NULL,
+        sent           INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (event_id, channel_id, offset_minutes)
+    );
+    """,
+    """
+    ALTER TABLE submissions ADD COLUMN log_message_id INTEGER;
+    """,
+    """
+    CREATE TABLE notifications (
+        id              INTEGER PRIMARY KEY,
+        user_id         INTEGER NOT NULL,
+        guild_id        INTEGER,
+        content         TEXT NOT NULL,
+        status          TEXT NOT NULL DEFAULT 'pending',
+        attempts        INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL,
+        last_error      TEXT,
+        created_at      REAL NOT NULL
+    );
+    CREATE INDEX notifications_status ON notifications (status);
+    """,
+    """
+    CREATE TABLE requests (
+        id             INTEGER PRIMARY KEY,
+        guild_id       INTEGER,
+        user_id        INTEGER NOT NULL,
+        message_id     INTEGER NOT NULL,
+        slot_no        INTEGER NOT NULL,
+        vtc_name       TEXT,
+        log_message_id INTEGER,
+        status         TEXT NOT NULL DEFAULT 'pending',
+        decided_at     REAL
+    );
+    CREATE INDEX requests_booking ON requests (message_id, status);
+    INSERT INTO requests (guild_id, user_id, message_id, slot_no, vtc_name, log_message_id)
+        SELECT guild_id, user_id, message_id, slot_no, vtc_name, log_message_id FROM submissions;
+    DROP TABLE submissions;
+    """,
+    """
+    CREATE TABLE guild_config (
+        guild_id   INTEGER PRIMARY KEY,
+        settings   TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE meta (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """,
+    """
+    ALTER TABLE requests ADD COLUMN log_channel_id INTEGER;
+    """,
+]
+
+
+def _statements(script: str) -> list:
+    """Split a migration script into single statements (executescript would commit our transaction)."""
+    statements, current = [], ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    if current.strip():
+        statements.append(current.strip())
+    return statements
+
+
+class SQLiteStore(BaseStore):
+    """
+    SQLite (WAL mode) booking store.
+
+    All database work runs on a single background thread. Writes queued while a
+    batch is being collected are committed together in one transaction, so a
+    burst of approvals costs one fsync instead of one per click. Several bot
+    processes (one per group of shards) may share the file: transactions take
+    the write lock up front and wait for it instead of failing.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, max_batch: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+        self._conn = None
+        self._pending = []  # [(sql, params, many, future)]
+        self._wakeup = None
+        self._writer_task = None
+        self._closing = False
+
+    # ---------- Lifecycle ----------
+
+    async def open(self):
+        if self._conn is not None:
+            return
+        await self._run(self._connect)
+        self._wakeup = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        if self._conn is None:
+            return
+        # Let the writer drain whatever is still queued before closing
+        self._closing = True
+        self._wakeup.set()
+        await self._writer_task
+        self._writer_task = None
+        await self._run(self._conn.close)
+        self._conn = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # One step per transaction, with the version read under the write lock: shard processes
+        # starting together on a new file wait for each other instead of applying a step twice
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= len(MIGRATIONS):
+                    conn.execute("COMMIT")
+                    break
+                for statement in _statements(MIGRATIONS[version]):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._conn = conn
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # ---------- Batched writer ----------
+
+    def _write(self, sql: str, params=(), many: bool = False):
+        """Queue a statement for the next batch and return a future that resolves once committed.
+
+        With sql=None, params is a list of (sql, params, many) that commit or fail as one unit.
+        """
+        if self._conn is None or self._closing:
+            raise RuntimeError("SQLiteStore is not open.")
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((sql, params, many, fut))
+        if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return fut
+
+    async def _writer(self):
+        while True:
+            await self._wakeup.wait()
+            if not self._closing and len(self._pending) < self.max_batch:
+                await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            await self._flush()
+            if self._closing and not self._pending:
+                return
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            errors = await self._run(self._commit, [(sql, params, many) for sql, params, many, _ in batch])
+        except Exception as e:
+            # Whatever went wrong, the writer keeps running and every caller of this batch hears about it
+            traceback.print_exc()
+            errors = [e] * len(batch)
+        for (_, _, _, fut), error in zip(batch, errors):
+            if fut.done():
+                continue
+            if error is None:
+                fut.set_result(None)
+            else:
+                fut.set_exception(error)
+
+    def _commit(self, statements):
+        """Run statements in one transaction; on failure retry each alone so one bad write can't sink the batch."""
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params, many in statements:
+                self._execute(sql, params, many)
+            conn.execute("COMMIT")
+            return [None] * len(statements)
+        except sqlite3.Error:
+            self._rollback()
+
+        errors = []
+        for sql, params, many in statements:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._execute(sql, params, many)
+                conn.execute("COMMIT")
+                errors.append(None)
+            except sqlite3.Error as e:
+                self._rollback()
+                traceback.print_exc()
+                errors.append(e)
+        return errors
+
+    def _rollback(self):
+        # BEGIN IMMEDIATE that timed out waiting for the lock (another shard process) never opened one
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def _execute(self, sql, params, many):
+        if sql is None:
+            for group_sql, group_params, group_many in params:
+                self._execute(group_sql, group_params, group_many)
+        elif many:
+            self._conn.executemany(sql, params)
+        else:
+            self._conn.execute(sql, params)
+
+    # ---------- Reads ----------
+
+    async def load(self) -> dict:
+        return await self._run(self._load)
+
+    def _load(self) -> dict:
+        conn = self._conn
+        bookings = {}
+        for message_id, channel_id, guild_id, title, color, image in conn.execute(
+            "SELECT message_id, channel_id, guild_id, title, color, image FROM bookings"
+        ):
+            bookings[message_id] = {
+                "channel_id": channel_id,
+                "guild_id": guild_id,
+                "title": title,
+                "color": color,
+                "image": image,
+                "pages": [message_id],
+                "slots": {},
+            }
+
+        for message_id, booking_id, page_no in conn.execute(
+            "SELECT message_id, booking_id, page_no FROM booking_pages ORDER BY booking_id, page_no"
+        ):
+            booking = bookings.get(booking_id)
+            if booking and page_no == len(booking["pages"]):
+                booking["pages"].append(message_id)
+
+        # Primary key order keeps each booking's slots contiguous and sorted
+        current_id, current_slots = None, None
+        for message_id, slot_no, vtc_name in conn.execute(
+            "SELECT message_id, slot_no, vtc_name FROM slots ORDER BY message_id, slot_no"
+        ):
+            if message_id != current_id:
+                booking = bookings.get(message_id)
+                current_id, current_slots = message_id, booking["slots"] if booking else None
+            if current_slots is not None:
+                current_slots[slot_no] = vtc_name
+
+        requests = conn.execute(
+            "SELECT id, guild_id, user_id, message_id, slot_no, vtc_name, log_channel_id, log_message_id "
+            "FROM requests WHERE status = 'pending'"
+        ).fetchall()
+        return {"bookings": bookings, "requests": requests}
+
+    async def get_request(self, request_id: int):
+        return await self._run(self._get_request, request_id)
+
+    def _get_request(self, request_id: int):
+        cursor = self._conn.execute(
+            "SELECT id, guild_id, user_id, message_id, slot_no, vtc_name, log_channel_id, log_message_id, status "
+            "FROM requests WHERE id = ?",
+            (request_id,),
+        )
+        row = cursor.fetchone()
+        return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+    async def load_reminders(self) -> list:
+        return await self._run(self._load_reminders)
+
+    def _load_reminders(self) -> list:
+        cursor = self._conn.execute(
+            "SELECT event_id, channel_id, offset_minutes, guild_id, role_id, event_name, event_link, meetup_at "
+            "FROM reminders WHERE sent = 0"
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    async def load_notifications(self) -> list:
+        return await self._run(self._load_notifications)
+
+    def _load_notifications(self) -> list:
+        cursor = self._conn.execute(
+            "SELECT id, user_id, guild_id, content, attempts, next_attempt_at, created_at "
+            "FROM notifications WHERE status = 'pending' ORDER BY id"
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    async def load_guild_configs(self) -> dict:
+        return await self._run(self._load_guild_configs)
+
+    def _load_guild_configs(self) -> dict:
+        return {
+            guild_id: json.loads(settings)
+            for guild_id, settings in self._conn.execute("SELECT guild_id, settings FROM guild_config")
+        }
+
+    async def get_meta(self, key: str):
+        return await self._run(self._get_meta, key)
+
+    def _get_meta(self, key: str):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    async def list_meta(self, prefix: str) -> dict:
+        return await self._run(self._list_meta, prefix)
+
+    def _list_meta(self, prefix: str) -> dict:
+        # A range on the primary key rather than LIKE, whose wildcards could appear in a prefix
+        return dict(self._conn.execute(
+            "SELECT key, value FROM meta WHERE key >= ? AND key < ? || char(1114111)", (prefix, prefix)
+        ))
+
+    # ---------- Writes ----------
+
+    async def save_booking(self, message_id: int, channel_id: int, guild_id: int, title: str,
+                           color: int, image: str, slot_numbers: list, page_ids: list = None):
+        # page_ids lists the continuation messages of a multi-page booking (page 1 onwards).
+        # One transaction, so a failed save never leaves a booking with its old slots deleted and no new ones
+        await self._write(None, [
+            (
+                "INSERT OR REPLACE INTO bookings (message_id, channel_id, guild_id, title, color, image) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (message_id, channel_id, guild_id, title, color, image),
+                False,
+            ),
+            ("DELETE FROM slots WHERE message_id = ?", (message_id,), False),
+            ("DELETE FROM booking_pages WHERE booking_id = ?", (message_id,), False),
+            (
+                "INSERT INTO booking_pages (message_id, booking_id, page_no) VALUES (?, ?, ?)",
+                [(page_id, message_id, i) for i, page_id in enumerate(page_ids or [], start=1)],
+                True,
+            ),
+            (
+                "INSERT INTO slots (message_id, slot_no) VALUES (?, ?)",
+                [(message_id, n) for n in slot_numbers],
+                True,
+            ),
+        ])
+
+    async def delete_booking(self, message_id: int):
+        # One transaction: the booking goes with its slots, pages and requests, or stays whole
+        await self._write(None, [
+            ("DELETE FROM bookings WHERE message_id = ?", (message_id,), False),
+            ("DELETE FROM slots WHERE message_id = ?", (message_id,), False),
+            ("DELETE FROM booking_pages WHERE booking_id = ?", (message_id,), False),
+            ("DELETE FROM requests WHERE message_id = ?", (message_id,), False),
+        ])
+
+    async def set_slot(self, message_id: int, slot_no: int, vtc_name: str = None):
+        await self._write(
+            "UPDATE slots SET vtc_name = ? WHERE message_id = ? AND slot_no = ?",
+            (vtc_name, message_id, slot_no),
+        )
+
+    async def add_request(self, request_id: int, guild_id: int, user_id: int, message_id: int,
+                          slot_no: int, vtc_name: str):
+        await self._write(
+            "INSERT INTO requests (id, guild_id, user_id, message_id, slot_no, vtc_name) VALUES (?, ?, ?, ?, ?, ?)",
+            (request_id, guild_id, user_id, message_id, slot_no, vtc_name),
+        )
+
+    async def set_request_log(self, request_id: int, log_channel_id: int, log_message_id: int):
+        await self._write(
+            "UPDATE requests SET log_channel_id = ?, log_message_id = ? WHERE id = ?",
+            (log_channel_id, log_message_id, request_id),
+        )
+
+    async def set_request_status(self, request_id: int, status: str):
+        await self._write(
+            "UPDATE requests SET status = ?, decided_at = ? WHERE id = ?", (status, time.time(), request_id)
+        )
+
+    async def apply_decisions(self, message_id: int, approved: dict, decided: list):
+        # One transaction: either every slot is assigned and every request decided, or nothing is
+        now = time.time()
+        await self._write(None, [
+            (
+                "UPDATE slots SET vtc_name = ? WHERE message_id = ? AND slot_no = ?",
+                [(vtc_name, message_id, slot_no) for slot_no, vtc_name in approved.items()],
+                True,
+            ),
+            (
+                "UPDATE requests SET status = ?, decided_at = ? WHERE id = ?",
+                [(status, now, request_id) for request_id, status in decided],
+                True,
+            ),
+        ])
+
+    async def save_notifications(self, rows: list):
+        await self._write(
+            "INSERT INTO notifications (id, user_id, guild_id, content, status, attempts, next_attempt_at, created_at) "
+            "VALUES (?, ?, ?, ?, 'pending', ?, ?, ?)",
+            [(r["id"], r["user_id"], r["guild_id"], r["content"], r["attempts"], r["next_attempt_at"], r["created_at"])
+             for r in rows],
+            many=True,
+        )
+
+    async def update_notification(self, notification_id: int, status: str, attempts: int,
+                                  next_attempt_at: float = None, last_error: str = None):
+        await self._write(
+            "UPDATE notifications SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (status, attempts, next_attempt_at, last_error, notification_id),
+        )
+
+    async def prune_notifications(self, before: float):
+        # Delivered / given-up messages are only kept for a while, for inspection
+        await self._write(
+            "DELETE FROM notifications WHERE status != 'pending' AND created_at < ?", (before,)
+        )
+
+    async def save_guild_config(self, guild_id: int, settings: dict):
+        await self._write(
+            "INSERT OR REPLACE INTO guild_config (guild_id, settings, updated_at) VALUES (?, ?, ?)",
+            (guild_id, json.dumps(settings), time.time()),
+        )
+
+    async def set_meta(self, key: str, value: str):
+        await self._write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    async def save_reminder(self, event_id: int, channel_id: int, offset_minutes: int, guild_id: int,
+                            role_id: int, event_name: str, event_link: str, meetup_at: float):
+        await self._write(
+            "INSERT OR REPLACE INTO reminders (event_id, channel_id, offset_minutes, guild_id, role_id, "
+            "event_name, event_link, meetup_at, sent) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (event_id, channel_id, offset_minutes, guild_id, role_id, event_name, event_link, meetup_at),
+        )
+
+    async def mark_reminder_sent(self, event_id: int, channel_id: int, offset_minutes: int):
+        await self._write(
+            "UPDATE reminders SET sent = 1 WHERE event_id = ? AND channel_id = ? AND offset_minutes = ?",
+            (event_id, channel_id, offset_minutes),
+        )
+
+    async def reschedule_reminders(self, event_id: int, meetup_at: float, now: float):
+        # Reminders whose new due time is still ahead are re-armed (even if sent for the old time), the rest are closed
+        await self._write(
+            "UPDATE reminders SET meetup_at = ?, "
+            "sent = CASE WHEN ? - offset_minutes * 60 > ? THEN 0 ELSE 1 END WHERE event_id = ?",
+            (meetup_at, meetup_at, now, event_id),
+        )
@@ -0,0 +1,207 @@
+# tracing.py
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
+import time
+from contextvars import ContextVar
+
+# Span of the code running right now; None outside a sampled trace
+_current = ContextVar("tracing_span", default=None)
+
+
+_ID = re.compile(r"/\d+")
+_TOKEN = re.compile(r"/[A-Za-z0-9_\-.]{40,}")
+
+
+def route_of(url) -> str:
+    """URL path with ids and interaction/webhook tokens folded, so routes stay low-cardinality."""
+    return _TOKEN.sub("/:token", _ID.sub("/:id", url.path))
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attrs", "start", "_started", "duration_ms", "error")
+
+    def __init__(self, trace_id: str, parent_id: str, name: str, attrs: dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "attrs": self.attrs,
+        }
+
+
+class JsonlExporter:
+    """Appends finished spans to a file, one JSON object per line, written off the event loop."""
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._flush_handle = None
+
+    def export(self, span: Span):
+        self._buffer.append(json.dumps(span.to_dict(), default=str))
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_interval, self._flush_soon, loop)
+
+    def _flush_soon(self, loop):
+        self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        loop.run_in_executor(None, self._write, lines)
+
+    def _write(self, lines: list):
+        if lines:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        self._write(lines)
+
+
+class Tracer:
+    """
+    Minimal span tracing carried in a context variable.
+
+    A trace starts at an interaction (or any trace() block) and is kept with
+    probability `sample_rate`; spans opened while it is current - including
+    every aiohttp request made through attach()ed TraceConfigs and edits run
+    later by the render queue - join the same trace id. Unsampled code pays
+    for one ContextVar lookup per span. Finished spans go to `exporter`.
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def configure(self, exporter=None, sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter else 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    # ---------- Spans ----------
+
+    def start(self, name: str, **attrs):
+        """
+        Open a span under the current one, or a new (sampled) trace if there is none; returns None when not traced.
+
+        The span does not become current: span()/trace() scope it, or activate() it for the rest of the task.
+        """
+        parent = _current.get()
+        if parent is not None:
+            span = Span(parent.trace_id, parent.span_id, name, attrs)
+        elif self.enabled and random.random() < self.sample_rate:
+            span = Span(os.urandom(16).hex(), None, name, attrs)
+        else:
+            return None
+        return span
+
+    def activate(self, span: Span):
+        """Make `span` current for the rest of the running task (and the tasks it creates)."""
+        if span is not None:
+            _current.set(span)
+
+    def finish(self, span: Span, error: BaseException = None):
+        if span is None or span.duration_ms is not None:
+            return
+        span.duration_ms = round((time.perf_counter() - span._started) * 1000, 3)
+        if error is not None:
+            span.error = repr(error)
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs):
+        """Child span of the current trace; does nothing (yields None) outside one."""
+        if _current.get() is None:
+            yield None
+            return
+        with self._scope(self.start(name, **attrs)) as span:
+            yield span
+
+    @contextlib.contextmanager
+    def trace(self, name: str, **attrs):
+        """Like span(), but starts a new sampled trace when none is current."""
+        with self._scope(self.start(name, **attrs)) as span:
+            yield span
+
+    @contextlib.contextmanager
+    def _scope(self, span):
+        if span is None:
+            yield None
+            return
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish(span, e)
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span)
+
+    def current_trace_id(self):
+        span = _current.get()
+        return span.trace_id if span else None
+
+    # ---------- aiohttp ----------
+
+    def attach(self, config, client: str):
+        """Add request spans to an aiohttp.TraceConfig (may be one already used for metrics)."""
+
+        async def on_start(session, context, params):
+            parent = _current.get()
+            context.tracing_span = (
+                Span(parent.trace_id, parent.span_id, f"{client} {params.method}", {"route": route_of(params.url)})
+                if parent is not None else None
+            )
+
+        async def on_end(session, context, params):
+            span = getattr(context, "tracing_span", None)
+            if span is not None:
+                span.set(status=params.response.status)
+                self.finish(span)
+
+        async def on_exception(session, context, params):
+            self.finish(getattr(context, "tracing_span", None), params.exception)
+
+        config.on_request_start.append(on_start)
+        config.on_request_end.append(on_end)
+        config.on_request_exception.append(on_exception)
+        return config
+
+    def close(self):
+        if self.exporter is not None and hasattr(self.exporter, "close"):
+            self.exporter.close()
+
+
+# Process-wide tracer; off until configure() is given an exporter and a sample rate
+TRACER = Tracer()
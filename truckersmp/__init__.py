@@ -0,0 +1,2 @@
+# truckersmp/__init__.py
+# Shared TruckersMP API client (see truckersmp/client.py)
@@ -0,0 +1,115 @@
+# truckersmp/cache.py
+import asyncio
+import time
+import traceback
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Bounded LRU cache of async lookups with a freshness TTL and stale-while-revalidate.
+
+    - fresh (age < ttl): returned straight from memory
+    - stale (ttl <= age < ttl + stale_ttl): returned immediately while one
+      background fetch refreshes it
+    - missing/expired: fetched; concurrent misses for the same key await a
+      single in-flight fetch instead of each calling the API
+
+    Failed fetches are not cached. A None result (nothing found) is kept for
+    only `negative_ttl` and never served stale, so an event that was missing
+    or briefly unreadable shows up again soon. The least recently used entry
+    is evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0, stale_ttl: float = 300.0, negative_ttl: float = 10.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._data = OrderedDict()  # {key: (value, stored_at)}
+        self._inflight = {}  # {key: asyncio.Task}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    async def get(self, key, fetch):
+        """Return the cached value for `key`, calling `await fetch()` when it has to be (re)loaded."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < (self.ttl if value is not None else min(self.ttl, self.negative_ttl)):
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+            if value is not None and age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._data.move_to_end(key)
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start_fetch(key, fetch, background=True)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_fetch(key, fetch)
+        # shield: a caller giving up must not cancel the fetch other callers share
+        return await asyncio.shield(task)
+
+    def put(self, key, value):
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.stale_hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+    def _start_fetch(self, key, fetch, background: bool = False) -> asyncio.Task:
+        task = asyncio.create_task(self._fetch(key, fetch))
+        self._inflight[key] = task
+        if background:
+            # Nobody may await a revalidation; report its failure here and keep serving the stale value
+            task.add_done_callback(self._report_background_error)
+        return task
+
+    async def _fetch(self, key, fetch):
+        try:
+            value = await fetch()
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self.put(key, value)
+        return value
+
+    @staticmethod
+    def _report_background_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            traceback.print_exception(task.exception())
@@ -0,0 +1,171 @@
+# truckersmp/catalogue.py
+import asyncio
+import json
+import os
+import time
+import traceback
+from datetime import timedelta, timezone
+
+from truckersmp.models import Event
+from truckersmp.query import EventQuery, run_query
+
+NPT = timezone(timedelta(hours=5, minutes=45), "NPT")
+
+
+class EventCatalogue:
+    """
+    Local, indexed copy of the public /v2/events listing.
+
+    A background task re-downloads the listing every `refresh_interval`
+    seconds, parses each event once and rebuilds the indexes, so queries are
+    plain dict lookups. Each refresh is written to `snapshot_path`; on startup
+    the snapshot is loaded first so /events can answer before the first
+    refresh completes.
+    """
+
+    def __init__(self, client, snapshot_path: str = None, refresh_interval: float = 300.0):
+        self.client = client
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.events = []
+        self.updated_at = None  # unix time of the data currently indexed
+        self._by_id = {}
+        self._by_creator = {}
+        self._by_creator_id = {}
+        self._local_dates = {}  # {event_id: {"utc": date, "npt": date}}
+        self._by_date = {"utc": {}, "npt": {}}
+        self._by_creator_date = {"utc": {}, "npt": {}}
+        self._ready = asyncio.Event()
+        self._task = None
+        self._listeners = []
+
+    # ---------- Lifecycle ----------
+
+    async def start(self):
+        if self.snapshot_path:
+            await self._load_snapshot()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_ready(self, timeout: float = None):
+        """Wait until some data (snapshot or first refresh) is indexed."""
+        await asyncio.wait_for(self._ready.wait(), timeout)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                traceback.print_exc()
+            await asyncio.sleep(self.refresh_interval)
+
+    def add_listener(self, listener):
+        """Call `await listener(catalogue)` after every successful refresh."""
+        self._listeners.append(listener)
+
+    async def refresh(self):
+        events = await self.client.get_events(fresh=True)
+        self._index(events, time.time())
+        if self.snapshot_path:
+            await asyncio.to_thread(self._write_snapshot, [e.raw for e in events], self.updated_at)
+        for listener in self._listeners:
+            try:
+                await listener(self)
+            except Exception:
+                traceback.print_exc()
+
+    # ---------- Indexing ----------
+
+    def _index(self, events: list, updated_at: float):
+        by_id, by_creator, by_creator_id, local_dates = {}, {}, {}, {}
+        by_date = {"utc": {}, "npt": {}}
+        by_creator_date = {"utc": {}, "npt": {}}
+
+        events = sorted(events, key=lambda e: (e.meetup_at is None, e.meetup_at or 0))
+        for evt in events:
+            by_id[evt.id] = evt
+            creator = evt.creator.name.casefold() if evt.creator and evt.creator.name else None
+            if creator:
+                by_creator.setdefault(creator, []).append(evt)
+            if evt.creator and evt.creator.id is not None:
+                by_creator_id.setdefault(evt.creator.id, []).append(evt)
+            if evt.meetup_at is None:
+                continue
+            days = local_dates[evt.id] = {"utc": evt.meetup_at.date(), "npt": evt.meetup_at.astimezone(NPT).date()}
+            for zone, day in days.items():
+                by_date[zone].setdefault(day, []).append(evt)
+                if creator:
+                    by_creator_date[zone].setdefault((creator, day), []).append(evt)
+
+        # Swap everything in at once so readers never see a half-built index
+        self.events = events
+        self._by_id = by_id
+        self._by_creator = by_creator
+        self._by_creator_id = by_creator_id
+        self._local_dates = local_dates
+        self._by_date = by_date
+        self._by_creator_date = by_creator_date
+        self.updated_at = updated_at
+        self._ready.set()
+
+    # ---------- Queries ----------
+
+    def get(self, event_id) -> Event:
+        return self._by_id.get(event_id)
+
+    def by_creator(self, creator_name: str) -> list:
+        return self._by_creator.get(creator_name.casefold(), [])
+
+    def by_creator_id(self, vtc_id: int) -> list:
+        return self._by_creator_id.get(vtc_id, [])
+
+    def local_date(self, evt: Event, zone: str = "utc"):
+        """Calendar day of the event's meetup in `zone`, computed once at index time."""
+        days = self._local_dates.get(evt.id)
+        return days[zone] if days else None
+
+    def on_date(self, day, zone: str = "utc") -> list:
+        return self._by_date[zone].get(day, [])
+
+    def find(self, creator_name: str, day, zone: str = "utc") -> list:
+        """Events by `creator_name` whose meetup falls on `day` (a date) in `zone` ("utc" or "npt")."""
+        return self._by_creator_date[zone].get((creator_name.casefold(), day), [])
+
+    def query(self, query: EventQuery) -> list:
+        return run_query(self, query)
+
+    # ---------- Snapshots ----------
+
+    async def _load_snapshot(self):
+        try:
+            snapshot = await asyncio.to_thread(self._read_snapshot)
+        except Exception:
+            traceback.print_exc()
+            return
+        if snapshot and not self._ready.is_set():
+            events = [Event.from_api(raw) for raw in snapshot.get("events", [])]
+            self._index(events, snapshot.get("updated_at"))
+            print(f"✅ Loaded {len(events)} events from snapshot.")
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_snapshot(self, raw_events: list, updated_at: float):
+        # Write to a temp file and rename so a crash never leaves a truncated snapshot
+        # (per process: shard processes may share the snapshot path)
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": updated_at, "events": raw_events}, f)
+        os.replace(tmp_path, self.snapshot_path)
@@ -0,0 +1,130 @@
+# truckersmp/client.py
+import os
+
+import aiohttp
+
+from truckersmp.cache import TTLCache
+from truckersmp.models import Event, VTC
+
+API_BASE = os.getenv("TRUCKERSMP_API_URL", "https://api.truckersmp.com/v2")
+
+
+class TruckersMPError(Exception):
+    """Non-200 (or error) response from the TruckersMP API."""
+
+    def __init__(self, status: int, message: str = None):
+        super().__init__(message or f"TruckersMP API returned HTTP {status}.")
+        self.status = status
+
+
+class TruckersMPClient:
+    """
+    One aiohttp session for the bot's lifetime, shared by /mark, /vtc_info and /events.
+
+    Connections to the API host are pooled and kept alive, and DNS answers are
+    cached, so a command reuses a warm TLS connection instead of doing a fresh
+    handshake each time. The session is created lazily on first use (or by
+    start()) because aiohttp needs a running event loop.
+
+    Event and VTC lookups go through per-endpoint TTL caches (see
+    truckersmp/cache.py); pass fresh=True to bypass them.
+    """
+
+    # (fresh seconds, extra stale-while-revalidate seconds, max entries) per endpoint
+    CACHE_POLICY = {
+        "event": (300, 3600, 1024),
+        "events": (60, 600, 1),
+        "vtc": (3600, 86400, 1024),
+    }
+
+    def __init__(self, base_url: str = API_BASE, limit: int = 20, timeout: float = 10.0,
+                 keepalive: float = 60.0, dns_ttl: int = 300, trace_configs: list = None):
+        self.base_url = base_url.rstrip("/")
+        self.trace_configs = trace_configs or []  # aiohttp.TraceConfig hooks (metrics, tracing)
+        self.limit = limit
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self._session = None
+        self.caches = {
+            name: TTLCache(maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl)
+            for name, (ttl, stale_ttl, maxsize) in self.CACHE_POLICY.items()
+        }
+
+    async def start(self):
+        self._get_session()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=min(5.0, self.timeout)),
+                headers={"User-Agent": "NepPath-Slot-Booking-Bot"},
+                trace_configs=self.trace_configs,
+            )
+        return self._session
+
+    async def get_json(self, path: str) -> dict:
+        """GET base_url + path and return the decoded body; raises TruckersMPError on non-200."""
+        async with self._get_session().get(f"{self.base_url}{path}") as resp:
+            if resp.status != 200:
+                raise TruckersMPError(resp.status)
+            return await resp.json(content_type=None)
+
+    def cache_stats(self) -> dict:
+        return {name: cache.stats() for name, cache in self.caches.items()}
+
+    async def _cached(self, endpoint: str, key, fetch, fresh: bool):
+        cache = self.caches[endpoint]
+        if fresh:
+            cache.invalidate(key)
+        return await cache.get(key, fetch)
+
+    # ---------- Endpoints ----------
+
+    async def get_event(self, event_id, fresh: bool = False) -> Event:
+        """Return the event, or None if the API has no data for it."""
+        return await self._cached("event", str(event_id), lambda: self._fetch_event(event_id), fresh)
+
+    async def _fetch_event(self, event_id) -> Event:
+        data = await self.get_json(f"/events/{event_id}")
+        info = data.get("response")
+        return Event.from_api(info) if isinstance(info, dict) and info else None
+
+    async def get_events(self, fresh: bool = False) -> list:
+        """Return every event in the public listing, de-duplicated by id."""
+        return await self._cached("events", "all", self._fetch_events, fresh)
+
+    async def _fetch_events(self) -> list:
+        data = await self.get_json("/events")
+        response = data.get("response") or []
+        # The listing is either a flat list or grouped ({"featured": [...], "today": [...], ...})
+        groups = response.values() if isinstance(response, dict) else [response]
+        events = {}
+        for group in groups:
+            if not isinstance(group, list):
+                continue
+            for item in group:
+                if isinstance(item, dict) and item.get("id") not in events:
+                    events[item.get("id")] = Event.from_api(item)
+        return list(events.values())
+
+    async def get_vtc(self, vtc_id, fresh: bool = False) -> VTC:
+        """Return the VTC, or None if it does not exist."""
+        return await self._cached("vtc", str(vtc_id), lambda: self._fetch_vtc(vtc_id), fresh)
+
+    async def _fetch_vtc(self, vtc_id) -> VTC:
+        data = await self.get_json(f"/vtc/{vtc_id}")
+        info = data.get("response")
+        return VTC.from_api(info) if isinstance(info, dict) and info else None
@@ -0,0 +1,90 @@
+# truckersmp/models.py
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+def parse_api_datetime(value):
+    """Parse TruckersMP timestamps ("2025-12-25 18:00:00" or ISO with Z) as aware UTC datetimes."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).rstrip("Z")).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+@dataclass
+class EventCreator:
+    id: int = None
+    name: str = None
+    avatar: str = None
+
+    @classmethod
+    def from_api(cls, data):
+        if not isinstance(data, dict):
+            return None
+        return cls(
+            id=data.get("id"),
+            name=data.get("name") or data.get("username"),
+            avatar=data.get("avatar") or data.get("logo"),
+        )
+
+
+@dataclass
+class Event:
+    id: int
+    name: str
+    meetup_at: datetime = None
+    banner: str = None
+    creator: EventCreator = None
+    game: str = None
+    server: str = None
+    attending: int = 0
+    raw: dict = field(default=None, repr=False)
+
+    @property
+    def link(self) -> str:
+        return f"https://truckersmp.com/events/{self.id}"
+
+    @classmethod
+    def from_api(cls, data: dict):
+        # Older payloads use meetupDateTime/creator, current v2 uses meetup_at/vtc
+        creator = EventCreator.from_api(data.get("creator")) or EventCreator.from_api(data.get("vtc"))
+        server = data.get("server")
+        attendances = data.get("attendances")
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            meetup_at=parse_api_datetime(data.get("meetupDateTime") or data.get("meetup_at")),
+            banner=data.get("banner"),
+            creator=creator,
+            game=data.get("game"),
+            server=server.get("name") if isinstance(server, dict) else server,
+            attending=(attendances or {}).get("confirmed", 0) if isinstance(attendances, dict) else 0,
+            raw=data,
+        )
+
+
+@dataclass
+class VTC:
+    id: int
+    name: str
+    description: str = None
+    rules: str = None
+    recruitment_state: str = None
+    founding_date: str = None
+    member_count: int = 0
+    logo: str = None
+
+    @classmethod
+    def from_api(cls, data: dict):
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            description=data.get("description"),
+            rules=data.get("rules"),
+            recruitment_state=data.get("recruitmentState") or data.get("recruitment"),
+            founding_date=data.get("foundingDate") or data.get("created"),
+            member_count=data.get("memberCount") or data.get("members_count") or 0,
+            logo=data.get("logo"),
+        )
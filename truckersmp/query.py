@@ -0,0 +1,91 @@
+# truckersmp/query.py
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+MAX_RANGE_DAYS = 31
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Filters for EventCatalogue.query(). Empty `vtcs` and `vtc_ids` mean "any VTC"."""
+
+    start: date
+    end: date
+    vtcs: frozenset = frozenset()  # case-folded creator names
+    vtc_ids: frozenset = frozenset()
+    zone: str = "utc"  # which calendar day the range refers to: "utc" or "npt"
+    game: str = None
+    server: str = None  # case-insensitive substring of the server name
+    min_attending: int = 0
+
+    @classmethod
+    def parse_vtcs(cls, text: str):
+        """Split "NepPath, 12345" into ({"neppath"}, {12345})."""
+        names, ids = set(), set()
+        for part in (text or "").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if part.isdigit():
+                ids.add(int(part))
+            else:
+                names.add(part.casefold())
+        return frozenset(names), frozenset(ids)
+
+    @property
+    def days(self) -> list:
+        return [self.start + timedelta(days=i) for i in range((self.end - self.start).days + 1)]
+
+    def matches(self, evt) -> bool:
+        creator = evt.creator
+        if self.vtcs or self.vtc_ids:
+            name = creator.name.casefold() if creator and creator.name else None
+            if name not in self.vtcs and (creator.id if creator else None) not in self.vtc_ids:
+                return False
+        if self.game and (evt.game or "").casefold() != self.game.casefold():
+            return False
+        if self.server and self.server.casefold() not in (evt.server or "").casefold():
+            return False
+        return evt.attending >= self.min_attending
+
+
+def run_query(catalogue, query: EventQuery) -> list:
+    """
+    Evaluate `query` against the catalogue's indexes in one pass.
+
+    Candidates come from the narrowest index available: the (VTC, day) list
+    when one VTC name and one day are asked for, otherwise whichever yields
+    fewer events of the per-VTC lists and the per-day lists of the range. Each
+    candidate is then checked against every filter once. Results are sorted
+    by meetup time.
+    """
+    if len(query.vtcs) == 1 and not query.vtc_ids and query.start == query.end:
+        # The common /events lookup ("NepPath today"): already exactly the VTC's events of that day
+        (name,) = query.vtcs
+        results = [evt for evt in catalogue.find(name, query.start, query.zone) if query.matches(evt)]
+        results.sort(key=lambda e: e.meetup_at)
+        return results
+
+    day_lists = [catalogue.on_date(day, query.zone) for day in query.days]
+    candidates = day_lists
+    if query.vtcs or query.vtc_ids:
+        vtc_lists = [catalogue.by_creator(name) for name in query.vtcs]
+        vtc_lists += [catalogue.by_creator_id(vtc_id) for vtc_id in query.vtc_ids]
+        if sum(map(len, vtc_lists)) < sum(map(len, day_lists)):
+            candidates = vtc_lists
+
+    seen = set()
+    results = []
+    for bucket in candidates:
+        for evt in bucket:
+            if evt.id in seen:
+                continue
+            seen.add(evt.id)
+            day = catalogue.local_date(evt, query.zone)
+            if day is None or not query.start <= day <= query.end:
+                continue
+            if query.matches(evt):
+                results.append(evt)
+
+    results.sort(key=lambda e: e.meetup_at)
+    return results
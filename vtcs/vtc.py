@@ -1,11 +1,11 @@
 # ac/vtc.py
 import discord
 from discord import app_commands
-import aiohttp
 from datetime import datetime
 import re
+from truckersmp.client import TruckersMPError
 
-def setup_vtc_command(bot):
+def setup_vtc_command(bot, truckersmp):
 
     @bot.tree.command(name="vtc_info", description="Fetch TruckersMP VTC information")
     @app_commands.describe(
@@ -22,36 +22,31 @@ def setup_vtc_command(bot):
         else:
             return await interaction.followup.send("❌ Invalid VTC link or ID.", ephemeral=True)
 
-        api_url = f"https://api.truckersmp.com/v2/vtc/{vtc_id}"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as resp:
-                    if resp.status != 200:
-                        return await interaction.followup.send(f"❌ API returned HTTP {resp.status}.", ephemeral=True)
-                    data = await resp.json()
+            vtc = await truckersmp.get_vtc(vtc_id)
+        except TruckersMPError as e:
+            return await interaction.followup.send(f"❌ API returned HTTP {e.status}.", ephemeral=True)
         except Exception as e:
             return await interaction.followup.send(f"❌ Failed to fetch data: {e}", ephemeral=True)
 
-        vtc = data.get("response")
         if not vtc:
             return await interaction.followup.send("❌ VTC not found.", ephemeral=True)
 
-        members_count = vtc.get("memberCount", 0)
+        members_count = vtc.member_count
         members_display = f"{members_count/1000:.1f}K" if members_count >= 1000 else str(members_count)
 
         embed = discord.Embed(
-            title=f"{vtc.get('name')} (ID: {vtc_id})",
-            description=vtc.get("description", "No description"),
+            title=f"{vtc.name} (ID: {vtc_id})",
+            description=vtc.description or "No description",
             color=discord.Color.from_rgb(255, 90, 32),
             timestamp=datetime.utcnow()
         )
-        embed.add_field(name="Rules", value=vtc.get("rules", "No rules listed"), inline=False)
-        embed.add_field(name="Recruitment State", value=vtc.get("recruitmentState", "Unknown"), inline=True)
-        embed.add_field(name="Created On", value=vtc.get("foundingDate", "Unknown"), inline=True)
+        embed.add_field(name="Rules", value=vtc.rules or "No rules listed", inline=False)
+        embed.add_field(name="Recruitment State", value=vtc.recruitment_state or "Unknown", inline=True)
+        embed.add_field(name="Created On", value=vtc.founding_date or "Unknown", inline=True)
         embed.add_field(name="Members", value=members_display, inline=True)
 
-        logo = vtc.get("logo")
-        if logo:
-            embed.set_thumbnail(url=logo)
+        if vtc.logo:
+            embed.set_thumbnail(url=vtc.logo)
 
         await interaction.followup.send(embed=embed)